@@ -9,8 +9,9 @@ from app.schemas.auth import (
 )
 from app.schemas.user import UserResponse, VerifyPasswordRequest
 from app.api.v1.dependencies import CurrentUser
+from app.core.profiler import ProfiledRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.post("/login", response_model=Token)
@@ -1,14 +1,21 @@
-from fastapi import APIRouter
-from app.api.v1.dependencies import CurrentUser, DatabaseSession
+from fastapi import APIRouter, Request
+from app.api.v1.dependencies import CurrentUser, DatabaseSession, check_not_modified, with_validators
 from app.services.category_service import CategoryService
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
 from app.schemas.common import PaginatedResponse
+from app.core.profiler import ProfiledRoute
+from app.core.responses import ModelResponse
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
+
+
+# Responses carry created_by_username, so they also change with the users table
+_VERSIONED_BY = ("categories", "users")
 
 
 @router.get("", response_model=PaginatedResponse[CategoryResponse])
 def list_categories(
+    request: Request,
     current_user: CurrentUser,
     db: DatabaseSession,
     page: int = 1,
@@ -16,8 +23,9 @@ def list_categories(
     sort: str = "id",
     order: str = "asc"
 ):
+    stamp = check_not_modified(request, db, *_VERSIONED_BY)
     service = CategoryService(db)
-    return service.list_categories(page, page_size, sort, order)
+    return with_validators(ModelResponse(service.list_categories(page, page_size, sort, order)), stamp)
 
 
 @router.post("", response_model=CategoryResponse)
@@ -32,12 +40,14 @@ def create_category(
 
 @router.get("/{category_id}", response_model=CategoryResponse)
 def get_category(
+    request: Request,
     category_id: int,
     current_user: CurrentUser,
     db: DatabaseSession
 ):
+    stamp = check_not_modified(request, db, *_VERSIONED_BY)
     service = CategoryService(db)
-    return service.get_category(category_id)
+    return with_validators(ModelResponse(service.get_category(category_id)), stamp)
 
 
 @router.put("/{category_id}", response_model=CategoryResponse)
@@ -4,8 +4,10 @@ from app.api.v1.dependencies import CurrentUser, DatabaseSession
 from app.services.contact_service import ContactService
 from app.schemas.contact import ContactCreate, ContactUpdate, ContactResponse
 from app.schemas.common import PaginatedResponse
+from app.core.profiler import ProfiledRoute
+from app.core.responses import ModelResponse
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.get("", response_model=PaginatedResponse[ContactResponse])
@@ -19,7 +21,7 @@ def list_contacts(
     search: Optional[str] = None
 ):
     service = ContactService(db)
-    return service.list_contacts(page, page_size, sort, order, search)
+    return ModelResponse(service.list_contacts(page, page_size, sort, order, search))
 
 
 @router.post("", response_model=ContactResponse)
@@ -1,11 +1,14 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
+from datetime import datetime
 from typing import Optional
 from app.api.v1.dependencies import CurrentUser, DatabaseSession
 from app.services.customer_service import CustomerService
-from app.schemas.customer import CustomerCreate, CustomerUpdate, CustomerResponse
+from app.schemas.customer import CustomerCreate, CustomerUpdate, CustomerResponse, ReceivablesAgingResponse, CustomerLedger
 from app.schemas.common import PaginatedResponse
+from app.core.profiler import ProfiledRoute
+from app.core.responses import ModelResponse
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.get("", response_model=PaginatedResponse[CustomerResponse])
@@ -16,10 +19,43 @@ def list_customers(
     page_size: int = 20,
     sort: str = "id",
     order: str = "asc",
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    min_orders: Optional[int] = None,
+    min_revenue: Optional[float] = None,
+    min_outstanding: Optional[float] = None,
+    last_order_after: Optional[datetime] = None,
+    last_order_before: Optional[datetime] = None
 ):
+    """
+    Besides customer columns, `sort` takes `order_count`, `revenue`, `paid`,
+    `outstanding` and `last_order_at` from the maintained customer metrics,
+    which the `min_*` and `last_order_*` filters also use.
+    """
     service = CustomerService(db)
-    return service.list_customers(page, page_size, sort, order, search)
+    return ModelResponse(service.list_customers(
+        page, page_size, sort, order, search,
+        min_orders, min_revenue, min_outstanding, last_order_after, last_order_before
+    ))
+
+
+@router.get("/receivables-aging", response_model=ReceivablesAgingResponse)
+def receivables_aging(
+    current_user: CurrentUser,
+    db: DatabaseSession,
+    page: int = 1,
+    page_size: int = 20,
+    sort: str = "total_outstanding",
+    order: str = "desc"
+):
+    """
+    Accounts-receivable aging: each customer's unpaid order balance (canceled
+    orders excluded) in 0-30 / 31-60 / 61-90 / 90+ day buckets by order date,
+    largest exposure first. `sort` takes any bucket, `total_outstanding`,
+    `open_orders`, `oldest_order_at` or `customer_name`; `totals` covers every
+    customer, not just the page.
+    """
+    service = CustomerService(db)
+    return ModelResponse(service.receivables_aging(page, page_size, sort, order))
 
 
 @router.post("", response_model=CustomerResponse)
@@ -42,6 +78,24 @@ def get_customer(
     return service.get_customer(customer_id)
 
 
+@router.get("/{customer_id}/ledger", response_model=CustomerLedger)
+def get_customer_ledger(
+    customer_id: int,
+    current_user: CurrentUser,
+    db: DatabaseSession,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500)
+):
+    """
+    Customer statement: orders (debits, canceled ones at 0) and payments
+    (credits) in chronological order with a running balance. Pass
+    `next_cursor` back as `cursor` for the following page; it is null on the
+    last page. `balance` is the customer's current total.
+    """
+    service = CustomerService(db)
+    return ModelResponse(service.get_ledger(customer_id, cursor, limit))
+
+
 @router.put("/{customer_id}", response_model=CustomerResponse)
 def update_customer(
     customer_id: int,
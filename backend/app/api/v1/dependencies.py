@@ -1,10 +1,13 @@
-from fastapi import Depends
+from fastapi import Depends, HTTPException, Request, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from typing import Annotated
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
 from app.db.session import get_db
+from app.db.table_versions import TableStamp, table_stamp
 from app.services.auth_service import AuthService
-from app.core.exceptions import UnauthorizedException
+from app.core.exceptions import ForbiddenException, UnauthorizedException
 from app.models import User
 from loguru import logger
 
@@ -28,3 +31,60 @@ def get_current_user(
 
 CurrentUser = Annotated[User, Depends(get_current_user)]
 DatabaseSession = Annotated[Session, Depends(get_db)]
+
+
+def require_admin(current_user: User) -> None:
+    """Raise ForbiddenException if the current user is not an admin."""
+    if not current_user.is_admin:
+        raise ForbiddenException("Admin access required")
+
+
+def _validator_headers(stamp: TableStamp) -> dict:
+    return {
+        "ETag": stamp.etag,
+        "Last-Modified": format_datetime(stamp.last_modified.replace(tzinfo=timezone.utc), usegmt=True),
+        # Cacheable by the browser only, and always revalidated
+        "Cache-Control": "private, no-cache",
+    }
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison (RFC 9110 §13.1.2): W/ prefixes are ignored
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def check_not_modified(request: Request, db: Session, *tables: str) -> TableStamp:
+    """
+    Conditional GET for a response built only from ``tables``.
+
+    Raises a 304 when the client's If-None-Match (or, without one,
+    If-Modified-Since) is still current; otherwise returns the stamp to pass
+    to ``with_validators``.  Costs one small query against table_versions.
+    """
+    stamp = table_stamp(db, tables)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, stamp.etag)
+    else:
+        fresh = False
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                since = None
+            if since is not None and since.tzinfo is not None:
+                last_modified = stamp.last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+                fresh = last_modified <= since
+    if fresh:
+        raise HTTPException(status_code=304, headers=_validator_headers(stamp))
+    return stamp
+
+
+def with_validators(response: Response, stamp: TableStamp) -> Response:
+    """Attach ETag / Last-Modified / Cache-Control from ``stamp``."""
+    response.headers.update(_validator_headers(stamp))
+    return response
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Query, Request, status
 from typing import Optional
-from app.api.v1.dependencies import CurrentUser, DatabaseSession
+from app.api.v1.dependencies import CurrentUser, DatabaseSession, check_not_modified, with_validators
 from app.services.expense_service import ExpenseService
+from app.services.export_service import ExportService
 from app.schemas.expense import (
     ExpenseCreate,
     ExpenseUpdate,
@@ -11,10 +12,12 @@ from app.schemas.expense import (
     ExpenseCategoryResponse,
     ExpenseHistoryResponse
 )
-from app.schemas.common import PaginatedResponse
+from app.schemas.common import PaginatedResponse, ExportFormat
 from typing import List
+from app.core.profiler import ProfiledRoute
+from app.core.responses import ModelResponse
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 # Expense endpoints
@@ -35,7 +38,19 @@ def list_expenses(
     Shows WHO created each expense for full audit trail.
     """
     service = ExpenseService(db)
-    return service.list_expenses(page, page_size, sort_by, order, category_id, start_date, end_date)
+    return ModelResponse(service.list_expenses(page, page_size, sort_by, order, category_id, start_date, end_date))
+
+
+@router.get("/export")
+def export_expenses(
+    current_user: CurrentUser,
+    fmt: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    category_id: Optional[int] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+):
+    """Stream every matching expense, oldest first, as CSV or NDJSON."""
+    return ExportService().export_expenses(fmt, category_id, start_date, end_date)
 
 
 @router.get("/{expense_id}", response_model=ExpenseResponse)
@@ -103,25 +118,29 @@ def get_expense_history(
 # Expense Category endpoints
 @router.get("/categories/list", response_model=PaginatedResponse[ExpenseCategoryResponse])
 def list_expense_categories(
+    request: Request,
     current_user: CurrentUser,
     db: DatabaseSession,
     page: int = 1,
     page_size: int = 100
 ):
     """List all expense categories."""
+    stamp = check_not_modified(request, db, "expense_categories")
     service = ExpenseService(db)
-    return service.list_categories(page, page_size)
+    return with_validators(ModelResponse(service.list_categories(page, page_size)), stamp)
 
 
 @router.get("/categories/{category_id}", response_model=ExpenseCategoryResponse)
 def get_expense_category(
+    request: Request,
     category_id: int,
     current_user: CurrentUser,
     db: DatabaseSession
 ):
     """Get a single expense category by ID."""
+    stamp = check_not_modified(request, db, "expense_categories")
     service = ExpenseService(db)
-    return service.get_category(category_id)
+    return with_validators(ModelResponse(service.get_category(category_id)), stamp)
 
 
 @router.post("/categories", response_model=ExpenseCategoryResponse, status_code=status.HTTP_201_CREATED)
@@ -0,0 +1,44 @@
+from fastapi import APIRouter
+from functools import partial
+from typing import List
+from app.api.v1.dependencies import CurrentUser, require_admin
+from app.core import analytics_export
+from app.core.exceptions import AppException, BadRequestException
+from app.core.maintenance import scheduler
+from app.core.profiler import ProfiledRoute
+from app.schemas.maintenance import AnalyticsExportRequest, MaintenanceJob
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.get("/jobs", response_model=List[MaintenanceJob])
+def list_maintenance_jobs(current_user: CurrentUser):
+    """
+    Background jobs of this worker's maintenance scheduler and their last run.
+    """
+    require_admin(current_user)
+    return scheduler.jobs()
+
+
+@router.post("/analytics-export", response_model=MaintenanceJob, status_code=202)
+def start_analytics_export(data: AnalyticsExportRequest, current_user: CurrentUser):
+    """
+    Queue a Parquet export of the analytics tables (all by default) on the
+    maintenance scheduler. With a date range the files go to their own
+    directory under <ANALYTICS_EXPORT_DIR>_ranges, outside the full dataset.
+    Poll GET /jobs for the result.
+    """
+    require_admin(current_user)
+    if not analytics_export.is_available():
+        raise BadRequestException("Analytics export needs the pyarrow package")
+    job = partial(
+        analytics_export.export_analytics,
+        tables=[t.value for t in data.tables] if data.tables else None,
+        start_date=data.start_date,
+        end_date=data.end_date,
+        partition_by_month=data.partition_by_month,
+    )
+    try:
+        return scheduler.submit("analytics_export_on_demand", job).info()
+    except RuntimeError:
+        raise AppException("An analytics export is already queued or running", status_code=409)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+from typing import List
+from app.api.v1.dependencies import CurrentUser, require_admin
+from app.core.cache import cache_stats
+from app.core.profiler import ProfiledRoute
+from app.schemas.metrics import CacheStats
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.get("/caches", response_model=List[CacheStats])
+def list_cache_stats(current_user: CurrentUser):
+    """
+    Hit / miss counters of this worker's in-process caches.
+    Counters start at zero when the worker starts.
+    """
+    require_admin(current_user)
+    return cache_stats()
@@ -5,8 +5,10 @@ from app.services.note_service import NoteService
 from app.schemas.note import NoteCreate, NoteResponse
 from app.schemas.common import PaginatedResponse
 from app.models import EntityType
+from app.core.profiler import ProfiledRoute
+from app.core.responses import ModelResponse
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.get("", response_model=PaginatedResponse[NoteResponse])
@@ -19,7 +21,7 @@ def list_notes(
     entity_id: Optional[int] = None
 ):
     service = NoteService(db)
-    return service.list_notes(page, page_size, entity_type, entity_id)
+    return ModelResponse(service.list_notes(page, page_size, entity_type, entity_id))
 
 
 @router.post("", response_model=NoteResponse)
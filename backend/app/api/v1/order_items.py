@@ -2,8 +2,9 @@ from fastapi import APIRouter
 from app.api.v1.dependencies import CurrentUser, DatabaseSession
 from app.services.order_service import OrderService
 from app.schemas.order import OrderResponse, DeliverOrderItemRequest
+from app.core.profiler import ProfiledRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.post("/{item_id}/deliver", response_model=OrderResponse)
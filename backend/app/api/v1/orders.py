@@ -1,14 +1,19 @@
-from fastapi import APIRouter, status
-from typing import Optional, List
+from fastapi import APIRouter, Body, Query, status
+from typing import Any, Optional, List
 from datetime import datetime
 from app.api.v1.dependencies import CurrentUser, DatabaseSession
 from app.services.order_service import OrderService
-from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse, DeliverOrderItemRequest
+from app.services.export_service import ExportService
+from app.schemas.order import (
+    OrderCreate, OrderUpdate, OrderResponse, DeliverOrderItemRequest, DeliverOrderRequest, OrderBatchResponse
+)
 from app.schemas.order_delivery import OrderDeliveryCreate, OrderDeliveryResponse
-from app.schemas.common import PaginatedResponse
+from app.schemas.common import PaginatedResponse, ExportFormat
 from app.models import OrderStatus, PaymentStatus, DeliveryStatus
+from app.core.profiler import ProfiledRoute
+from app.core.responses import ModelResponse
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.get("", response_model=PaginatedResponse[OrderResponse])
@@ -24,13 +29,40 @@ def list_orders(
     payment_status: Optional[PaymentStatus] = None,
     delivery_status: Optional[DeliveryStatus] = None,
     start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None,
+    min_outstanding: Optional[float] = None
 ):
+    """
+    ``min_outstanding`` keeps orders whose unpaid balance
+    (total_amount - paid_amount) is at least that amount.
+    """
     service = OrderService(db)
-    return service.list_orders(
+    result = service.list_orders(
         page, page_size, sort, order,
         customer_id, order_status, payment_status, delivery_status,
-        start_date, end_date
+        start_date, end_date, min_outstanding
+    )
+    return ModelResponse(result)
+
+
+@router.get("/export")
+def export_orders(
+    current_user: CurrentUser,
+    fmt: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    customer_id: Optional[int] = None,
+    order_status: Optional[OrderStatus] = None,
+    payment_status: Optional[PaymentStatus] = None,
+    delivery_status: Optional[DeliveryStatus] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    min_outstanding: Optional[float] = None
+):
+    """
+    Stream every matching order (same filters as the list, without items)
+    as CSV or NDJSON.
+    """
+    return ExportService().export_orders(
+        fmt, customer_id, order_status, payment_status, delivery_status, start_date, end_date, min_outstanding
     )
 
 
@@ -44,6 +76,22 @@ def create_order(
     return service.create_order(data, current_user.id)
 
 
+@router.post("/batch", response_model=OrderBatchResponse)
+def create_orders_batch(
+    current_user: CurrentUser,
+    db: DatabaseSession,
+    orders: List[Any] = Body(...)
+):
+    """
+    Create up to 10,000 orders from a JSON array of order payloads
+    (customer_id, items).  Orders are written in chunks of 500, each in its
+    own transaction.  Created ids and per-order errors refer to the 1-based
+    position in the array.
+    """
+    service = OrderService(db)
+    return service.create_orders_batch(orders, current_user.id)
+
+
 @router.get("/{order_id}", response_model=OrderResponse)
 def get_order(
     order_id: int,
@@ -75,6 +123,22 @@ def cancel_order(
     return service.cancel_order(order_id, current_user.id)
 
 
+@router.post("/{order_id}/deliver", response_model=OrderResponse)
+def deliver_order(
+    order_id: int,
+    data: DeliverOrderRequest,
+    current_user: CurrentUser,
+    db: DatabaseSession
+):
+    """
+    Deliver several items at once ({"items": [{"item_id", "quantity"}]}) or
+    everything still outstanding ({"deliver_all": true}).  Stock, stock
+    movements, one delivery record and the order status are saved together.
+    """
+    service = OrderService(db)
+    return service.deliver_order(order_id, data, current_user.id)
+
+
 @router.delete("/{order_id}")
 def delete_order(
     order_id: int,
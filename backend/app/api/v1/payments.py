@@ -1,11 +1,14 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from typing import Optional
 from app.api.v1.dependencies import CurrentUser, DatabaseSession
 from app.services.payment_service import PaymentService
+from app.services.export_service import ExportService
 from app.schemas.payment import PaymentCreate, PaymentResponse
-from app.schemas.common import PaginatedResponse
+from app.schemas.common import PaginatedResponse, ExportFormat
+from app.core.profiler import ProfiledRoute
+from app.core.responses import ModelResponse
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.get("", response_model=PaginatedResponse[PaymentResponse])
@@ -17,7 +20,17 @@ def list_payments(
     order_id: Optional[int] = None
 ):
     service = PaymentService(db)
-    return service.list_payments(page, page_size, order_id)
+    return ModelResponse(service.list_payments(page, page_size, order_id))
+
+
+@router.get("/export")
+def export_payments(
+    current_user: CurrentUser,
+    fmt: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    order_id: Optional[int] = None
+):
+    """Stream every matching payment as CSV or NDJSON."""
+    return ExportService().export_payments(fmt, order_id)
 
 
 @router.post("", response_model=PaymentResponse)
@@ -1,11 +1,17 @@
-from fastapi import APIRouter
-from typing import Optional
+from fastapi import APIRouter, Body, File, UploadFile
+from typing import Any, List, Optional
 from app.api.v1.dependencies import CurrentUser, DatabaseSession
-from app.services.product_service import ProductService
-from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
+from app.services.product_service import ProductService, iter_csv_rows
+from app.schemas.product import (
+    ProductCreate, ProductUpdate, ProductResponse, ProductAtRisk,
+    BarcodeLookupRequest, BarcodeLookupResponse, ProductBarcodeMatch,
+    ProductImportResponse
+)
 from app.schemas.common import PaginatedResponse
+from app.core.profiler import ProfiledRoute
+from app.core.responses import ModelResponse
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.get("", response_model=PaginatedResponse[ProductResponse])
@@ -20,7 +26,25 @@ def list_products(
     category_id: Optional[int] = None
 ):
     service = ProductService(db)
-    return service.list_products(page, page_size, sort, order, search, category_id)
+    return ModelResponse(service.list_products(page, page_size, sort, order, search, category_id))
+
+
+@router.get("/at-risk", response_model=PaginatedResponse[ProductAtRisk])
+def list_products_at_risk(
+    current_user: CurrentUser,
+    db: DatabaseSession,
+    max_days_of_cover: Optional[float] = None,
+    page: int = 1,
+    page_size: int = 20
+):
+    """
+    Products whose stock covers fewer than `max_days_of_cover` days of their
+    30-day sales rate (default PRODUCT_REORDER_LEAD_DAYS: the reorder-flagged
+    ones), soonest to run out first. The figures come from the periodic
+    product stats job; `computed_at` says when.
+    """
+    service = ProductService(db)
+    return ModelResponse(service.list_at_risk(max_days_of_cover, page, page_size))
 
 
 @router.post("", response_model=ProductResponse)
@@ -33,6 +57,59 @@ def create_product(
     return service.create_product(data, current_user.id)
 
 
+@router.post("/import", response_model=ProductImportResponse)
+def import_products(
+    current_user: CurrentUser,
+    db: DatabaseSession,
+    rows: List[Any] = Body(...),
+    seed_stock: bool = True
+):
+    """
+    Bulk create / update products from a JSON array of rows
+    (name, description, barcode, category_id or category, list_price,
+    initial_stock).  A barcode that matches an existing product updates it.
+    Invalid rows are skipped and listed under ``errors`` (row = 1-based index).
+    """
+    service = ProductService(db)
+    return service.import_products(enumerate(rows, start=1), current_user.id, seed_stock)
+
+
+@router.post("/import/csv", response_model=ProductImportResponse)
+def import_products_csv(
+    current_user: CurrentUser,
+    db: DatabaseSession,
+    file: UploadFile = File(...),
+    seed_stock: bool = True
+):
+    """
+    Same as /import for a UTF-8 CSV upload with a header row naming the
+    fields.  The file is read row by row; ``errors`` refer to CSV line numbers.
+    """
+    service = ProductService(db)
+    return service.import_products(iter_csv_rows(file.file), current_user.id, seed_stock)
+
+
+@router.post("/barcode/lookup", response_model=BarcodeLookupResponse)
+def lookup_barcodes(
+    data: BarcodeLookupRequest,
+    current_user: CurrentUser,
+    db: DatabaseSession
+):
+    """Resolve up to 500 scanned barcodes to products and current stock."""
+    service = ProductService(db)
+    return service.lookup_barcodes(data.barcodes)
+
+
+@router.get("/barcode/{barcode}", response_model=ProductBarcodeMatch)
+def get_product_by_barcode(
+    barcode: str,
+    current_user: CurrentUser,
+    db: DatabaseSession
+):
+    service = ProductService(db)
+    return service.get_product_by_barcode(barcode)
+
+
 @router.get("/{product_id}", response_model=ProductResponse)
 def get_product(
     product_id: int,
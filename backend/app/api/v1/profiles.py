@@ -0,0 +1,29 @@
+from fastapi import APIRouter
+from fastapi.responses import FileResponse
+from typing import List
+from app.api.v1.dependencies import CurrentUser, require_admin
+from app.core.exceptions import NotFoundException
+from app.core.profiler import ProfiledRoute, list_profiles, get_profile_path
+from app.schemas.profile import ProfileInfo
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.get("", response_model=List[ProfileInfo])
+def list_request_profiles(current_user: CurrentUser):
+    """
+    List stored request profiles (newest first).
+    Profiles are recorded when an admin sends X-Profile: 1 or ?profile=1.
+    """
+    require_admin(current_user)
+    return list_profiles()
+
+
+@router.get("/{name}")
+def download_request_profile(name: str, current_user: CurrentUser):
+    """Download a stored profile as a pstats file."""
+    require_admin(current_user)
+    path = get_profile_path(name)
+    if not path:
+        raise NotFoundException("Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=name)
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Query
+from app.api.v1.dependencies import CurrentUser, DatabaseSession
+from app.services.search_service import SearchService
+from app.schemas.search import SearchResponse
+from app.core.profiler import ProfiledRoute
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.get("", response_model=SearchResponse)
+def global_search(
+    current_user: CurrentUser,
+    db: DatabaseSession,
+    q: str = Query(..., max_length=200),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """
+    Type-ahead search across products (name, barcode), customers, contacts,
+    notes and order numbers. Returns the best `limit` hits, ranked.
+    """
+    service = SearchService(db)
+    return service.search(q, limit)
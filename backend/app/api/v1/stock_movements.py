@@ -1,11 +1,14 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from typing import Optional
 from app.api.v1.dependencies import CurrentUser, DatabaseSession
 from app.services.stock_movement_service import StockMovementService
+from app.services.export_service import ExportService
 from app.schemas.stock_movement import StockMovementCreate, StockMovementResponse
-from app.schemas.common import PaginatedResponse
+from app.schemas.common import PaginatedResponse, ExportFormat
+from app.core.profiler import ProfiledRoute
+from app.core.responses import ModelResponse
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.get("", response_model=PaginatedResponse[StockMovementResponse])
@@ -17,7 +20,17 @@ def list_stock_movements(
     product_id: Optional[int] = None
 ):
     service = StockMovementService(db)
-    return service.list_stock_movements(page, page_size, product_id)
+    return ModelResponse(service.list_stock_movements(page, page_size, product_id))
+
+
+@router.get("/export")
+def export_stock_movements(
+    current_user: CurrentUser,
+    fmt: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    product_id: Optional[int] = None
+):
+    """Stream every matching stock movement as CSV or NDJSON."""
+    return ExportService().export_stock_movements(fmt, product_id)
 
 
 @router.post("", response_model=StockMovementResponse)
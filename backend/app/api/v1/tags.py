@@ -1,21 +1,25 @@
-from fastapi import APIRouter
-from app.api.v1.dependencies import CurrentUser, DatabaseSession
+from fastapi import APIRouter, Request
+from app.api.v1.dependencies import CurrentUser, DatabaseSession, check_not_modified, with_validators
 from app.services.tag_service import TagService
 from app.schemas.tag import TagCreate, TagResponse, TagLinkRequest, TagUnlinkRequest
 from app.schemas.common import PaginatedResponse
+from app.core.profiler import ProfiledRoute
+from app.core.responses import ModelResponse
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.get("", response_model=PaginatedResponse[TagResponse])
 def list_tags(
+    request: Request,
     current_user: CurrentUser,
     db: DatabaseSession,
     page: int = 1,
     page_size: int = 20
 ):
+    stamp = check_not_modified(request, db, "tags")
     service = TagService(db)
-    return service.list_tags(page, page_size)
+    return with_validators(ModelResponse(service.list_tags(page, page_size)), stamp)
 
 
 @router.post("", response_model=TagResponse)
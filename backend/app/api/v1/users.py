@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.orm import Session
 from typing import Optional
 from app.db.session import get_db
@@ -8,34 +8,33 @@ from app.schemas.user import (
     SecurityQuestionSetup, SecurityQuestionUpdate, ChangePasswordRequest
 )
 from app.schemas.common import PaginatedResponse
-from app.api.v1.dependencies import CurrentUser, DatabaseSession
-from app.core.exceptions import ForbiddenException
+from app.api.v1.dependencies import CurrentUser, DatabaseSession, check_not_modified, require_admin, with_validators
+from app.core.profiler import ProfiledRoute
+from app.core.responses import ModelResponse
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
-def _require_admin(current_user):
-    """Raise ForbiddenException if the current user is not an admin."""
-    if not current_user.is_admin:
-        raise ForbiddenException("Admin access required")
-
-
-@router.get("", response_model=PaginatedResponse)
+@router.get("", response_model=PaginatedResponse[UserResponse])
 def list_users(
+    request: Request,
     current_user: CurrentUser,
     db: DatabaseSession,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     search: Optional[str] = None
 ):
-    _require_admin(current_user)
+    require_admin(current_user)
+    stamp = check_not_modified(request, db, "users")
     user_service = UserService(db)
-    return user_service.list_users(page=page, page_size=page_size, search=search)
+    return with_validators(
+        ModelResponse(user_service.list_users(page=page, page_size=page_size, search=search)), stamp
+    )
 
 
 @router.post("", response_model=UserResponse, status_code=201)
 def create_user(data: UserCreate, current_user: CurrentUser, db: DatabaseSession):
-    _require_admin(current_user)
+    require_admin(current_user)
     user_service = UserService(db)
     return user_service.create_user(data, created_by_user_id=current_user.id)
 
@@ -68,21 +67,22 @@ def change_password(data: ChangePasswordRequest, current_user: CurrentUser, db:
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(user_id: int, current_user: CurrentUser, db: DatabaseSession):
-    _require_admin(current_user)
+def get_user(request: Request, user_id: int, current_user: CurrentUser, db: DatabaseSession):
+    require_admin(current_user)
+    stamp = check_not_modified(request, db, "users")
     user_service = UserService(db)
-    return user_service.get_user(user_id)
+    return with_validators(ModelResponse(user_service.get_user(user_id)), stamp)
 
 
 @router.put("/{user_id}", response_model=UserResponse)
 def update_user(user_id: int, data: UserUpdate, current_user: CurrentUser, db: DatabaseSession):
-    _require_admin(current_user)
+    require_admin(current_user)
     user_service = UserService(db)
     return user_service.update_user(user_id, data)
 
 
 @router.post("/{user_id}/deactivate", response_model=UserResponse)
 def deactivate_user(user_id: int, current_user: CurrentUser, db: DatabaseSession):
-    _require_admin(current_user)
+    require_admin(current_user)
     user_service = UserService(db)
     return user_service.deactivate_user(user_id, current_user_id=current_user.id)
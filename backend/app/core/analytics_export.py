@@ -0,0 +1,286 @@
+"""
+Parquet export of the transaction tables for offline analysis.
+
+Payments, expenses, order items and stock movements are written as Parquet
+files under ANALYTICS_EXPORT_DIR, one directory per table:
+
+  analytics/payments/part-0.parquet                    (unpartitioned)
+  analytics/payments/month=2026-03/part-0.parquet      (partition_by_month)
+  analytics/_manifest.json                             (row counts, time)
+
+An export restricted to a date range goes to a sibling directory named after
+the range (``analytics_ranges/2026-01-01_2026-03-31/...``), outside the full
+dataset, so it never replaces the full copy and a reader of ``analytics/``
+never counts its rows twice.  pandas / pyarrow read a table directory
+directly, month partitions included: ``pd.read_parquet("analytics/payments")``.
+
+The rows are read from a snapshot, never from the live file for the length of
+the export.  On SQLite the database is first copied page by page with the
+online backup API — a shared lock held for the raw copy only — and every
+table is read from that copy; on other databases one REPEATABLE READ,
+read-only transaction serves as the snapshot.  Rows are fetched with a
+server-side cursor and written ANALYTICS_EXPORT_ROW_GROUP_SIZE at a time, one
+Parquet row group per batch, so memory use does not grow with the table.
+
+Each table is staged in a temporary directory and swapped in when complete;
+readers see either the previous export or the new one.  The job runs on the
+maintenance scheduler (app/core/maintenance.py).  Needs the optional
+``pyarrow`` package.
+"""
+
+import json
+import shutil
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import Boolean, Date, DateTime, Enum, Float, Integer, Numeric, create_engine, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.logging import BACKEND_DIR, logger
+from app.db.session import engine
+from app.models import Expense, OrderItem, Payment, StockMovement
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = pq = None
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+
+# Exported tables and the date column used for range filters and partitions
+ANALYTICS_TABLES = {
+    "payments": (Payment.__table__, "created_at"),
+    "expenses": (Expense.__table__, "date"),
+    "order_items": (OrderItem.__table__, "created_at"),
+    "stock_movements": (StockMovement.__table__, "created_at"),
+}
+
+MANIFEST_NAME = "_manifest.json"
+
+
+def is_available() -> bool:
+    return pa is not None
+
+
+def export_dir() -> Path:
+    path = Path(settings.ANALYTICS_EXPORT_DIR)
+    return path if path.is_absolute() else (BACKEND_DIR / path).resolve()
+
+
+def ranges_dir() -> Path:
+    """Date-range exports: next to the full dataset, never inside it."""
+    root = export_dir()
+    return root.with_name(f"{root.name}_ranges")
+
+
+def _run_dir(start_date: Optional[date], end_date: Optional[date]) -> Path:
+    if start_date is None and end_date is None:
+        return export_dir()
+    return ranges_dir() / f"{start_date or 'begin'}_{end_date or 'end'}"
+
+
+def _arrow_type(column):
+    if isinstance(column.type, Enum):
+        return pa.string()
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, (Float, Numeric)):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column.type, Date):
+        return pa.date32()
+    return pa.string()
+
+
+def _arrow_schema(table):
+    return pa.schema([pa.field(column.name, _arrow_type(column), nullable=column.nullable)
+                      for column in table.columns])
+
+
+def _record_batch(rows: Sequence, table, schema):
+    arrays = []
+    for index, (column, field) in enumerate(zip(table.columns, schema)):
+        values = [row[index] for row in rows]
+        if isinstance(column.type, Enum):
+            values = [v.value if hasattr(v, "value") else v for v in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+@contextmanager
+def _snapshot(workdir: Path) -> Iterator[Connection]:
+    """A read-only connection that sees the database as of one instant."""
+    if engine.dialect.name != "sqlite":
+        with engine.connect().execution_options(isolation_level="REPEATABLE READ",
+                                                postgresql_readonly=True) as conn:
+            with conn.begin():
+                yield conn
+        return
+
+    copy_path = workdir / f"snapshot-{uuid.uuid4().hex[:8]}.db"
+    source = sqlite3.connect(f"file:{Path(engine.url.database).resolve()}?mode=ro", uri=True)
+    target = sqlite3.connect(copy_path)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+    snapshot_engine = create_engine(f"sqlite:///{copy_path}", poolclass=NullPool)
+    try:
+        with snapshot_engine.connect() as conn:
+            yield conn
+    finally:
+        snapshot_engine.dispose()
+        copy_path.unlink(missing_ok=True)
+
+
+def _export_table(conn: Connection, name: str, target: Path, start_date: Optional[date],
+                  end_date: Optional[date], partition_by_month: bool) -> int:
+    table, date_column = ANALYTICS_TABLES[name]
+    moment = table.c[date_column]
+    query = select(table)
+    if start_date:
+        query = query.where(moment >= start_date)
+    if end_date:
+        query = query.where(moment < end_date + timedelta(days=1))
+    query = query.order_by(moment, table.c.id) if partition_by_month else query.order_by(table.c.id)
+
+    schema = _arrow_schema(table)
+    batch_size = settings.ANALYTICS_EXPORT_ROW_GROUP_SIZE
+    date_index = list(table.columns.keys()).index(date_column)
+    target.mkdir(parents=True)
+
+    writer, current, rows = None, None, 0
+    result = conn.execution_options(yield_per=batch_size).execute(query)
+    try:
+        for partition in result.partitions():
+            groups = (groupby(partition, key=lambda row: row[date_index].strftime("%Y-%m"))
+                      if partition_by_month else [(None, partition)])
+            for month, group in groups:
+                group = list(group)
+                if writer is None or month != current:
+                    if writer is not None:
+                        writer.close()
+                    directory = target / f"month={month}" if partition_by_month else target
+                    directory.mkdir(exist_ok=True)
+                    writer = pq.ParquetWriter(directory / "part-0.parquet", schema, compression="zstd")
+                    current = month
+                writer.write_batch(_record_batch(group, table, schema), row_group_size=batch_size)
+                rows += len(group)
+        if writer is None:
+            # Empty selection: still leave a readable (empty) file behind
+            pq.write_table(schema.empty_table(), target / "part-0.parquet")
+    finally:
+        result.close()
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def _publish(staged: Path, target: Path) -> None:
+    """Replace ``target`` with ``staged`` so readers never see a partial table."""
+    retired = None
+    if target.exists():
+        retired = target.with_name(f".retired-{target.name}-{uuid.uuid4().hex[:8]}")
+        target.rename(retired)
+    staged.rename(target)
+    if retired is not None:
+        shutil.rmtree(retired, ignore_errors=True)
+
+
+@contextmanager
+def _exclusive(root: Path) -> Iterator[bool]:
+    """Yield False when another worker is already exporting into ``root``."""
+    if fcntl is None:
+        yield True
+        return
+    with open(root / ".export.lock", "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def read_manifest(root: Optional[Path] = None) -> Optional[dict]:
+    path = (root or export_dir()) / MANIFEST_NAME
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def export_analytics(tables: Optional[List[str]] = None, start_date: Optional[date] = None,
+                     end_date: Optional[date] = None,
+                     partition_by_month: Optional[bool] = None) -> Optional[dict]:
+    """
+    Export ``tables`` (default: all) to Parquet and return the manifest,
+    or None when another worker is already running an export.
+    """
+    if not is_available():
+        raise RuntimeError("pyarrow is not installed")
+    tables = tables or list(ANALYTICS_TABLES)
+    if partition_by_month is None:
+        partition_by_month = settings.ANALYTICS_EXPORT_PARTITION_BY_MONTH
+
+    root = _run_dir(start_date, end_date)
+    root.mkdir(parents=True, exist_ok=True)
+    export_dir().mkdir(parents=True, exist_ok=True)
+    with _exclusive(export_dir()) as acquired:
+        if not acquired:
+            logger.info("Analytics export already running in another worker; skipped")
+            return None
+
+        workdir = root / f".staging-{uuid.uuid4().hex[:8]}"
+        workdir.mkdir()
+        counts: Dict[str, int] = {}
+        try:
+            with _snapshot(workdir) as conn:
+                for name in tables:
+                    counts[name] = _export_table(conn, name, workdir / name, start_date,
+                                                 end_date, partition_by_month)
+            for name in tables:
+                _publish(workdir / name, root / name)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        manifest = {
+            "exported_at": datetime.utcnow().isoformat(),
+            "start_date": start_date.isoformat() if start_date else None,
+            "end_date": end_date.isoformat() if end_date else None,
+            "partition_by_month": partition_by_month,
+            "tables": {**((read_manifest(root) or {}).get("tables", {})), **counts},
+        }
+        (root / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+    logger.info(f"Analytics export to {root}: " + ", ".join(f"{n}={c}" for n, c in counts.items()))
+    return manifest
+
+
+def scheduled_export() -> Optional[dict]:
+    """Full export from the scheduler; skipped when another worker just wrote one."""
+    manifest = read_manifest()
+    if manifest is not None:
+        age = datetime.utcnow() - datetime.fromisoformat(manifest["exported_at"])
+        if age.total_seconds() < settings.ANALYTICS_EXPORT_INTERVAL_HOURS * 3600 / 2:
+            logger.info("Analytics export is recent enough; skipped")
+            return manifest
+    return export_analytics()
@@ -0,0 +1,144 @@
+"""
+In-process caches.
+
+A small, thread-safe LRU map used for read-mostly lookups on hot paths, with
+an optional time-to-live per entry.  Every uvicorn worker holds its own copy,
+so a cache must only hold data that is either invalidated by the code path
+that changes it or verified by the caller on use.  ``invalidate`` clears a
+registered cache here and, via the invalidation bus (app/core/cache_bus.py),
+in every other worker; the TTL bounds how long an entry can outlive a lost
+message.
+
+Caches created through ``register_cache`` are listed with their hit / miss
+counters by ``cache_stats`` (served at /api/v1/metrics/caches).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+from loguru import logger
+
+from app.core.cache_bus import LocalBus
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    """Bounded mapping that evicts the least recently used key."""
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Bumped by every delete / clear; see ``set``
+        self.generation = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            try:
+                expires_at, value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            if self.ttl is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: V, generation: Optional[int] = None) -> None:
+        """
+        Store ``value``.  With ``generation`` (read before the value was
+        loaded) nothing is stored if the cache was invalidated in between,
+        so a load that raced an invalidation cannot put the old value back.
+        """
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else 0.0
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self.generation += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+        }
+
+
+_registry: Dict[str, LRUCache] = {}
+
+
+def register_cache(name: str, cache: LRUCache[V]) -> LRUCache[V]:
+    """Make ``cache`` visible in ``cache_stats`` under ``name``."""
+    _registry[name] = cache
+    return cache
+
+
+def cache_stats() -> List[dict]:
+    return [{"name": name, **cache.stats()} for name, cache in sorted(_registry.items())]
+
+
+_bus = LocalBus()
+
+
+def invalidate(name: str) -> None:
+    """Clear cache ``name`` in this worker and broadcast it to the others."""
+    cache = _registry.get(name)
+    if cache is not None:
+        cache.clear()
+    try:
+        _bus.publish(name)
+    except Exception as exc:
+        logger.warning(f"Cache invalidation broadcast for {name} failed: {exc}")
+
+
+def _on_remote_invalidation(name: str) -> None:
+    cache = _registry.get(name)
+    if cache is not None:
+        cache.clear()
+
+
+def start_cache_sync(bus) -> None:
+    """Publish this worker's invalidations on ``bus`` and apply everyone else's."""
+    global _bus
+    _bus = bus
+    bus.start(_on_remote_invalidation)
+
+
+def stop_cache_sync() -> None:
+    global _bus
+    bus, _bus = _bus, LocalBus()
+    bus.stop()
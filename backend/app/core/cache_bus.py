@@ -0,0 +1,176 @@
+"""
+Cross-worker cache invalidation.
+
+The in-process caches (app/core/cache.py) live in each uvicorn worker.  When
+one worker changes a cached table it clears its own copy and publishes the
+cache name on an invalidation bus; every other worker clears the same cache
+when the message arrives.  Entry TTLs stay in place as the fallback for a
+lost message.
+
+Backends (``CACHE_BACKEND``):
+  * ``local``  — single process, nothing to broadcast (default).
+  * ``sqlite`` — messages are rows in a small SQLite file shared by the
+    workers on one host (``CACHE_URL=sqlite:///path``), polled every
+    ``CACHE_SYNC_INTERVAL_SECONDS``.  Needs no extra service; meant for
+    tests and single-host deployments.
+  * ``redis``  — Redis pub/sub on ``CACHE_URL`` (``redis://host:6379/0``);
+    needs the optional ``redis`` package.
+
+Publishing never fails a request, and an unreachable bus never fails
+startup: a bus error is logged and the TTL covers the gap.
+
+Each bus tags its messages with an origin id generated in ``start()``, which
+runs in every worker's lifespan, so workers forked from a preloaded parent
+(gunicorn ``--preload``) still tell their messages apart.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Optional
+
+from loguru import logger
+
+try:
+    import redis
+except ImportError:  # optional dependency
+    redis = None
+
+Handler = Callable[[str], None]
+
+
+class LocalBus:
+    """Single-process bus: the publisher already cleared its cache."""
+
+    def publish(self, name: str) -> None:
+        pass
+
+    def start(self, handler: Handler) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+class SQLiteBus:
+    """Invalidation messages as rows of a shared SQLite file, polled."""
+
+    RETENTION_SECONDS = 300
+
+    def __init__(self, path: str, interval: float) -> None:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.interval = interval
+        # Identifies this worker's own messages so they are not applied twice
+        self.origin = uuid.uuid4().hex
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_invalidations ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "origin TEXT NOT NULL, name TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            (self._cursor,) = self._conn.execute(
+                "SELECT COALESCE(MAX(id), 0) FROM cache_invalidations"
+            ).fetchone()
+
+    def publish(self, name: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO cache_invalidations (origin, name, created_at) VALUES (?, ?, ?)",
+                (self.origin, name, now),
+            )
+            self._conn.execute(
+                "DELETE FROM cache_invalidations WHERE created_at < ?",
+                (now - self.RETENTION_SECONDS,),
+            )
+
+    def poll(self, handler: Handler) -> None:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, origin, name FROM cache_invalidations WHERE id > ? ORDER BY id",
+                (self._cursor,),
+            ).fetchall()
+        for row_id, origin, name in rows:
+            self._cursor = row_id
+            if origin != self.origin:
+                handler(name)
+
+    def start(self, handler: Handler) -> None:
+        self.origin = uuid.uuid4().hex
+
+        def run() -> None:
+            while not self._stop.wait(self.interval):
+                try:
+                    self.poll(handler)
+                except sqlite3.Error as exc:
+                    logger.warning(f"Cache invalidation poll failed: {exc}")
+
+        self._thread = threading.Thread(target=run, name="cache-bus", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._conn.close()
+
+
+class RedisBus:
+    """Invalidation messages over Redis pub/sub."""
+
+    CHANNEL = "inacorts:cache-invalidations"
+
+    def __init__(self, url: str, interval: float) -> None:
+        self.interval = interval
+        self._client = redis.Redis.from_url(url)
+        self._worker = None
+        # Identifies this worker's own messages so they are not applied twice
+        self.origin = uuid.uuid4().hex
+
+    def publish(self, name: str) -> None:
+        self._client.publish(self.CHANNEL, json.dumps({"origin": self.origin, "name": name}))
+
+    def start(self, handler: Handler) -> None:
+        self.origin = uuid.uuid4().hex
+
+        def on_message(message) -> None:
+            payload = json.loads(message["data"])
+            if payload["origin"] != self.origin:
+                handler(payload["name"])
+
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(**{self.CHANNEL: on_message})
+        except redis.RedisError as exc:
+            logger.warning(f"Cache invalidation bus unavailable, relying on cache TTLs: {exc}")
+            return
+        self._worker = pubsub.run_in_thread(sleep_time=self.interval, daemon=True)
+
+    def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.stop()
+        self._client.close()
+
+
+def create_bus(backend: str, url: str, interval: float):
+    backend = backend.strip().lower()
+    if backend == "sqlite":
+        path = url[len("sqlite:///"):] if url.startswith("sqlite:///") else url
+        return SQLiteBus(path or "../database/cache_invalidations.db", interval)
+    if backend == "redis":
+        if redis is None:
+            logger.warning("CACHE_BACKEND=redis but the redis package is not installed; using local")
+            return LocalBus()
+        return RedisBus(url or "redis://localhost:6379/0", interval)
+    if backend != "local":
+        logger.warning(f"Unknown CACHE_BACKEND {backend!r}; using local")
+    return LocalBus()
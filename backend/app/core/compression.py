@@ -0,0 +1,245 @@
+"""
+Response compression.
+
+CompressionMiddleware compresses response bodies with gzip, brotli ("br") or
+zstd, whichever of the configured algorithms the client prefers in its
+Accept-Encoding header.  brotli and zstd need the optional ``brotli`` /
+``zstandard`` packages; algorithms whose package is missing are dropped with
+a warning at startup, so gzip (standard library) is always available.
+
+A response is compressed only when
+  * its Content-Type is in the allowlist (``type/*`` wildcards allowed),
+  * it does not already carry a Content-Encoding,
+  * its body is at least ``minimum_size`` bytes — streamed responses of
+    unknown length are always compressed, chunk by chunk.
+
+Compressing changes the representation, so a strong ETag is downgraded to a
+weak one and ``Vary: Accept-Encoding`` is added to every eligible response.
+"""
+
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+from loguru import logger
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+class _GzipEncoder:
+    def __init__(self, level: int) -> None:
+        # wbits 16 + MAX_WBITS selects the gzip container
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._z.compress(data)
+
+    def finish(self) -> bytes:
+        return self._z.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int) -> None:
+        self._c = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data)
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int) -> None:
+        self._c = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def finish(self) -> bytes:
+        return self._c.flush()
+
+
+ENCODERS = {
+    "gzip": _GzipEncoder,
+    "br": _BrotliEncoder,
+    "zstd": _ZstdEncoder,
+}
+
+DEFAULT_LEVELS = {"gzip": 6, "br": 4, "zstd": 3}
+
+
+def available_algorithms() -> List[str]:
+    available = ["gzip"]
+    if brotli is not None:
+        available.append("br")
+    if zstandard is not None:
+        available.append("zstd")
+    return available
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Map each coding in an Accept-Encoding header to its q-value."""
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate_encoding(header: str, algorithms: Iterable[str]) -> Optional[str]:
+    """
+    Pick the algorithm the client rates highest; ties go to the earlier entry
+    of ``algorithms`` (the server's preference order).
+    """
+    accepted = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for name in algorithms:
+        q = accepted.get(name, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        algorithms: Iterable[str] = ("gzip",),
+        minimum_size: int = 1024,
+        content_types: Iterable[str] = ("application/json",),
+        levels: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self.app = app
+        available = available_algorithms()
+        self.algorithms = []
+        for name in algorithms:
+            if name not in ENCODERS:
+                logger.warning(f"Unknown compression algorithm ignored: {name}")
+            elif name not in available:
+                logger.warning(f"Compression algorithm {name} unavailable (package not installed)")
+            else:
+                self.algorithms.append(name)
+        self.minimum_size = minimum_size
+        self.content_types = {t.lower() for t in content_types}
+        self.levels = {**DEFAULT_LEVELS, **(levels or {})}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD" or not self.algorithms:
+            await self.app(scope, receive, send)
+            return
+
+        accept = Headers(scope=scope).get("accept-encoding", "")
+        encoding = negotiate_encoding(accept, self.algorithms)
+        # Wrapped even when nothing is negotiated, to add Vary: Accept-Encoding
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def accepts_content_type(self, content_type: Optional[str]) -> bool:
+        if not content_type:
+            return False
+        media_type = content_type.split(";", 1)[0].strip().lower()
+        return (
+            media_type in self.content_types
+            or media_type.split("/", 1)[0] + "/*" in self.content_types
+        )
+
+    def new_encoder(self, encoding: str):
+        return ENCODERS[encoding](self.levels[encoding])
+
+
+class _CompressionResponder:
+    """
+    Wraps ``send`` for one response.  The start message is held back until
+    the first body chunk arrives, since whether to compress depends on it.
+    """
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: Optional[str], send: Send) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.encoder = None
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.start_message = message
+            return
+
+        if message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+            if not self._should_compress(start["status"], headers, body, more_body):
+                await self._send(start)
+                await self._send(message)
+                return
+
+            self.encoder = self.middleware.new_encoder(self.encoding)
+            headers["Content-Encoding"] = self.encoding
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag
+
+            data = self.encoder.compress(body)
+            if more_body:
+                if "content-length" in headers:
+                    del headers["content-length"]
+            else:
+                data += self.encoder.finish()
+                headers["Content-Length"] = str(len(data))
+            await self._send(start)
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        if self.encoder is None:
+            await self._send(message)
+            return
+
+        data = self.encoder.compress(body)
+        if not more_body:
+            data += self.encoder.finish()
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _should_compress(self, status: int, headers: MutableHeaders, body: bytes, more_body: bool) -> bool:
+        if status < 200 or status in (204, 304) or "content-encoding" in headers:
+            return False
+        if not self.middleware.accepts_content_type(headers.get("content-type")):
+            return False
+        headers.add_vary_header("Accept-Encoding")
+        if self.encoding is None:
+            return False
+
+        if more_body:
+            # Streamed: use the declared length when there is one
+            declared = headers.get("content-length")
+            return declared is None or int(declared) >= self.middleware.minimum_size
+        return len(body) >= self.middleware.minimum_size
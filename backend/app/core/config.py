@@ -16,6 +16,70 @@ class Settings(BaseSettings):
     # In Docker production mode this is set automatically by docker-compose.
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:5173"
 
+    # Query instrumentation: a statement shape executed at least this many
+    # times in one request is logged as a probable N+1 (0 disables the check).
+    # Per-request counts are returned in X-Query-Count outside production.
+    N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Slow-query log: statements slower than this (milliseconds) are logged
+    # with redacted parameters and the calling repository method; 0 disables.
+    # SLOW_QUERY_EXPLAIN also logs the query plan the first time a shape is slow.
+    SLOW_QUERY_THRESHOLD_MS: float = 200
+    SLOW_QUERY_EXPLAIN: bool = True
+
+    # On-demand profiling: admins may send "X-Profile: 1" (or ?profile=1) to
+    # record a cProfile of that single request under logs/profiles/.
+    PROFILING_ENABLED: bool = True
+
+    # Reference data cache (categories, expense categories, tags):
+    # rows kept per table and worker, and how long an entry may be served
+    # before it is reloaded.  Writes through this worker clear the table's
+    # entries at once; the TTL bounds staleness across workers (0 = no expiry).
+    REFERENCE_CACHE_SIZE: int = 1024
+    REFERENCE_CACHE_TTL_SECONDS: float = 30
+
+    # Cross-worker cache invalidation: "local" (single worker), "sqlite"
+    # (shared file on one host, polled) or "redis" (pub/sub; needs the redis
+    # package).  CACHE_URL is the sqlite:/// path or redis:// URL.
+    CACHE_BACKEND: str = "local"
+    CACHE_URL: str = ""
+    CACHE_SYNC_INTERVAL_SECONDS: float = 0.5
+
+    # Response compression: responses of an allowlisted content type and at
+    # least COMPRESSION_MINIMUM_SIZE bytes are compressed with the algorithm
+    # from COMPRESSION_ALGORITHMS (server preference order) that the client
+    # accepts. "br" / "zstd" need the optional brotli / zstandard packages,
+    # so they are opted into (e.g. "br,zstd,gzip") once those are installed.
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_ALGORITHMS: str = "gzip"
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_CONTENT_TYPES: str = "application/json,application/x-ndjson,text/csv,text/plain"
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    # Analytics export: Parquet copies of payments, expenses, order items and
+    # stock movements, written from a snapshot of the database by the
+    # maintenance scheduler every ANALYTICS_EXPORT_INTERVAL_HOURS (0 = only on
+    # demand through /api/v1/maintenance).  Needs the pyarrow package.
+    ANALYTICS_EXPORT_DIR: str = "../database/analytics"
+    ANALYTICS_EXPORT_INTERVAL_HOURS: float = 0
+    ANALYTICS_EXPORT_PARTITION_BY_MONTH: bool = True
+    ANALYTICS_EXPORT_ROW_GROUP_SIZE: int = 50000
+
+    # Order totals reconciliation: how often the maintenance scheduler
+    # recomputes paid / ordered / delivered totals from payments and items and
+    # repairs orders whose running totals drifted (0 disables the job).
+    ORDER_RECONCILE_INTERVAL_HOURS: float = 24
+
+    # Product sales velocity: every PRODUCT_STATS_INTERVAL_MINUTES the
+    # maintenance scheduler folds new OUT stock movements into per-product
+    # daily totals and recomputes 7 / 30 / 90-day sales, days of cover and the
+    # reorder flag (less than PRODUCT_REORDER_LEAD_DAYS of cover left).
+    # 0 disables the job.
+    PRODUCT_STATS_INTERVAL_MINUTES: float = 60
+    PRODUCT_REORDER_LEAD_DAYS: float = 14
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -29,5 +93,15 @@ class Settings(BaseSettings):
         """Parse ALLOWED_ORIGINS into a list."""
         return [o.strip() for o in self.ALLOWED_ORIGINS.split(",") if o.strip()]
 
+    @property
+    def compression_algorithms(self) -> list[str]:
+        """Parse COMPRESSION_ALGORITHMS into a list."""
+        return [a.strip().lower() for a in self.COMPRESSION_ALGORITHMS.split(",") if a.strip()]
+
+    @property
+    def compression_content_types(self) -> list[str]:
+        """Parse COMPRESSION_CONTENT_TYPES into a list."""
+        return [t.strip().lower() for t in self.COMPRESSION_CONTENT_TYPES.split(",") if t.strip()]
+
 
 settings = Settings()
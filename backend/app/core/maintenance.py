@@ -0,0 +1,143 @@
+"""
+Background maintenance scheduler.
+
+Housekeeping that should not run inside a request — the weekly backup check,
+log rotation, the analytics Parquet export — is registered here as a job.
+Jobs run one at a time on a single daemon thread per worker, either every
+``interval`` seconds or once when submitted (an on-demand run from the API).
+
+A job that raises is logged and marked failed; the scheduler keeps going and
+tries again at the next interval.  ``jobs()`` reports the state of every job
+for /api/v1/maintenance/jobs.
+
+Every uvicorn worker runs its own scheduler, so jobs must be idempotent or
+guard themselves against running twice (see app/core/analytics_export.py).
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from app.core.logging import logger
+
+
+@dataclass
+class Job:
+    name: str
+    func: Callable[[], object]
+    interval: Optional[float] = None
+    next_run: Optional[float] = None
+    running: bool = False
+    runs: int = 0
+    last_started_at: Optional[datetime] = None
+    last_finished_at: Optional[datetime] = None
+    last_status: Optional[str] = None
+    last_error: Optional[str] = None
+    last_result: object = None
+
+    def info(self) -> dict:
+        return {
+            "name": self.name,
+            "interval_seconds": self.interval,
+            "running": self.running,
+            "pending": self.next_run is not None and not self.running,
+            "runs": self.runs,
+            "last_started_at": self.last_started_at,
+            "last_finished_at": self.last_finished_at,
+            "last_status": self.last_status,
+            "last_error": self.last_error,
+            "last_result": self.last_result,
+        }
+
+
+class MaintenanceScheduler:
+    def __init__(self) -> None:
+        self._jobs: Dict[str, Job] = {}
+        self._wakeup = threading.Condition()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, name: str, func: Callable[[], object], interval: float,
+            first_run: Optional[float] = None) -> Job:
+        """Run ``func`` every ``interval`` seconds, first after ``first_run`` seconds (default: one interval)."""
+        delay = interval if first_run is None else first_run
+        with self._wakeup:
+            job = Job(name=name, func=func, interval=interval, next_run=time.monotonic() + delay)
+            self._jobs[name] = job
+            self._wakeup.notify()
+        return job
+
+    def submit(self, name: str, func: Callable[[], object]) -> Job:
+        """Run ``func`` once, as soon as the scheduler is free.
+
+        Raises RuntimeError while a job of the same name is queued or running.
+        """
+        with self._wakeup:
+            previous = self._jobs.get(name)
+            if previous is not None and (previous.running or previous.next_run is not None):
+                raise RuntimeError(f"Job {name} is already queued or running")
+            job = Job(name=name, func=func, next_run=time.monotonic())
+            if previous is not None:
+                job.runs = previous.runs
+            self._jobs[name] = job
+            self._wakeup.notify()
+        return job
+
+    def jobs(self) -> List[dict]:
+        with self._wakeup:
+            return [job.info() for job in sorted(self._jobs.values(), key=lambda j: j.name)]
+
+    def start(self) -> None:
+        with self._wakeup:
+            self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop after the job that is currently running, if any."""
+        with self._wakeup:
+            self._stopped = True
+            self._wakeup.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _next_due(self) -> Optional[Job]:
+        due = [job for job in self._jobs.values() if job.next_run is not None]
+        return min(due, key=lambda j: j.next_run) if due else None
+
+    def _run(self) -> None:
+        while True:
+            with self._wakeup:
+                while not self._stopped:
+                    job = self._next_due()
+                    delay = job.next_run - time.monotonic() if job else None
+                    if job is not None and delay <= 0:
+                        break
+                    self._wakeup.wait(delay)
+                if self._stopped:
+                    return
+                job.running = True
+                job.last_started_at = datetime.utcnow()
+            self._execute(job)
+
+    def _execute(self, job: Job) -> None:
+        started = time.monotonic()
+        status, error, result = "ok", None, None
+        try:
+            result = job.func()
+        except Exception as exc:
+            status, error = "failed", str(exc)
+            logger.exception(f"Maintenance job {job.name} failed: {exc}")
+        with self._wakeup:
+            job.running = False
+            job.runs += 1
+            job.last_finished_at = datetime.utcnow()
+            job.last_status, job.last_error, job.last_result = status, error, result
+            job.next_run = started + job.interval if job.interval else None
+        logger.info(f"Maintenance job {job.name} finished ({status}) in {time.monotonic() - started:.1f}s")
+
+
+scheduler = MaintenanceScheduler()
@@ -0,0 +1,153 @@
+"""
+On-demand request profiler for production diagnosis.
+
+An administrator can profile a single request by sending the header
+``X-Profile: 1`` or the query flag ``?profile=1``.  The route handler then
+runs under cProfile and the result is written as a pstats file to:
+  /logs/profiles/YYYYmmdd-HHMMSS-<method>-<path>-<id>.prof
+
+The files can be listed and downloaded through /api/v1/profiles and opened
+with ``python -m pstats`` or any pstats viewer (snakeviz, tuna, ...).
+
+Every API router uses ProfiledRoute, which wraps the endpoint in a function
+that checks one ContextVar and otherwise calls straight through — requests
+without the flag pay nothing beyond that lookup.  The profiler is enabled
+inside the wrapper because sync endpoints run in a worker thread, which a
+profiler started in the middleware would not see.
+"""
+
+import cProfile
+import functools
+import inspect
+import re
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+from fastapi import Request
+from fastapi.routing import APIRoute
+
+from app.core.config import settings
+from app.core.jwt import decode_token
+from app.core.logging import LOGS_DIR, logger
+
+
+PROFILES_DIR = LOGS_DIR / "profiles"
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY_PARAM = "profile"
+
+# Only names produced by _profile_filename() can be downloaded
+PROFILE_NAME_RE = re.compile(r"^[0-9]{8}-[0-9]{6}-[a-z]+-[a-z0-9_-]*-[0-9a-f]{8}\.prof$")
+
+_active_profile: ContextVar[Optional[cProfile.Profile]] = ContextVar("active_profile", default=None)
+
+
+def _profiled(endpoint: Callable) -> Callable:
+    """Wrap a route endpoint so it runs under the request's profiler, if any."""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            profile = _active_profile.get()
+            if profile is None:
+                return await endpoint(*args, **kwargs)
+            profile.enable()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                profile.disable()
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        profile = _active_profile.get()
+        if profile is None:
+            return endpoint(*args, **kwargs)
+        profile.enable()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            profile.disable()
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """APIRoute whose endpoint can be profiled on demand (see module docstring)."""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs) -> None:
+        super().__init__(path, _profiled(endpoint), **kwargs)
+
+
+def profiling_requested(request: Request) -> bool:
+    """True if the request carries the profile header or query flag."""
+    if not settings.PROFILING_ENABLED:
+        return False
+    flag = request.headers.get(PROFILE_HEADER) or request.query_params.get(PROFILE_QUERY_PARAM)
+    return flag is not None and flag.lower() in ("1", "true", "yes")
+
+
+def requested_by_admin(request: Request) -> bool:
+    """Check the bearer token belongs to an active administrator."""
+    auth = request.headers.get("authorization", "")
+    scheme, _, token = auth.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    payload = decode_token(token)
+    if not payload or payload.get("type") != "access" or not payload.get("is_admin"):
+        return False
+
+    # The claim may be stale (demoted or deactivated user) — confirm in the DB
+    from app.db.session import SessionLocal
+    from app.repositories.user_repository import UserRepository
+    db = SessionLocal()
+    try:
+        user = UserRepository(db).get_by_id(int(payload.get("sub")))
+        return bool(user and user.is_active and user.is_admin)
+    finally:
+        db.close()
+
+
+def _profile_filename(request: Request) -> str:
+    path = re.sub(r"[^a-z0-9]+", "_", request.url.path.lower()).strip("_")[:80]
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return f"{stamp}-{request.method.lower()}-{path}-{uuid.uuid4().hex[:8]}.prof"
+
+
+@contextmanager
+def profile_request(request: Request) -> Iterator[str]:
+    """Profile the route handler of this request; yields the profile file name."""
+    profile = cProfile.Profile()
+    name = _profile_filename(request)
+    token = _active_profile.set(profile)
+    try:
+        yield name
+    finally:
+        _active_profile.reset(token)
+        PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(str(PROFILES_DIR / name))
+        logger.info(f"Request profile saved: {name} ({request.method} {request.url.path})")
+
+
+def list_profiles() -> List[dict]:
+    """Return stored profiles, newest first."""
+    if not PROFILES_DIR.exists():
+        return []
+    files = sorted(PROFILES_DIR.glob("*.prof"), key=lambda f: f.stat().st_mtime, reverse=True)
+    return [
+        {
+            "name": f.name,
+            "size": f.stat().st_size,
+            "created_at": datetime.fromtimestamp(f.stat().st_mtime),
+        }
+        for f in files
+    ]
+
+
+def get_profile_path(name: str) -> Optional[Path]:
+    """Resolve a stored profile by name (None if invalid or missing)."""
+    if not PROFILE_NAME_RE.match(name):
+        return None
+    path = PROFILES_DIR / name
+    return path if path.is_file() else None
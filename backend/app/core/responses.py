@@ -0,0 +1,25 @@
+"""
+JSON response classes.
+
+ORJSONResponse is the application's default response class.  ModelResponse is
+for endpoints whose service already returns the validated response model
+(the paginated list endpoints): returning it skips FastAPI's response_model
+round trip, in which the model is dumped, validated a second time and
+re-serialized.  The route keeps its ``response_model`` for the OpenAPI schema.
+"""
+
+from typing import Any
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+class ModelResponse(ORJSONResponse):
+    """Render an already validated pydantic model without re-validating it."""
+
+    def render(self, content: Any) -> bytes:
+        # Python-mode dump: orjson encodes datetimes and enums natively,
+        # which is faster than pydantic's own JSON mode
+        if isinstance(content, BaseModel):
+            content = content.model_dump()
+        return super().render(content)
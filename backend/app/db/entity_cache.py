@@ -0,0 +1,60 @@
+"""
+Read-through cache for reference data.
+
+Categories, expense categories and tags are looked up by id or name on many
+requests (the category check before a product or expense is saved, tag
+lookups by name) and change rarely.  Users are deliberately not cached here:
+their lookup by id authenticates every request, and a deactivation or a
+password change must not wait for an entry to expire.  ``EntityCache`` keeps the column values of those rows in a
+per-process LRU map, keyed by lookup (``("id", 3)``, ``("name", "Fuel")``).
+
+A hit rebuilds the instance from the cached values and attaches it to the
+caller's session with ``merge(load=False)``, which emits no SQL; from there
+it behaves like a freshly loaded row — relationships lazy-load, and changes
+are flushed on commit.  Only column values are cached, never instances, so no
+session state is shared between requests.
+
+The owning repository invalidates the cache after every committed write to
+the table; the invalidation is broadcast to the other workers when a shared
+``CACHE_BACKEND`` is configured, and otherwise reaches them when their
+entries expire (``REFERENCE_CACHE_TTL_SECONDS``).  A row loaded while an
+invalidation lands is returned but not cached, so it cannot outlive it.
+"""
+
+from typing import Callable, Hashable, Optional, Type, TypeVar
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.cache import LRUCache, invalidate, register_cache
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class EntityCache:
+    def __init__(self, model: Type[T]) -> None:
+        self.model = model
+        self.name = model.__tablename__
+        self._columns = [attr.key for attr in inspect(model).column_attrs]
+        self.cache: LRUCache[dict] = register_cache(
+            self.name,
+            LRUCache(settings.REFERENCE_CACHE_SIZE, ttl=settings.REFERENCE_CACHE_TTL_SECONDS),
+        )
+
+    def get(self, db: Session, key: Hashable, load: Callable[[], Optional[T]]) -> Optional[T]:
+        """Return the row cached under ``key``, calling ``load`` on a miss."""
+        values = self.cache.get(key)
+        if values is not None:
+            obj = self.model(**values)
+            make_transient_to_detached(obj)
+            return db.merge(obj, load=False)
+
+        generation = self.cache.generation
+        obj = load()
+        if obj is not None:
+            self.cache.set(key, {name: getattr(obj, name) for name in self._columns}, generation=generation)
+        return obj
+
+    def invalidate(self) -> None:
+        invalidate(self.name)
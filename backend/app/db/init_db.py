@@ -1,8 +1,11 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import text, inspect
+from sqlalchemy.schema import CreateIndex
 from app.db.base import Base, import_models
 from app.db.session import engine
-from app.models import User, ExpenseCategory
+from app.db.search_index import ensure_search_indexes
+from app.db.table_versions import ensure_table_versions
+from app.models import User, ExpenseCategory, Order, OrderItem, Payment, StockMovement
 from app.core.security import hash_password
 from loguru import logger
 
@@ -51,13 +54,54 @@ def _migrate_users_table(db: Session) -> None:
         db.commit()
 
 
+def _create_missing_indexes(db: Session, *models) -> None:
+    """create_all() only creates indexes together with their table."""
+    for model in models:
+        for index in model.__table__.indexes:
+            db.execute(CreateIndex(index, if_not_exists=True))
+    db.commit()
+
+
+def _migrate_orders_table(db: Session) -> None:
+    """Add the running order totals and backfill them from payments and items."""
+    migrations = [
+        ("paid_amount", "FLOAT NOT NULL DEFAULT 0"),
+        ("total_quantity", "INTEGER NOT NULL DEFAULT 0"),
+        ("delivered_quantity", "INTEGER NOT NULL DEFAULT 0"),
+    ]
+    existing_columns = {c["name"] for c in inspect(engine).get_columns("orders")}
+    missing = [(name, col_type) for name, col_type in migrations if name not in existing_columns]
+    for col_name, col_type in missing:
+        _add_column_if_not_exists(db, "orders", col_name, col_type)
+    if missing:
+        from app.repositories.order_repository import OrderRepository
+        repo = OrderRepository(db)
+        totals = repo.total_mismatches()
+        repo.set_totals(totals)
+        db.commit()
+        logger.info(f"Backfilled running totals for {len(totals)} orders")
+
+
+def _backfill_customer_metrics(db: Session) -> None:
+    """Fill customer_metrics right after it was created on an existing database."""
+    from app.repositories.customer_metrics_repository import CustomerMetricsRepository
+    rows = CustomerMetricsRepository(db).rebuild()
+    if rows:
+        logger.info(f"Built customer metrics for {rows} customers")
+
+
 def init_db(db: Session) -> None:
     # Ensure all models are imported before creating tables
     import_models()
+    had_customer_metrics = inspect(engine).has_table("customer_metrics")
     Base.metadata.create_all(bind=engine)
     
     # Migrate existing tables to add new columns
     _migrate_users_table(db)
+    _migrate_orders_table(db)
+    _create_missing_indexes(db, Order, OrderItem, Payment, StockMovement)
+    if not had_customer_metrics:
+        _backfill_customer_metrics(db)
     
     admin_user = db.query(User).filter(User.username == "admin").first()
     if not admin_user:
@@ -120,6 +164,12 @@ def init_db(db: Session) -> None:
             logger.info(f"Expense category created: {cat_data['name']}")
     
     db.commit()
+
+    # Full-text search indexes (FTS5 on SQLite, pg_trgm on PostgreSQL)
+    ensure_search_indexes(db)
+    # Change counters for conditional GETs; bumped here so nothing written
+    # while the app was down hides behind an ETag issued before
+    ensure_table_versions(db)
     logger.info("Database initialized")
 
 
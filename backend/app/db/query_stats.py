@@ -0,0 +1,123 @@
+"""
+Per-request SQL query accounting and N+1 detection.
+
+Every statement sent to the database passes through the engine's
+``before_cursor_execute`` event.  The listener installed here records the
+statement against:
+  - the QueryStats bound to the current request (set by the middleware in
+    main.py through ``track_queries()``), and
+  - any active ``count_queries()`` capture (used by tests and benchmarks).
+
+Statements are grouped by "shape" — the SQL text with whitespace collapsed
+and expanded IN lists folded — so a statement repeated once per row of a page
+(the classic N+1 pattern) shows up as one shape with a high count.
+
+Test helper:
+    with assert_max_queries(5):
+        client.get("/api/v1/orders", headers=auth)
+"""
+
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# "IN (?, ?, ?)" → "IN (?)" so pages of different sizes share a shape
+_PLACEHOLDER = r"(?:\?|:\w+|%\(\w+\)s|%s)"
+_IN_LIST_RE = re.compile(rf"\bIN \(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)", re.IGNORECASE)
+
+
+def statement_shape(statement: str) -> str:
+    """Normalise a SQL statement so identical query shapes compare equal."""
+    shape = _WHITESPACE_RE.sub(" ", statement).strip()
+    return _IN_LIST_RE.sub("IN (?)", shape)
+
+
+class QueryStats:
+    """Statement count and per-shape histogram for one unit of work."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str) -> None:
+        self.count += 1
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int = 2) -> List[Tuple[str, int]]:
+        """Return (shape, count) pairs executed at least ``threshold`` times."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+# QueryStats of the request currently being served (None outside a request)
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# Explicit captures opened by count_queries(); shared across threads because
+# the test client runs the application in a separate thread.
+_captures: List[QueryStats] = []
+_captures_lock = threading.Lock()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement)
+    if _captures:
+        with _captures_lock:
+            for capture in _captures:
+                capture.record(statement)
+
+
+def install_query_counter(engine: Engine) -> None:
+    """Attach the statement counter to an engine (idempotent)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Bind a fresh QueryStats to the current context (one per request)."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Return the QueryStats of the request being served, if any."""
+    return _current_stats.get()
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """Count every statement executed, from any thread, while the block runs."""
+    stats = QueryStats()
+    with _captures_lock:
+        _captures.append(stats)
+    try:
+        yield stats
+    finally:
+        with _captures_lock:
+            _captures.remove(stats)
+
+
+@contextmanager
+def assert_max_queries(budget: int) -> Iterator[QueryStats]:
+    """Fail with AssertionError if the block executes more than ``budget`` statements."""
+    with count_queries() as stats:
+        yield stats
+    if stats.count > budget:
+        repeated = "\n".join(f"  {n}x {shape}" for shape, n in stats.repeated())
+        raise AssertionError(
+            f"Query budget exceeded: {stats.count} statements executed, budget is {budget}"
+            + (f"\nRepeated statements:\n{repeated}" if repeated else "")
+        )
@@ -0,0 +1,301 @@
+"""
+Full-text search index for products, customers and contacts.
+
+The list endpoints' ``search`` parameter used to run
+``col ILIKE '%term%' OR ...`` over every row — a leading wildcard can never
+use an index, so every search was a full table scan.
+
+SQLite
+  One FTS5 table per entity (``products_fts``, ...) in external-content mode:
+  it stores only the index and reads column values from the base table.
+  AFTER INSERT / UPDATE / DELETE triggers keep it in sync, so ORM writes,
+  bulk Core inserts and ``query.delete()`` are all covered.  Search terms are
+  split into words and each word is matched as a prefix ("civ m1" finds
+  "M10 Civata"); results can be ordered by bm25 relevance.
+
+PostgreSQL
+  A GIN trigram index (pg_trgm) over the searched columns lets the existing
+  ILIKE filter use an index; relevance is trigram similarity.
+
+Any other backend — or SQLite built without FTS5 — keeps the plain ILIKE
+filter.  ``ensure_search_indexes()`` is called from init_db on startup.
+
+Global search (/api/v1/search) uses one more, unified FTS5 table,
+``search_documents``, holding a (title, body) document per product,
+customer, contact and note.  Its rowid encodes the source row
+(``id * 4 + kind``), so the triggers update a document by primary key and a
+type-ahead query is a single MATCH ... ORDER BY rank LIMIT n.  On PostgreSQL
+global search is a UNION of the trigram-indexed per-table queries.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Column, Integer, MetaData, Table, func, literal_column, or_, select, text
+from sqlalchemy.orm import Query, Session
+
+from app.core.logging import logger
+
+
+# Indexed columns per table, in ranking-weight order (first column weighs most)
+SEARCH_INDEXES: Dict[str, Tuple[str, ...]] = {
+    "products": ("name", "barcode", "description"),
+    "customers": ("name", "email", "phone"),
+    "contacts": ("name", "email", "phone"),
+}
+
+# bm25 column weights for the columns above
+_BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+# Sources of the unified search_documents table:
+#   kind → (rowid code, table, title SQL, body SQL); "{row}" is new/old/the table
+GLOBAL_SEARCH_SOURCES: Dict[str, Tuple[int, str, str, str]] = {
+    "product": (0, "products", "{row}.name", "COALESCE({row}.barcode, '')"),
+    "customer": (1, "customers", "{row}.name",
+                 "COALESCE({row}.email, '') || ' ' || COALESCE({row}.phone, '')"),
+    "contact": (2, "contacts", "{row}.name",
+                "COALESCE({row}.email, '') || ' ' || COALESCE({row}.phone, '')"),
+    "note": (3, "notes", "{row}.text", "''"),
+}
+_KIND_BY_CODE = {code: kind for kind, (code, *_rest) in GLOBAL_SEARCH_SOURCES.items()}
+_KINDS = len(GLOBAL_SEARCH_SOURCES)
+
+# Notes are only searched globally; on PostgreSQL they need a trigram index too
+_POSTGRES_EXTRA_INDEXES: Dict[str, Tuple[str, ...]] = {"notes": ("text",)}
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_ROW_COLUMN_RE = re.compile(r"\{row\}\.(\w+)")
+
+# Set by ensure_search_indexes() once the backend-specific index exists
+_backend: Optional[str] = None
+
+# FTS tables are not part of Base.metadata: create_all/drop_all must not touch them
+_fts_metadata = MetaData()
+
+
+def _fts_table(table: str) -> Table:
+    name = f"{table}_fts"
+    if name not in _fts_metadata.tables:
+        Table(name, _fts_metadata, Column("rowid", Integer, primary_key=True),
+              *(Column(col) for col in SEARCH_INDEXES[table]))
+    return _fts_metadata.tables[name]
+
+
+# =====================================================================
+#  INDEX MAINTENANCE
+# =====================================================================
+
+def _sqlite_has_fts5(db: Session) -> bool:
+    options = {row[0] for row in db.execute(text("PRAGMA compile_options"))}
+    return "ENABLE_FTS5" in options
+
+
+def _ensure_sqlite_index(db: Session, table: str) -> None:
+    columns = SEARCH_INDEXES[table]
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new_cols = ", ".join(f"new.{c}" for c in columns)
+    old_cols = ", ".join(f"old.{c}" for c in columns)
+
+    db.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='1 2 3')"
+    ))
+
+    # Dropping the base table (reset_db) drops its triggers but not the FTS
+    # table, so missing triggers mean the index has to be rebuilt as well.
+    existing = {
+        row[0] for row in db.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = :t"),
+            {"t": table},
+        )
+    }
+    triggers = {
+        f"{fts}_ai": f"AFTER INSERT ON {table} BEGIN "
+                     f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols}); END",
+        f"{fts}_ad": f"AFTER DELETE ON {table} BEGIN "
+                     f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END",
+        f"{fts}_au": f"AFTER UPDATE OF {cols} ON {table} BEGIN "
+                     f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+                     f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols}); END",
+    }
+    if triggers.keys() <= existing:
+        return
+    for name, body in triggers.items():
+        db.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+        db.execute(text(f"CREATE TRIGGER {name} {body}"))
+    db.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+    logger.info(f"Search index {fts} (re)built")
+
+
+def _ensure_sqlite_global_index(db: Session) -> None:
+    db.execute(text(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_documents USING fts5("
+        "title, body, tokenize='unicode61 remove_diacritics 2', prefix='1 2 3')"
+    ))
+    existing = dict(db.execute(text(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'search_documents_%'"
+    )).all())
+    for kind, (code, table, title, body) in GLOBAL_SEARCH_SOURCES.items():
+        # Only changes to the columns a document is built from rewrite it, so
+        # stock and timestamp updates leave the index alone
+        columns = ", ".join(dict.fromkeys(_ROW_COLUMN_RE.findall(f"{title} {body}")))
+        insert_new = (
+            f"INSERT INTO search_documents(rowid, title, body) VALUES "
+            f"(new.id * {_KINDS} + {code}, {title.format(row='new')}, {body.format(row='new')});"
+        )
+        delete_old = f"DELETE FROM search_documents WHERE rowid = old.id * {_KINDS} + {code};"
+        triggers = {
+            f"search_documents_{kind}_ai": f"AFTER INSERT ON {table} BEGIN {insert_new} END",
+            f"search_documents_{kind}_ad": f"AFTER DELETE ON {table} BEGIN {delete_old} END",
+            f"search_documents_{kind}_au": f"AFTER UPDATE OF {columns} ON {table} "
+                                           f"BEGIN {delete_old} {insert_new} END",
+        }
+        if all(existing.get(name) == f"CREATE TRIGGER {name} {body_sql}" for name, body_sql in triggers.items()):
+            continue
+        for name, body_sql in triggers.items():
+            db.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+            db.execute(text(f"CREATE TRIGGER {name} {body_sql}"))
+        db.execute(text(f"DELETE FROM search_documents WHERE rowid % {_KINDS} = {code}"))
+        db.execute(text(
+            f"INSERT INTO search_documents(rowid, title, body) "
+            f"SELECT id * {_KINDS} + {code}, {title.format(row=table)}, {body.format(row=table)} FROM {table}"
+        ))
+        logger.info(f"Global search documents for {table} (re)built")
+
+
+def _ensure_postgres_index(db: Session, table: str, columns: Tuple[str, ...]) -> None:
+    ops = ", ".join(f"{c} gin_trgm_ops" for c in columns)
+    db.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_search_trgm ON {table} USING gin ({ops})"))
+
+
+def ensure_search_indexes(db: Session) -> None:
+    """Create the backend's search indexes (and sync triggers) if missing."""
+    global _backend
+    dialect = db.get_bind().dialect.name
+    try:
+        if dialect == "sqlite" and _sqlite_has_fts5(db):
+            for table in SEARCH_INDEXES:
+                _ensure_sqlite_index(db, table)
+            _ensure_sqlite_global_index(db)
+        elif dialect == "postgresql":
+            db.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            for table, columns in {**SEARCH_INDEXES, **_POSTGRES_EXTRA_INDEXES}.items():
+                _ensure_postgres_index(db, table, columns)
+        else:
+            logger.warning(f"No search index support for '{dialect}' — search falls back to ILIKE scans")
+            return
+        db.commit()
+        _backend = dialect
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Could not create search indexes ({e}) — search falls back to ILIKE scans")
+
+
+# =====================================================================
+#  QUERYING
+# =====================================================================
+
+def fts_match_expression(term: str) -> Optional[str]:
+    """Turn user input into an FTS5 query: every word, as a quoted prefix, must match."""
+    words = _WORD_RE.findall(term)
+    if not words:
+        return None
+    return " ".join(f'"{w}"*' for w in words)
+
+
+def _ilike_filter(model, term: str):
+    return or_(*(getattr(model, c).ilike(f"%{term}%") for c in SEARCH_INDEXES[model.__tablename__]))
+
+
+def apply_search(query: Query, model, term: str) -> Tuple[Query, Optional[object]]:
+    """Restrict ``query`` to rows of ``model`` matching ``term``.
+
+    Returns the filtered query and a relevance expression to order by
+    (ascending = best first), or None when the backend cannot rank.
+    """
+    table = model.__tablename__
+    columns = SEARCH_INDEXES[table]
+
+    if _backend == "sqlite":
+        match = fts_match_expression(term)
+        if match is not None:
+            fts = _fts_table(table)
+            fts_name = literal_column(fts.name)
+            hits = (
+                select(
+                    fts.c.rowid.label("id"),
+                    func.bm25(fts_name, *_BM25_WEIGHTS[:len(columns)]).label("rank"),
+                )
+                .where(fts_name.op("MATCH")(match))
+                .subquery(f"{table}_search")
+            )
+            return query.join(hits, model.id == hits.c.id), hits.c.rank
+
+    query = query.filter(_ilike_filter(model, term))
+    if _backend == "postgresql":
+        return query, -func.similarity(getattr(model, columns[0]), term)
+    return query, None
+
+
+def order_by_relevance(query: Query, model, rank, order: str) -> Query:
+    """ORDER BY relevance (best first) with the id as a stable tie-breaker."""
+    if rank is None:
+        return query.order_by(model.id.desc() if order == "desc" else model.id.asc())
+    return query.order_by(rank.asc(), model.id.asc())
+
+
+def global_search(db: Session, term: str, limit: int) -> List[dict]:
+    """Best ``limit`` documents across all global-search sources.
+
+    Each hit is a dict: kind, id, title, body, rank (ascending = better) and,
+    for notes, the raw entity_type / entity_id the note is attached to.
+    """
+    if _backend == "sqlite":
+        match = fts_match_expression(term)
+        if match is None:
+            return []
+        rows = db.execute(text(
+            f"SELECT search_documents.rowid, title, body, "
+            f"bm25(search_documents, 10.0, 2.0) AS rank, notes.entity_type, notes.entity_id "
+            f"FROM search_documents "
+            f"LEFT JOIN notes ON search_documents.rowid % {_KINDS} = {GLOBAL_SEARCH_SOURCES['note'][0]} "
+            f"AND notes.id = search_documents.rowid / {_KINDS} "
+            f"WHERE search_documents MATCH :match ORDER BY rank LIMIT :limit"
+        ), {"match": match, "limit": limit})
+        return [
+            {
+                "kind": _KIND_BY_CODE[rowid % _KINDS], "id": rowid // _KINDS,
+                "title": title, "body": body, "rank": rank,
+                "entity_type": entity_type, "entity_id": entity_id,
+            }
+            for rowid, title, body, rank, entity_type, entity_id in rows
+        ]
+
+    # PostgreSQL (trigram-indexed) or plain ILIKE: one UNION ALL round trip
+    pattern = f"%{term}%"
+    dialect = db.get_bind().dialect.name
+    like = "ILIKE" if dialect == "postgresql" else "LIKE"  # SQLite's LIKE ignores ASCII case
+    rank_sql = "-similarity({title}, :term)" if _backend == "postgresql" else "0"
+    parts = []
+    for kind, (code, table, title, body) in GLOBAL_SEARCH_SOURCES.items():
+        title_sql, body_sql = title.format(row=table), body.format(row=table)
+        note_cols = f"{table}.entity_type, {table}.entity_id" if kind == "note" else "NULL, NULL"
+        parts.append(
+            f"SELECT * FROM (SELECT {code} AS code, {table}.id AS id, {title_sql} AS title, "
+            f"{body_sql} AS body, {rank_sql.format(title=title_sql)} AS rank, {note_cols} "
+            f"FROM {table} WHERE {title_sql} {like} :pattern OR {body_sql} {like} :pattern "
+            f"ORDER BY rank LIMIT :limit) AS {table}_hits"
+        )
+    rows = db.execute(
+        text(" UNION ALL ".join(parts) + " ORDER BY rank, id LIMIT :limit"),
+        {"pattern": pattern, "term": term, "limit": limit},
+    )
+    return [
+        {
+            "kind": _KIND_BY_CODE[code], "id": id_, "title": title, "body": body, "rank": rank,
+            "entity_type": entity_type, "entity_id": entity_id,
+        }
+        for code, id_, title, body, rank, entity_type, entity_id in rows
+    ]
@@ -1,12 +1,16 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 from app.core.config import settings
+from app.db.query_stats import install_query_counter
+from app.db.slow_query_log import install_slow_query_log
 
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
     echo=False
 )
+install_query_counter(engine)
+install_slow_query_log(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
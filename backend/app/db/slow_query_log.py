@@ -0,0 +1,151 @@
+"""
+Slow-query log.
+
+Times every statement between ``before_cursor_execute`` and
+``after_cursor_execute``.  Statements slower than SLOW_QUERY_THRESHOLD_MS are
+logged with:
+  - the SQL text and its bound parameters (string values are redacted to
+    their length so no customer data or password hashes end up in the logs),
+  - the duration in milliseconds,
+  - the repository (or service) method that issued it.
+
+The first time a given statement shape is slow, its query plan is captured
+as well — ``EXPLAIN QUERY PLAN`` on SQLite, ``EXPLAIN`` on PostgreSQL — which
+makes full table scans and missing indexes visible straight from the log.
+"""
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.db.query_stats import statement_shape
+
+
+_EXPLAIN_PREFIX = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN ",
+}
+
+# Statement shapes whose plan has already been logged
+_explained: set[str] = set()
+_explained_lock = threading.Lock()
+
+# Set by suppress_slow_query_log() around work that is slow by design
+_suppressed: ContextVar[bool] = ContextVar("slow_query_log_suppressed", default=False)
+
+
+def _redact_value(value: Any) -> str:
+    if isinstance(value, str):
+        return f"<str:{len(value)}>"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"<bytes:{len(value)}>"
+    return repr(value)
+
+
+def _redact(parameters: Any) -> str:
+    """Render bound parameters with string/bytes values masked."""
+    if parameters is None:
+        return "()"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {_redact_value(v)}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(_redact_value(v) for v in parameters) + ")"
+    return _redact_value(parameters)
+
+
+def _calling_method() -> str:
+    """Return the innermost repository method on the stack (or service as a fallback)."""
+    frame = sys._getframe(2)
+    fallback: Optional[str] = None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.repositories."):
+            return f"{module}:{frame.f_code.co_qualname}"
+        if fallback is None and module.startswith("app.") and not module.startswith("app.db."):
+            fallback = f"{module}:{frame.f_code.co_qualname}"
+        frame = frame.f_back
+    return fallback or "<unknown>"
+
+
+def _explain(conn, statement: str, parameters: Any) -> Optional[str]:
+    """Run the dialect's EXPLAIN on a raw DBAPI cursor (bypasses engine events)."""
+    prefix = _EXPLAIN_PREFIX.get(conn.dialect.name)
+    if prefix is None:
+        return None
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters or ())
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    if conn.dialect.name == "sqlite":
+        # (id, parent, notused, detail)
+        return "\n".join(f"  {row[3]}" for row in rows)
+    return "\n".join(f"  {row[0]}" for row in rows)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start_time"].pop()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if elapsed_ms < settings.SLOW_QUERY_THRESHOLD_MS or _suppressed.get():
+        return
+
+    caller = _calling_method()
+    logger.warning(
+        f"Slow query ({elapsed_ms:.1f} ms) in {caller}: "
+        f"{' '.join(statement.split())} | params={'<executemany>' if executemany else _redact(parameters)}"
+    )
+
+    if not settings.SLOW_QUERY_EXPLAIN or executemany:
+        return
+    shape = statement_shape(statement)
+    with _explained_lock:
+        if shape in _explained:
+            return
+        _explained.add(shape)
+    try:
+        plan = _explain(conn, statement, parameters)
+    except Exception as e:
+        logger.debug(f"Could not capture query plan for slow query: {e}")
+        return
+    if plan:
+        logger.warning(f"Query plan for slow query in {caller}:\n{plan}")
+
+
+def _handle_error(exception_context):
+    # The statement failed, so after_cursor_execute will not pop its timer
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+def install_slow_query_log(engine: Engine) -> None:
+    """Attach the slow-query timer to an engine; a threshold of 0 disables it."""
+    if settings.SLOW_QUERY_THRESHOLD_MS <= 0:
+        return
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+@contextmanager
+def suppress_slow_query_log() -> Iterator[None]:
+    """Silence the slow-query log for bulk work (data generators, migrations)."""
+    token = _suppressed.set(True)
+    try:
+        yield
+    finally:
+        _suppressed.reset(token)
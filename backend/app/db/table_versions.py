@@ -0,0 +1,77 @@
+"""
+Per-table change counters for conditional GETs.
+
+Read-mostly tables (categories, expense categories, tags, users) each have a
+row in ``table_versions`` holding a counter and the time of the last change.
+Every repository write to one of them calls ``bump_table_versions`` inside
+the same transaction, so the counter moves exactly when the data does.
+
+``table_stamp`` reads the rows for a set of tables in one query and turns them
+into an ETag / Last-Modified pair.  An endpoint whose response depends only on
+those tables can answer a matching ``If-None-Match`` with 304 without loading
+or serializing a single row (see ``not_modified`` in app/api/v1/dependencies).
+
+Writes that bypass the repositories (data generators, manual edits while the
+app is down) are covered by ``ensure_table_versions``: init_db bumps every
+counter on startup.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models import TableVersion
+
+
+VERSIONED_TABLES = ("categories", "expense_categories", "tags", "users")
+
+
+@dataclass(frozen=True)
+class TableStamp:
+    etag: str
+    last_modified: datetime  # naive UTC
+
+
+def bump_table_versions(db: Session, *tables: str) -> None:
+    """Record a change to ``tables``; committed with the caller's transaction."""
+    db.execute(
+        update(TableVersion)
+        .where(TableVersion.table_name.in_(tables))
+        .values(version=TableVersion.version + 1, updated_at=datetime.utcnow())
+    )
+
+
+def ensure_table_versions(db: Session) -> None:
+    """Create missing counter rows and bump the existing ones."""
+    existing = {
+        name for (name,) in
+        db.query(TableVersion.table_name).filter(TableVersion.table_name.in_(VERSIONED_TABLES))
+    }
+    now = datetime.utcnow()
+    for name in VERSIONED_TABLES:
+        if name not in existing:
+            db.add(TableVersion(table_name=name, version=1, updated_at=now))
+    bump_table_versions(db, *existing)
+    db.commit()
+
+
+def table_stamp(db: Session, tables: Iterable[str]) -> TableStamp:
+    """Current ETag / Last-Modified for a response built from ``tables``."""
+    tables = sorted(tables)
+    rows = (
+        db.query(TableVersion.table_name, TableVersion.version, TableVersion.updated_at)
+        .filter(TableVersion.table_name.in_(tables))
+        .order_by(TableVersion.table_name)
+        .all()
+    )
+    # updated_at is part of the digest so a recreated database never reissues
+    # an ETag a client may still hold from before
+    digest = hashlib.blake2s(digest_size=8)
+    for name, version, updated_at in rows:
+        digest.update(f"{name}:{version}:{updated_at.isoformat()};".encode())
+    last_modified = max((row.updated_at for row in rows), default=datetime(1970, 1, 1))
+    return TableStamp(etag=f'W/"{digest.hexdigest()}"', last_modified=last_modified)
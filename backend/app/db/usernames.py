@@ -0,0 +1,52 @@
+"""
+Batch username resolution for responses.
+
+Response schemas show who created / received / performed a row as a
+``*_username`` field (``username_of`` in app/schemas/common.py).  Instead of
+loading the full User row behind every item, services resolve the distinct
+user ids of a page with ``with_usernames`` — one ``SELECT id, username`` for
+the ids not already in the per-worker ``username_cache`` — and pass the
+result as validation context.
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCache, register_cache
+from app.core.config import settings
+from app.models import User
+from app.schemas.common import USERNAMES
+
+username_cache: LRUCache[str] = register_cache(
+    "usernames",
+    LRUCache(settings.REFERENCE_CACHE_SIZE, ttl=settings.REFERENCE_CACHE_TTL_SECONDS),
+)
+
+
+def resolve_usernames(db: Session, user_ids: Iterable[Optional[int]]) -> Dict[int, str]:
+    """Map each of ``user_ids`` to its username, querying only cache misses."""
+    usernames: Dict[int, str] = {}
+    missing = []
+    for user_id in set(user_ids):
+        if user_id is None:
+            continue
+        username = username_cache.get(user_id)
+        if username is None:
+            missing.append(user_id)
+        else:
+            usernames[user_id] = username
+    if missing:
+        for user_id, username in db.query(User.id, User.username).filter(User.id.in_(missing)):
+            username_cache.set(user_id, username)
+            usernames[user_id] = username
+    return usernames
+
+
+def with_usernames(db: Session, rows: Iterable[Any], *fks: str) -> dict:
+    """
+    Validation context for ``rows`` whose user ids are in the ``fks`` columns
+    (default ``created_by``).
+    """
+    fks = fks or ("created_by",)
+    return {USERNAMES: resolve_usernames(db, (getattr(row, fk) for row in rows for fk in fks))}
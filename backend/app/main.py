@@ -1,12 +1,22 @@
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from contextlib import asynccontextmanager
 from app.core.logging import logger, rotate_logs
 from app.core.config import settings
 from app.core.exceptions import AppException
 from app.core.backup import run_weekly_backup
 from app.db.session import SessionLocal
+from app.db.query_stats import track_queries
+from app.core.profiler import profiling_requested, requested_by_admin, profile_request
+from app.core.compression import CompressionMiddleware
+from app.core.cache import start_cache_sync, stop_cache_sync
+from app.core.cache_bus import create_bus
+from app.core.maintenance import scheduler
+from app.core.analytics_export import scheduled_export
+from app.services.order_service import reconcile_order_totals
+from app.services.product_service import refresh_product_stats
 from app.db.init_db import init_db
 from app.api.v1 import (
     auth,
@@ -21,7 +31,11 @@ from app.api.v1 import (
     notes,
     tags,
     expenses,
-    users
+    users,
+    profiles,
+    search,
+    metrics,
+    maintenance
 )
 import time
 
@@ -38,7 +52,26 @@ async def lifespan(app: FastAPI):
     run_weekly_backup()
     # Rotate logs: archive old active logs, delete expired backup logs
     rotate_logs()
+    # Receive cache invalidations from the other workers
+    start_cache_sync(create_bus(settings.CACHE_BACKEND, settings.CACHE_URL, settings.CACHE_SYNC_INTERVAL_SECONDS))
+    # Background maintenance: repeat the startup checks daily for long-running
+    # servers, verify order totals, refresh product sales velocity, and export
+    # analytics Parquet files if an interval is configured
+    scheduler.add("weekly_backup", run_weekly_backup, interval=24 * 3600)
+    scheduler.add("rotate_logs", rotate_logs, interval=24 * 3600)
+    if settings.ORDER_RECONCILE_INTERVAL_HOURS > 0:
+        scheduler.add("order_totals_reconciliation", reconcile_order_totals,
+                      interval=settings.ORDER_RECONCILE_INTERVAL_HOURS * 3600)
+    if settings.PRODUCT_STATS_INTERVAL_MINUTES > 0:
+        scheduler.add("product_stats", refresh_product_stats,
+                      interval=settings.PRODUCT_STATS_INTERVAL_MINUTES * 60, first_run=30)
+    if settings.ANALYTICS_EXPORT_INTERVAL_HOURS > 0:
+        scheduler.add("analytics_export", scheduled_export,
+                      interval=settings.ANALYTICS_EXPORT_INTERVAL_HOURS * 3600, first_run=60)
+    scheduler.start()
     yield
+    scheduler.stop()
+    stop_cache_sync()
     logger.info("Shutting down INACORTS application")
 
 
@@ -58,6 +91,7 @@ app = FastAPI(
     docs_url=docs_url,
     redoc_url=redoc_url,
     openapi_url=openapi_url,
+    default_response_class=ORJSONResponse,
 )
 
 # ---------------------------------------------------------------------------
@@ -120,6 +154,71 @@ async def log_requests(request: Request, call_next):
     return response
 
 
+# ---------------------------------------------------------------------------
+# Query accounting.  Counts every SQL statement issued while serving the
+# request and warns when one statement shape repeats N_PLUS_ONE_THRESHOLD
+# times or more (a query-per-row / N+1 pattern).  Outside production the
+# totals are returned to the client in X-Query-Count / X-Query-Repeated.
+# ---------------------------------------------------------------------------
+@app.middleware("http")
+async def query_stats_middleware(request: Request, call_next):
+    with track_queries() as stats:
+        response = await call_next(request)
+
+    threshold = settings.N_PLUS_ONE_THRESHOLD
+    repeated = stats.repeated(threshold) if threshold > 0 else []
+    for shape, count in repeated:
+        logger.warning(
+            f"Possible N+1 on {request.method} {request.url.path}: "
+            f"statement executed {count}x — {shape[:300]}"
+        )
+
+    if not settings.is_production:
+        response.headers["X-Query-Count"] = str(stats.count)
+        response.headers["X-Query-Repeated"] = str(len(repeated))
+    return response
+
+
+# ---------------------------------------------------------------------------
+# On-demand profiling.  An admin request carrying "X-Profile: 1" or
+# "?profile=1" runs its route handler under cProfile; the pstats file is
+# stored in logs/profiles/ and its name returned in X-Profile-Id.  Requests
+# without the flag skip straight to the handler.
+# ---------------------------------------------------------------------------
+@app.middleware("http")
+async def profiling_middleware(request: Request, call_next):
+    if not profiling_requested(request):
+        return await call_next(request)
+    if not await run_in_threadpool(requested_by_admin, request):
+        logger.warning(f"Ignored profiling flag from non-admin request → {request.url.path}")
+        return await call_next(request)
+
+    with profile_request(request) as profile_id:
+        response = await call_next(request)
+    response.headers["X-Profile-Id"] = profile_id
+    return response
+
+
+# ---------------------------------------------------------------------------
+# Response compression.  Added last so it is the outermost middleware and
+# sees the final headers and body.  Large JSON pages (orders with items,
+# stock movements) shrink several-fold; responses under
+# COMPRESSION_MINIMUM_SIZE or of other content types pass through untouched.
+# ---------------------------------------------------------------------------
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        algorithms=settings.compression_algorithms,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        content_types=settings.compression_content_types,
+        levels={
+            "gzip": settings.COMPRESSION_GZIP_LEVEL,
+            "br": settings.COMPRESSION_BROTLI_QUALITY,
+            "zstd": settings.COMPRESSION_ZSTD_LEVEL,
+        },
+    )
+
+
 @app.exception_handler(AppException)
 def app_exception_handler(request: Request, exc: AppException):
     logger.warning(f"Application exception: {exc.message} (Status: {exc.status_code}) - Path: {request.url.path}")
@@ -167,3 +266,7 @@ app.include_router(notes.router, prefix="/api/v1/notes", tags=["Notes"])
 app.include_router(tags.router, prefix="/api/v1/tags", tags=["Tags"])
 app.include_router(expenses.router, prefix="/api/v1/expenses", tags=["Expenses"])
 app.include_router(users.router, prefix="/api/v1/users", tags=["Users"])
+app.include_router(profiles.router, prefix="/api/v1/profiles", tags=["Profiles"])
+app.include_router(search.router, prefix="/api/v1/search", tags=["Search"])
+app.include_router(metrics.router, prefix="/api/v1/metrics", tags=["Metrics"])
+app.include_router(maintenance.router, prefix="/api/v1/maintenance", tags=["Maintenance"])
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, Float, DateTime, ForeignKey, Text, Enum as SQLEnum, Table
+from sqlalchemy import Column, Integer, String, Boolean, Float, Date, DateTime, ForeignKey, Text, Enum as SQLEnum, Table, Index
 from sqlalchemy.orm import relationship
 import enum
 from app.db.base import Base
@@ -57,9 +57,31 @@ class Customer(Base):
     
     contacts = relationship("Contact", secondary=customer_contact_association, back_populates="customers")
     orders = relationship("Order", back_populates="customer", cascade="all, delete-orphan")
+    metrics = relationship("CustomerMetrics", uselist=False, cascade="all, delete-orphan")
     created_by_user = relationship("User", foreign_keys=[created_by])
 
 
+class CustomerMetrics(Base):
+    """
+    Per-customer order rollup for sorting and filtering the customer list.
+    Kept in step by order and payment writes (CustomerMetricsRepository);
+    ``python -m app.utils.rebuild_customer_metrics`` recomputes it.
+    Canceled orders do not count, nor do their payments, so ``outstanding``
+    agrees with the receivables aging report.
+    """
+    __tablename__ = "customer_metrics"
+    
+    customer_id = Column(Integer, ForeignKey('customers.id'), primary_key=True)
+    order_count = Column(Integer, default=0, nullable=False)
+    revenue = Column(Float, default=0.0, nullable=False)
+    paid = Column(Float, default=0.0, nullable=False)
+    last_order_at = Column(DateTime, nullable=True)
+    
+    @property
+    def outstanding(self) -> float:
+        return self.revenue - self.paid
+
+
 class Contact(Base):
     __tablename__ = "contacts"
     
@@ -158,9 +180,44 @@ class Product(Base):
     
     category = relationship("Category", back_populates="products")
     stock_movements = relationship("StockMovement", back_populates="product", cascade="all, delete-orphan")
+    sales_days = relationship("ProductSalesDay", cascade="all, delete-orphan")
+    stats = relationship("ProductStats", uselist=False, cascade="all, delete-orphan")
     created_by_user = relationship("User", foreign_keys=[created_by])
 
 
+class ProductSalesDay(Base):
+    """Units sold (OUT stock movements) per product and day, for the last 90 days."""
+    __tablename__ = "product_sales_days"
+    
+    product_id = Column(Integer, ForeignKey('products.id'), primary_key=True)
+    day = Column(Date, primary_key=True)
+    quantity = Column(Integer, default=0, nullable=False)
+
+
+class ProductStats(Base):
+    """
+    Sales velocity per product, derived from product_sales_days by the
+    maintenance scheduler (ProductStatsRepository.refresh); not updated by
+    requests.  ``last_movement_id`` is the newest OUT movement counted
+    for the product.
+    """
+    __tablename__ = "product_stats"
+    
+    product_id = Column(Integer, ForeignKey('products.id'), primary_key=True)
+    sold_7d = Column(Integer, default=0, nullable=False)
+    sold_30d = Column(Integer, default=0, nullable=False)
+    sold_90d = Column(Integer, default=0, nullable=False)
+    daily_velocity = Column(Float, default=0.0, nullable=False)  # units per day over 30 days
+    days_of_cover = Column(Float, nullable=True)  # current stock / velocity; None without sales
+    reorder = Column(Boolean, default=False, nullable=False)
+    last_movement_id = Column(Integer, default=0, nullable=False)
+    computed_at = Column(DateTime, nullable=True)
+
+
+# Products running out first, for the at-risk listing
+Index("ix_product_stats_cover", ProductStats.days_of_cover)
+
+
 class StockMovementType(str, enum.Enum):
     IN = "IN"
     OUT = "OUT"
@@ -185,6 +242,10 @@ class StockMovement(Base):
     performed_by_user = relationship("User", foreign_keys=[created_by])
 
 
+# A product's movements by date, for recomputing its daily sales totals
+Index("ix_stock_movements_product_created", StockMovement.product_id, StockMovement.created_at)
+
+
 class PaymentStatus(str, enum.Enum):
     UNPAID = "UNPAID"
     PARTIALLY_PAID = "PARTIALLY_PAID"
@@ -212,6 +273,11 @@ class Order(Base):
     payment_status = Column(SQLEnum(PaymentStatus), default=PaymentStatus.UNPAID, nullable=False)
     delivery_status = Column(SQLEnum(DeliveryStatus), default=DeliveryStatus.NOT_DELIVERED, nullable=False)
     order_status = Column(SQLEnum(OrderStatus), default=OrderStatus.OPEN, nullable=False)
+    # Running totals kept in step with payments and item deliveries by atomic
+    # increments (OrderRepository.add_totals); verified by the reconciliation job
+    paid_amount = Column(Float, default=0.0, nullable=False)
+    total_quantity = Column(Integer, default=0, nullable=False)
+    delivered_quantity = Column(Integer, default=0, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     created_by = Column(Integer, ForeignKey('users.id'), nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -224,11 +290,17 @@ class Order(Base):
     created_by_user = relationship("User", foreign_keys=[created_by])
 
 
+# Outstanding balance, for "still owes at least X" filters on the order list
+Index("ix_orders_outstanding", Order.total_amount - Order.paid_amount)
+# A customer's orders in time order (customer ledger, per-customer listing)
+Index("ix_orders_customer_created", Order.customer_id, Order.created_at)
+
+
 class OrderItem(Base):
     __tablename__ = "order_items"
     
     id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey('orders.id'), nullable=False)
+    order_id = Column(Integer, ForeignKey('orders.id'), nullable=False, index=True)
     product_id = Column(Integer, ForeignKey('products.id'), nullable=False)
     quantity = Column(Integer, nullable=False)
     delivered_quantity = Column(Integer, default=0, nullable=False)
@@ -283,6 +355,10 @@ class Payment(Base):
     received_by_user = relationship("User", foreign_keys=[created_by])
 
 
+# An order's payments in time order (payment list by order, customer ledger)
+Index("ix_payments_order_created", Payment.order_id, Payment.created_at)
+
+
 class ExpenseCategory(Base):
     """
     Categories for expense tracking (masraf kategorileri).
@@ -341,3 +417,16 @@ class ExpenseHistory(Base):
     
     expense = relationship("Expense", back_populates="history")
     changed_by_user = relationship("User", foreign_keys=[changed_by])
+
+
+class TableVersion(Base):
+    """
+    Change counter per read-mostly table, bumped by its repository on every
+    write.  Used to answer conditional GETs (ETag / Last-Modified) without
+    loading rows; see app/db/table_versions.py.
+    """
+    __tablename__ = "table_versions"
+    
+    table_name = Column(String(64), primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
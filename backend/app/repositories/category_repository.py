@@ -1,21 +1,37 @@
-from typing import Optional, List, Tuple
-from sqlalchemy.orm import Session, joinedload
+from typing import Optional, List, Tuple, Dict, Set
+from sqlalchemy.orm import Session
 from app.models import Category
+from app.db.entity_cache import EntityCache
+from app.db.table_versions import bump_table_versions
 from app.schemas.category import CategoryCreate, CategoryUpdate
 
 
+category_cache = EntityCache(Category)
+
+
 class CategoryRepository:
     def __init__(self, db: Session):
         self.db = db
     
     def get_by_id(self, category_id: int) -> Optional[Category]:
-        return (
-            self.db.query(Category)
-            .options(joinedload(Category.created_by_user))
-            .filter(Category.id == category_id)
-            .first()
+        return category_cache.get(
+            self.db, ("id", category_id),
+            lambda: self.db.query(Category).filter(Category.id == category_id).first()
         )
     
+    def name_index(self) -> Tuple[Set[int], Dict[str, Optional[int]]]:
+        """
+        All category ids, and lower-cased name → id.  Names shared by several
+        categories map to None.
+        """
+        ids: Set[int] = set()
+        by_name: Dict[str, Optional[int]] = {}
+        for category_id, name in self.db.query(Category.id, Category.name):
+            ids.add(category_id)
+            key = name.strip().lower()
+            by_name[key] = None if key in by_name else category_id
+        return ids, by_name
+    
     def list_all(
         self,
         page: int = 1,
@@ -23,7 +39,7 @@ class CategoryRepository:
         sort_by: str = "id",
         order: str = "asc"
     ) -> Tuple[List[Category], int]:
-        query = self.db.query(Category).options(joinedload(Category.created_by_user))
+        query = self.db.query(Category)
         
         total = query.count()
         
@@ -46,7 +62,9 @@ class CategoryRepository:
             updated_by=user_id
         )
         self.db.add(category)
+        bump_table_versions(self.db, "categories")
         self.db.commit()
+        category_cache.invalidate()
         self.db.refresh(category)
         return category
     
@@ -55,10 +73,14 @@ class CategoryRepository:
         for key, value in update_data.items():
             setattr(category, key, value)
         category.updated_by = user_id
+        bump_table_versions(self.db, "categories")
         self.db.commit()
+        category_cache.invalidate()
         self.db.refresh(category)
         return category
     
     def delete(self, category: Category) -> None:
         self.db.delete(category)
+        bump_table_versions(self.db, "categories")
         self.db.commit()
+        category_cache.invalidate()
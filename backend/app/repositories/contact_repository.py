@@ -1,8 +1,8 @@
 from typing import Optional, List, Tuple
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_
 from app.models import Contact, Customer
 from app.schemas.contact import ContactCreate, ContactUpdate
+from app.db.search_index import apply_search, order_by_relevance
 
 
 class ContactRepository:
@@ -12,7 +12,7 @@ class ContactRepository:
     def get_by_id(self, contact_id: int) -> Optional[Contact]:
         return (
             self.db.query(Contact)
-            .options(joinedload(Contact.created_by_user), joinedload(Contact.customers))
+            .options(joinedload(Contact.customers))
             .filter(Contact.id == contact_id)
             .first()
         )
@@ -25,20 +25,17 @@ class ContactRepository:
         order: str = "asc",
         search: Optional[str] = None
     ) -> Tuple[List[Contact], int]:
-        query = self.db.query(Contact).options(joinedload(Contact.created_by_user), joinedload(Contact.customers))
+        query = self.db.query(Contact).options(joinedload(Contact.customers))
         
+        rank = None
         if search:
-            query = query.filter(
-                or_(
-                    Contact.name.ilike(f"%{search}%"),
-                    Contact.email.ilike(f"%{search}%"),
-                    Contact.phone.ilike(f"%{search}%")
-                )
-            )
+            query, rank = apply_search(query, Contact, search)
         
         total = query.count()
         
-        if hasattr(Contact, sort_by):
+        if sort_by == "relevance" and search:
+            query = order_by_relevance(query, Contact, rank, order)
+        elif hasattr(Contact, sort_by):
             column = getattr(Contact, sort_by)
             if order == "desc":
                 query = query.order_by(column.desc())
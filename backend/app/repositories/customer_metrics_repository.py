@@ -0,0 +1,131 @@
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import case, delete, func, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models import Customer, CustomerMetrics, Order, OrderStatus, Payment
+
+
+class CustomerMetricsRepository:
+    """
+    Writes to ``customer_metrics``.  The order and payment services call
+    ``add`` in the same transaction as the write it accounts for; nothing
+    here commits except ``rebuild``.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def _upsert(self):
+        table = CustomerMetrics.__table__
+        dialect = postgresql if self.db.get_bind().dialect.name == "postgresql" else sqlite
+        stmt = dialect.insert(table)
+        new = stmt.excluded
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.customer_id],
+            set_={
+                "order_count": table.c.order_count + new.order_count,
+                "revenue": table.c.revenue + new.revenue,
+                "paid": table.c.paid + new.paid,
+                "last_order_at": case(
+                    (or_(table.c.last_order_at.is_(None), new.last_order_at > table.c.last_order_at),
+                     new.last_order_at),
+                    else_=table.c.last_order_at
+                ),
+            }
+        )
+    
+    def add(
+        self,
+        customer_id: int,
+        orders: int = 0,
+        revenue: float = 0.0,
+        paid: float = 0.0,
+        last_order_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Add the deltas to the customer's row (created on first use) with one
+        atomic ``INSERT … ON CONFLICT DO UPDATE``; ``last_order_at`` only
+        ever moves forward here.  Not committed.
+        """
+        self.add_many({customer_id: {
+            "order_count": orders, "revenue": revenue, "paid": paid, "last_order_at": last_order_at
+        }})
+    
+    def add_many(self, deltas: Dict[int, dict]) -> None:
+        """``add`` for many customers in one executemany: ``{customer id: {column: delta}}``.  Not committed."""
+        if not deltas:
+            return
+        self.db.execute(self._upsert(), [
+            {
+                "customer_id": customer_id,
+                "order_count": delta.get("order_count", 0),
+                "revenue": delta.get("revenue", 0.0),
+                "paid": delta.get("paid", 0.0),
+                "last_order_at": delta.get("last_order_at"),
+            }
+            for customer_id, delta in deltas.items()
+        ])
+    
+    def refresh_last_order(self, customer_id: int, exclude_order_id: Optional[int] = None) -> None:
+        """
+        Recompute ``last_order_at`` after the customer's latest order may have
+        gone away (canceled, deleted or moved to another customer);
+        ``exclude_order_id`` is that order, whatever its pending state.
+        One indexed MAX on ix_orders_customer_created.  Not committed.
+        """
+        latest = select(func.max(Order.created_at)).where(
+            Order.customer_id == customer_id,
+            Order.order_status != OrderStatus.CANCELED
+        )
+        if exclude_order_id is not None:
+            latest = latest.where(Order.id != exclude_order_id)
+        self.db.execute(
+            update(CustomerMetrics)
+            .where(CustomerMetrics.customer_id == customer_id)
+            .values(last_order_at=latest.scalar_subquery())
+            .execution_options(synchronize_session=False)
+        )
+    
+    def rebuild(self) -> int:
+        """
+        Recompute every customer's row from orders and payments: two grouped
+        aggregates joined to customers, written with one INSERT … SELECT.
+        Commits; returns the number of rows written.
+        """
+        live = Order.order_status != OrderStatus.CANCELED
+        orders = (
+            select(
+                Order.customer_id,
+                func.sum(case((live, 1), else_=0)).label("order_count"),
+                func.sum(case((live, Order.total_amount), else_=0.0)).label("revenue"),
+                func.max(case((live, Order.created_at))).label("last_order_at")
+            )
+            .group_by(Order.customer_id)
+            .subquery()
+        )
+        paid = (
+            select(Order.customer_id, func.sum(Payment.amount).label("paid"))
+            .join(Payment, Payment.order_id == Order.id)
+            .where(live)
+            .group_by(Order.customer_id)
+            .subquery()
+        )
+        rows = (
+            select(
+                Customer.id,
+                func.coalesce(orders.c.order_count, 0),
+                func.coalesce(orders.c.revenue, 0.0),
+                func.coalesce(paid.c.paid, 0.0),
+                orders.c.last_order_at
+            )
+            .outerjoin(orders, orders.c.customer_id == Customer.id)
+            .outerjoin(paid, paid.c.customer_id == Customer.id)
+        )
+        table = CustomerMetrics.__table__
+        self.db.execute(delete(table))
+        result = self.db.execute(table.insert().from_select(
+            ["customer_id", "order_count", "revenue", "paid", "last_order_at"], rows
+        ))
+        self.db.commit()
+        return result.rowcount
@@ -1,8 +1,20 @@
-from typing import Optional, List, Tuple
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, and_
-from app.models import Customer, Contact
+from datetime import datetime
+from typing import Optional, List, Tuple, Iterable, Set
+from sqlalchemy.orm import Session, contains_eager, joinedload, selectinload
+from sqlalchemy import String, and_, case, cast, func, literal, null, select, tuple_, union_all
+from app.models import Customer, Contact, CustomerMetrics, Order, OrderStatus, Payment
 from app.schemas.customer import CustomerCreate, CustomerUpdate
+from app.db.search_index import apply_search, order_by_relevance
+
+# customer_metrics columns the customer list sorts by; customers without a
+# metrics row sort as zero
+METRIC_SORT_COLUMNS = {
+    "order_count": func.coalesce(CustomerMetrics.order_count, 0),
+    "revenue": func.coalesce(CustomerMetrics.revenue, 0.0),
+    "paid": func.coalesce(CustomerMetrics.paid, 0.0),
+    "outstanding": func.coalesce(CustomerMetrics.revenue - CustomerMetrics.paid, 0.0),
+    "last_order_at": CustomerMetrics.last_order_at,
+}
 
 
 class CustomerRepository:
@@ -12,7 +24,7 @@ class CustomerRepository:
     def get_by_id(self, customer_id: int) -> Optional[Customer]:
         return (
             self.db.query(Customer)
-            .options(joinedload(Customer.created_by_user), joinedload(Customer.contacts))
+            .options(joinedload(Customer.contacts), joinedload(Customer.metrics))
             .filter(Customer.id == customer_id)
             .first()
         )
@@ -23,22 +35,49 @@ class CustomerRepository:
         page_size: int = 20,
         sort_by: str = "id",
         order: str = "asc",
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        min_orders: Optional[int] = None,
+        min_revenue: Optional[float] = None,
+        min_outstanding: Optional[float] = None,
+        last_order_after: Optional[datetime] = None,
+        last_order_before: Optional[datetime] = None
     ) -> Tuple[List[Customer], int]:
-        query = self.db.query(Customer).options(joinedload(Customer.created_by_user))
+        query = (
+            self.db.query(Customer)
+            .outerjoin(Customer.metrics)
+            .options(contains_eager(Customer.metrics), selectinload(Customer.contacts))
+        )
         
+        rank = None
         if search:
-            query = query.filter(
-                or_(
-                    Customer.name.ilike(f"%{search}%"),
-                    Customer.email.ilike(f"%{search}%"),
-                    Customer.phone.ilike(f"%{search}%")
-                )
-            )
+            query, rank = apply_search(query, Customer, search)
+        
+        if min_orders is not None:
+            query = query.filter(METRIC_SORT_COLUMNS["order_count"] >= min_orders)
+        
+        if min_revenue is not None:
+            query = query.filter(METRIC_SORT_COLUMNS["revenue"] >= min_revenue)
+        
+        if min_outstanding is not None:
+            query = query.filter(METRIC_SORT_COLUMNS["outstanding"] >= min_outstanding)
+        
+        if last_order_after:
+            query = query.filter(CustomerMetrics.last_order_at >= last_order_after)
+        
+        if last_order_before:
+            query = query.filter(CustomerMetrics.last_order_at <= last_order_before)
         
         total = query.count()
         
-        if hasattr(Customer, sort_by):
+        if sort_by == "relevance" and search:
+            query = order_by_relevance(query, Customer, rank, order)
+        elif sort_by in METRIC_SORT_COLUMNS:
+            column = METRIC_SORT_COLUMNS[sort_by]
+            if order == "desc":
+                query = query.order_by(column.desc(), Customer.id.desc())
+            else:
+                query = query.order_by(column.asc(), Customer.id.asc())
+        elif hasattr(Customer, sort_by):
             column = getattr(Customer, sort_by)
             if order == "desc":
                 query = query.order_by(column.desc())
@@ -50,6 +89,89 @@ class CustomerRepository:
         
         return items, total
     
+    def existing_ids(self, customer_ids: Iterable[int]) -> Set[int]:
+        """The subset of ``customer_ids`` that exist, in one query."""
+        customer_ids = set(customer_ids)
+        if not customer_ids:
+            return set()
+        return set(self.db.scalars(select(Customer.id).where(Customer.id.in_(customer_ids))))
+    
+    def balance(self, customer_id: int) -> Optional[Tuple[str, float]]:
+        """``(name, balance owed)`` from the maintained order totals, or None for an unknown customer."""
+        owed = case((Order.order_status == OrderStatus.CANCELED, 0.0), else_=Order.total_amount)
+        balance = (
+            select(func.coalesce(func.sum(owed - Order.paid_amount), 0.0))
+            .where(Order.customer_id == customer_id)
+            .scalar_subquery()
+        )
+        row = self.db.execute(select(Customer.name, balance).where(Customer.id == customer_id)).first()
+        return tuple(row) if row else None
+    
+    def _timeline(self, customer_id: int, since: Optional[datetime] = None,
+                  until: Optional[datetime] = None):
+        """
+        The customer's orders (debits; canceled orders count 0) and payments
+        (credits) as one UNION ALL, keyed by ``(created_at, kind, entry_id)``.
+        ``since`` / ``until`` bound both branches so they stay index range
+        scans on ix_orders_customer_created and ix_payments_order_created.
+        """
+        debit = case((Order.order_status == OrderStatus.CANCELED, 0.0), else_=Order.total_amount)
+        orders = select(
+            literal("order").label("kind"),
+            Order.id.label("entry_id"),
+            Order.id.label("order_id"),
+            Order.created_at.label("created_at"),
+            debit.label("debit"),
+            literal(0.0).label("credit"),
+            cast(Order.order_status, String).label("order_status"),
+            cast(null(), String).label("payment_method")
+        ).where(Order.customer_id == customer_id)
+        payments = select(
+            literal("payment"),
+            Payment.id,
+            Payment.order_id,
+            Payment.created_at,
+            literal(0.0),
+            Payment.amount,
+            cast(null(), String),
+            cast(Payment.method, String)
+        ).join(Order, Order.id == Payment.order_id).where(Order.customer_id == customer_id)
+        if since is not None:
+            orders = orders.where(Order.created_at >= since)
+            payments = payments.where(Payment.created_at >= since)
+        if until is not None:
+            orders = orders.where(Order.created_at <= until)
+            payments = payments.where(Payment.created_at <= until)
+        return union_all(orders, payments).subquery()
+    
+    def ledger(
+        self,
+        customer_id: int,
+        after: Optional[Tuple[datetime, str, int]] = None,
+        limit: int = 50
+    ) -> List:
+        """
+        Up to ``limit`` timeline entries after the keyset ``after``, oldest
+        first, each with a ``running`` sum of debit - credit that starts at 0
+        on this page (add ``balance_before(after)`` for the true balance).
+        """
+        timeline = self._timeline(customer_id, after[0] if after else None)
+        key = (timeline.c.created_at, timeline.c.kind, timeline.c.entry_id)
+        running = func.sum(timeline.c.debit - timeline.c.credit).over(order_by=key, rows=(None, 0))
+        query = select(timeline, running.label("running"))
+        if after is not None:
+            query = query.where(tuple_(*key) > tuple_(*after))
+        return self.db.execute(query.order_by(*key).limit(limit)).all()
+    
+    def balance_before(self, customer_id: int, after: Tuple[datetime, str, int]) -> float:
+        """Sum of debit - credit over every timeline entry up to and including the keyset ``after``."""
+        timeline = self._timeline(customer_id, until=after[0])
+        key = (timeline.c.created_at, timeline.c.kind, timeline.c.entry_id)
+        return self.db.execute(
+            select(func.coalesce(func.sum(timeline.c.debit - timeline.c.credit), 0.0))
+            .where(tuple_(*key) <= tuple_(*after))
+        ).scalar()
+    
     def create(self, data: CustomerCreate, user_id: int) -> Customer:
         customer_dict = data.model_dump(exclude={"contact_ids"})
         customer = Customer(
@@ -1,18 +1,36 @@
 from typing import Optional, List, Tuple
 from sqlalchemy.orm import Session
-from app.models import ExpenseCategory
+from app.models import ExpenseCategory, Expense
+from app.db.entity_cache import EntityCache
+from app.db.table_versions import bump_table_versions
 from app.schemas.expense import ExpenseCategoryCreate, ExpenseCategoryUpdate
 
 
+expense_category_cache = EntityCache(ExpenseCategory)
+
+
 class ExpenseCategoryRepository:
     def __init__(self, db: Session):
         self.db = db
     
     def get_by_id(self, category_id: int) -> Optional[ExpenseCategory]:
-        return self.db.query(ExpenseCategory).filter(ExpenseCategory.id == category_id).first()
+        return expense_category_cache.get(
+            self.db, ("id", category_id),
+            lambda: self.db.query(ExpenseCategory).filter(ExpenseCategory.id == category_id).first()
+        )
     
     def get_by_name(self, name: str) -> Optional[ExpenseCategory]:
-        return self.db.query(ExpenseCategory).filter(ExpenseCategory.name == name).first()
+        return expense_category_cache.get(
+            self.db, ("name", name),
+            lambda: self.db.query(ExpenseCategory).filter(ExpenseCategory.name == name).first()
+        )
+    
+    def has_expenses(self, category_id: int) -> bool:
+        return (
+            self.db.query(Expense.id)
+            .filter(Expense.category_id == category_id)
+            .first()
+        ) is not None
     
     def list_all(
         self,
@@ -36,7 +54,9 @@ class ExpenseCategoryRepository:
             updated_by=user_id
         )
         self.db.add(category)
+        bump_table_versions(self.db, "expense_categories")
         self.db.commit()
+        expense_category_cache.invalidate()
         self.db.refresh(category)
         return category
     
@@ -46,10 +66,14 @@ class ExpenseCategoryRepository:
             setattr(category, key, value)
         
         category.updated_by = user_id
+        bump_table_versions(self.db, "expense_categories")
         self.db.commit()
+        expense_category_cache.invalidate()
         self.db.refresh(category)
         return category
     
     def delete(self, category: ExpenseCategory) -> None:
         self.db.delete(category)
+        bump_table_versions(self.db, "expense_categories")
         self.db.commit()
+        expense_category_cache.invalidate()
@@ -1,4 +1,4 @@
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Iterator
 from sqlalchemy.orm import Session, joinedload
 from datetime import datetime
 from app.models import Expense
@@ -12,7 +12,7 @@ class ExpenseRepository:
     def get_by_id(self, expense_id: int) -> Optional[Expense]:
         return (
             self.db.query(Expense)
-            .options(joinedload(Expense.created_by_user), joinedload(Expense.category))
+            .options(joinedload(Expense.category))
             .filter(Expense.id == expense_id)
             .first()
         )
@@ -27,19 +27,7 @@ class ExpenseRepository:
         start_date: Optional[str] = None,
         end_date: Optional[str] = None
     ) -> Tuple[List[Expense], int]:
-        query = (
-            self.db.query(Expense)
-            .options(joinedload(Expense.created_by_user), joinedload(Expense.category))
-        )
-        
-        if category_id:
-            query = query.filter(Expense.category_id == category_id)
-        
-        if start_date:
-            query = query.filter(Expense.date >= start_date)
-        
-        if end_date:
-            query = query.filter(Expense.date <= end_date)
+        query = self._filtered(category_id, start_date, end_date)
         
         total = query.count()
         
@@ -55,6 +43,34 @@ class ExpenseRepository:
         
         return items, total
     
+    def stream_all(
+        self,
+        category_id: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Expense]:
+        """Every matching expense, oldest first, fetched batch_size rows at a time."""
+        query = self._filtered(category_id, start_date, end_date)
+        return iter(query.order_by(Expense.date.asc(), Expense.id.asc()).yield_per(batch_size))
+    
+    def _filtered(self, category_id: Optional[int], start_date: Optional[str], end_date: Optional[str]):
+        query = (
+            self.db.query(Expense)
+            .options(joinedload(Expense.category))
+        )
+        
+        if category_id:
+            query = query.filter(Expense.category_id == category_id)
+        
+        if start_date:
+            query = query.filter(Expense.date >= start_date)
+        
+        if end_date:
+            query = query.filter(Expense.date <= end_date)
+        
+        return query
+    
     def create(self, data: ExpenseCreate, user_id: int) -> Expense:
         expense_data = data.model_dump()
         # Convert date string to datetime if needed
@@ -75,7 +91,7 @@ class ExpenseRepository:
         self.db.refresh(expense)
         
         # Load relationships
-        self.db.refresh(expense, attribute_names=['created_by_user', 'category'])
+        self.db.refresh(expense, attribute_names=['category'])
         return expense
     
     def update(self, expense: Expense, data: ExpenseUpdate, user_id: int) -> Expense:
@@ -88,7 +104,7 @@ class ExpenseRepository:
         self.db.refresh(expense)
         
         # Load relationships
-        self.db.refresh(expense, attribute_names=['created_by_user', 'category'])
+        self.db.refresh(expense, attribute_names=['category'])
         return expense
     
     def delete(self, expense: Expense) -> None:
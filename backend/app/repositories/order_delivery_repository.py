@@ -1,5 +1,5 @@
 from typing import Optional, List
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 from app.models import OrderDelivery
 from app.schemas.order_delivery import OrderDeliveryCreate
 
@@ -11,7 +11,6 @@ class OrderDeliveryRepository:
     def get_by_id(self, delivery_id: int) -> Optional[OrderDelivery]:
         return (
             self.db.query(OrderDelivery)
-            .options(joinedload(OrderDelivery.delivered_by_user))
             .filter(OrderDelivery.id == delivery_id)
             .first()
         )
@@ -19,7 +18,6 @@ class OrderDeliveryRepository:
     def list_by_order(self, order_id: int) -> List[OrderDelivery]:
         return (
             self.db.query(OrderDelivery)
-            .options(joinedload(OrderDelivery.delivered_by_user))
             .filter(OrderDelivery.order_id == order_id)
             .order_by(OrderDelivery.delivered_at.desc())
             .all()
@@ -33,9 +31,15 @@ class OrderDeliveryRepository:
         self.db.add(delivery)
         self.db.commit()
         self.db.refresh(delivery)
-        
-        # Load relationships
-        self.db.refresh(delivery, attribute_names=['delivered_by_user'])
+        return delivery
+    
+    def add(self, data: OrderDeliveryCreate, user_id: int) -> OrderDelivery:
+        """Stage a delivery record in the session.  Not committed."""
+        delivery = OrderDelivery(
+            **data.model_dump(),
+            delivered_by_user_id=user_id
+        )
+        self.db.add(delivery)
         return delivery
     
     def delete(self, delivery: OrderDelivery) -> None:
@@ -1,8 +1,8 @@
-from typing import Optional, List, Tuple
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_
-from datetime import datetime
-from app.models import Order, OrderItem, OrderStatus, PaymentStatus, DeliveryStatus
+from typing import Optional, List, Tuple, Iterator
+from sqlalchemy.orm import Session, joinedload, noload, selectinload
+from sqlalchemy import and_, bindparam, case, func, insert, or_, select
+from datetime import datetime, timedelta
+from app.models import Customer, Order, OrderItem, OrderStatus, Payment, PaymentStatus, DeliveryStatus
 from app.schemas.order import OrderCreate, OrderUpdate, OrderItemCreate
 
 
@@ -13,14 +13,14 @@ class OrderRepository:
     def get_by_id(self, order_id: int) -> Optional[Order]:
         return (
             self.db.query(Order)
-            .options(
-                joinedload(Order.created_by_user),
-                joinedload(Order.items)
-            )
+            .options(joinedload(Order.items))
             .filter(Order.id == order_id)
             .first()
         )
     
+    def list_by_ids(self, order_ids: List[int]) -> List[Order]:
+        return self.db.query(Order).filter(Order.id.in_(order_ids)).all()
+    
     def list_all(
         self,
         page: int = 1,
@@ -32,9 +32,56 @@ class OrderRepository:
         payment_status: Optional[PaymentStatus] = None,
         delivery_status: Optional[DeliveryStatus] = None,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        min_outstanding: Optional[float] = None
     ) -> Tuple[List[Order], int]:
-        query = self.db.query(Order).options(joinedload(Order.created_by_user))
+        query = self._filtered(
+            customer_id, order_status, payment_status, delivery_status, start_date, end_date, min_outstanding
+        ).options(selectinload(Order.items))
+        
+        total = query.count()
+        
+        if hasattr(Order, sort_by):
+            column = getattr(Order, sort_by)
+            if order == "desc":
+                query = query.order_by(column.desc())
+            else:
+                query = query.order_by(column.asc())
+        
+        offset = (page - 1) * page_size
+        items = query.offset(offset).limit(page_size).all()
+        
+        return items, total
+    
+    def stream_all(
+        self,
+        customer_id: Optional[int] = None,
+        order_status: Optional[OrderStatus] = None,
+        payment_status: Optional[PaymentStatus] = None,
+        delivery_status: Optional[DeliveryStatus] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        min_outstanding: Optional[float] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Order]:
+        """Every matching order (without items), oldest first, fetched batch_size rows at a time."""
+        query = self._filtered(
+            customer_id, order_status, payment_status, delivery_status, start_date, end_date, min_outstanding
+        )
+        # Exports leave items out; without noload every row would lazy-load them during validation
+        return iter(query.options(noload(Order.items)).order_by(Order.id.asc()).yield_per(batch_size))
+    
+    def _filtered(
+        self,
+        customer_id: Optional[int],
+        order_status: Optional[OrderStatus],
+        payment_status: Optional[PaymentStatus],
+        delivery_status: Optional[DeliveryStatus],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        min_outstanding: Optional[float] = None
+    ):
+        query = self.db.query(Order)
         
         if customer_id:
             query = query.filter(Order.customer_id == customer_id)
@@ -54,29 +101,23 @@ class OrderRepository:
         if end_date:
             query = query.filter(Order.created_at <= end_date)
         
-        total = query.count()
+        if min_outstanding is not None:
+            # Same expression as ix_orders_outstanding, so the index is used
+            query = query.filter(Order.total_amount - Order.paid_amount >= min_outstanding)
         
-        if hasattr(Order, sort_by):
-            column = getattr(Order, sort_by)
-            if order == "desc":
-                query = query.order_by(column.desc())
-            else:
-                query = query.order_by(column.asc())
-        
-        offset = (page - 1) * page_size
-        items = query.offset(offset).limit(page_size).all()
-        
-        return items, total
+        return query
     
-    def create(self, data: OrderCreate, user_id: int) -> Order:
+    def create(self, data: OrderCreate, user_id: int, created_at: Optional[datetime] = None) -> Order:
         total_amount = sum(item.quantity * item.unit_price for item in data.items)
         
         order = Order(
+            created_at=created_at or datetime.utcnow(),
             customer_id=data.customer_id,
             total_amount=total_amount,
             payment_status=PaymentStatus.UNPAID,
             delivery_status=DeliveryStatus.NOT_DELIVERED,
             order_status=OrderStatus.OPEN,
+            total_quantity=sum(item.quantity for item in data.items),
             created_by=user_id,
             updated_by=user_id
         )
@@ -99,6 +140,55 @@ class OrderRepository:
         self.db.refresh(order)
         return order
     
+    def bulk_create(self, orders: List[OrderCreate], user_id: int,
+                    created_at: Optional[datetime] = None) -> List[int]:
+        """
+        Insert ``orders`` and their items with one executemany each and
+        return the new order ids in input order.  Not committed.
+
+        The ids come back through ``RETURNING`` in parameter order; SQLite
+        has no implicit sentinel for that, so SQLAlchemy runs the order
+        INSERT once per row there (still a single prepared statement).
+        """
+        if not orders:
+            return []
+        now = created_at or datetime.utcnow()
+        audit = {"created_by": user_id, "updated_by": user_id, "created_at": now, "updated_at": now}
+        orders_t, items_t = Order.__table__, OrderItem.__table__
+        result = self.db.execute(
+            insert(orders_t).returning(orders_t.c.id, sort_by_parameter_order=True),
+            [
+                {
+                    "customer_id": data.customer_id,
+                    "total_amount": sum(item.quantity * item.unit_price for item in data.items),
+                    "payment_status": PaymentStatus.UNPAID,
+                    "delivery_status": DeliveryStatus.NOT_DELIVERED,
+                    "order_status": OrderStatus.OPEN,
+                    "paid_amount": 0.0,
+                    "total_quantity": sum(item.quantity for item in data.items),
+                    "delivered_quantity": 0,
+                    **audit
+                }
+                for data in orders
+            ]
+        )
+        order_ids = list(result.scalars())
+        items = [
+            {
+                "order_id": order_id,
+                "product_id": item.product_id,
+                "quantity": item.quantity,
+                "unit_price": item.unit_price,
+                "delivered_quantity": 0,
+                **audit
+            }
+            for order_id, data in zip(order_ids, orders)
+            for item in data.items
+        ]
+        if items:
+            self.db.execute(insert(items_t), items)
+        return order_ids
+    
     def update(self, order: Order, data: OrderUpdate, user_id: int) -> Order:
         update_data = data.model_dump(exclude_unset=True)
         for key, value in update_data.items():
@@ -114,6 +204,140 @@ class OrderRepository:
         self.db.refresh(order)
         return order
     
+    def add_totals(self, order: Order, paid: float = 0.0, delivered: int = 0) -> None:
+        """
+        Add to the order's running totals as ``col = col + :delta`` at the
+        next flush, so concurrent writers cannot lose an update.  The
+        attributes are reloaded on first access after the flush.  Not committed.
+        """
+        if paid:
+            order.paid_amount = Order.paid_amount + paid
+        if delivered:
+            order.delivered_quantity = Order.delivered_quantity + delivered
+    
+    def total_mismatches(self) -> List[Tuple[int, float, int, int]]:
+        """
+        ``(order id, paid amount, total quantity, delivered quantity)``
+        recomputed from payments and items, for every order whose stored
+        totals differ.  Two grouped aggregates, one pass over each table.
+        """
+        paid = (
+            select(Payment.order_id, func.sum(Payment.amount).label("amount"))
+            .group_by(Payment.order_id)
+            .subquery()
+        )
+        items = (
+            select(
+                OrderItem.order_id,
+                func.sum(OrderItem.quantity).label("quantity"),
+                func.sum(OrderItem.delivered_quantity).label("delivered")
+            )
+            .group_by(OrderItem.order_id)
+            .subquery()
+        )
+        paid_amount = func.coalesce(paid.c.amount, 0.0)
+        total_quantity = func.coalesce(items.c.quantity, 0)
+        delivered_quantity = func.coalesce(items.c.delivered, 0)
+        rows = self.db.execute(
+            select(Order.id, paid_amount, total_quantity, delivered_quantity)
+            .outerjoin(paid, paid.c.order_id == Order.id)
+            .outerjoin(items, items.c.order_id == Order.id)
+            .where(or_(
+                func.abs(Order.paid_amount - paid_amount) > 0.005,
+                Order.total_quantity != total_quantity,
+                Order.delivered_quantity != delivered_quantity
+            ))
+        )
+        return [tuple(row) for row in rows]
+    
+    def set_totals(self, totals: List[Tuple[int, float, int, int]]) -> None:
+        """Overwrite running totals with ``total_mismatches()`` rows in one executemany.  Not committed."""
+        if not totals:
+            return
+        orders_t = Order.__table__
+        self.db.execute(
+            orders_t.update()
+            .where(orders_t.c.id == bindparam("oid"))
+            .values(
+                paid_amount=bindparam("paid"),
+                total_quantity=bindparam("quantity"),
+                delivered_quantity=bindparam("delivered")
+            ),
+            [
+                {"oid": order_id, "paid": paid, "quantity": quantity, "delivered": delivered}
+                for order_id, paid, quantity, delivered in totals
+            ]
+        )
+    
+    def receivables_aging(
+        self,
+        as_of: datetime,
+        page: int = 1,
+        page_size: int = 20,
+        sort_by: str = "total_outstanding",
+        order: str = "desc"
+    ) -> Tuple[List, int, Tuple]:
+        """
+        Unpaid balance per customer, split by order age into 0-30, 31-60,
+        61-90 and over 90 days before ``as_of``.  One grouped pass over the
+        open orders (``ix_orders_outstanding``), using the maintained
+        ``paid_amount``; canceled orders are left out.
+
+        Returns ``(page rows, customer count, (current, 31-60, 61-90, over 90,
+        total) summed over every customer)``.
+        """
+        balance = Order.total_amount - Order.paid_amount
+        
+        def bucket(condition):
+            return func.sum(case((condition, balance), else_=0.0))
+        
+        day_30, day_60, day_90 = (as_of - timedelta(days=days) for days in (30, 60, 90))
+        aging = (
+            select(
+                Order.customer_id,
+                func.count(Order.id).label("open_orders"),
+                func.min(Order.created_at).label("oldest_order_at"),
+                bucket(Order.created_at >= day_30).label("current"),
+                bucket(and_(Order.created_at < day_30, Order.created_at >= day_60)).label("days_31_60"),
+                bucket(and_(Order.created_at < day_60, Order.created_at >= day_90)).label("days_61_90"),
+                bucket(Order.created_at < day_90).label("over_90"),
+                func.sum(balance).label("total_outstanding")
+            )
+            .where(
+                balance > 0.005,
+                Order.order_status != OrderStatus.CANCELED,
+                Order.created_at <= as_of
+            )
+            .group_by(Order.customer_id)
+            .subquery()
+        )
+        
+        # Customer count and grand totals ride along as window aggregates
+        # over the grouped rows, so the page costs one pass over the orders
+        amounts = ("current", "days_31_60", "days_61_90", "over_90", "total_outstanding")
+        summary = [func.count().over().label("customer_count")] + [
+            func.sum(aging.c[name]).over().label(f"all_{name}") for name in amounts
+        ]
+        columns = {**dict(aging.c.items()), "customer_name": Customer.name}
+        column = columns.get(sort_by, aging.c.total_outstanding)
+        column = column.asc() if order == "asc" else column.desc()
+        rows = self.db.execute(
+            select(aging, Customer.name.label("customer_name"), *summary)
+            .join(Customer, Customer.id == aging.c.customer_id)
+            .order_by(column, aging.c.customer_id)
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        ).all()
+        if rows:
+            first = rows[0]._mapping
+            return rows, first["customer_count"], tuple(first[f"all_{name}"] for name in amounts)
+        
+        # Past the last page: the totals still describe every customer
+        totals = self.db.execute(
+            select(func.count(), *(func.coalesce(func.sum(aging.c[name]), 0.0) for name in amounts))
+        ).one()
+        return rows, totals[0], tuple(totals[1:])
+    
     def delete(self, order: Order) -> None:
         self.db.delete(order)
         self.db.commit()
@@ -1,5 +1,5 @@
-from typing import Optional, List, Tuple
-from sqlalchemy.orm import Session, joinedload
+from typing import Optional, List, Tuple, Iterator
+from sqlalchemy.orm import Session
 from app.models import Payment
 from app.schemas.payment import PaymentCreate
 
@@ -11,7 +11,6 @@ class PaymentRepository:
     def get_by_id(self, payment_id: int) -> Optional[Payment]:
         return (
             self.db.query(Payment)
-            .options(joinedload(Payment.received_by_user))
             .filter(Payment.id == payment_id)
             .first()
         )
@@ -19,7 +18,6 @@ class PaymentRepository:
     def list_by_order(self, order_id: int) -> List[Payment]:
         return (
             self.db.query(Payment)
-            .options(joinedload(Payment.received_by_user))
             .filter(Payment.order_id == order_id)
             .all()
         )
@@ -30,7 +28,7 @@ class PaymentRepository:
         page_size: int = 20,
         order_id: Optional[int] = None
     ) -> Tuple[List[Payment], int]:
-        query = self.db.query(Payment).options(joinedload(Payment.received_by_user))
+        query = self.db.query(Payment)
         
         if order_id:
             query = query.filter(Payment.order_id == order_id)
@@ -43,6 +41,13 @@ class PaymentRepository:
         
         return items, total
     
+    def stream_all(self, order_id: Optional[int] = None, batch_size: int = 1000) -> Iterator[Payment]:
+        """Every matching payment, oldest first, fetched batch_size rows at a time."""
+        query = self.db.query(Payment)
+        if order_id:
+            query = query.filter(Payment.order_id == order_id)
+        return iter(query.order_by(Payment.created_at.asc(), Payment.id.asc()).yield_per(batch_size))
+    
     def create(self, data: PaymentCreate, user_id: int) -> Payment:
         payment = Payment(
             **data.model_dump(),
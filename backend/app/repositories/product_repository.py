@@ -1,8 +1,10 @@
-from typing import Optional, List, Tuple
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_
+from typing import Optional, List, Tuple, Dict, Iterable, Set
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, func, insert, select
 from app.models import Product
 from app.schemas.product import ProductCreate, ProductUpdate
+from app.db.search_index import apply_search, order_by_relevance
 
 
 class ProductRepository:
@@ -12,7 +14,6 @@ class ProductRepository:
     def get_by_id(self, product_id: int) -> Optional[Product]:
         return (
             self.db.query(Product)
-            .options(joinedload(Product.created_by_user))
             .filter(Product.id == product_id)
             .first()
         )
@@ -26,23 +27,20 @@ class ProductRepository:
         search: Optional[str] = None,
         category_id: Optional[int] = None
     ) -> Tuple[List[Product], int]:
-        query = self.db.query(Product).options(joinedload(Product.created_by_user))
+        query = self.db.query(Product)
         
+        rank = None
         if search:
-            query = query.filter(
-                or_(
-                    Product.name.ilike(f"%{search}%"),
-                    Product.description.ilike(f"%{search}%"),
-                    Product.barcode.ilike(f"%{search}%")
-                )
-            )
+            query, rank = apply_search(query, Product, search)
         
         if category_id:
             query = query.filter(Product.category_id == category_id)
         
         total = query.count()
         
-        if hasattr(Product, sort_by):
+        if sort_by == "relevance" and search:
+            query = order_by_relevance(query, Product, rank, order)
+        elif hasattr(Product, sort_by):
             column = getattr(Product, sort_by)
             if order == "desc":
                 query = query.order_by(column.desc())
@@ -54,6 +52,84 @@ class ProductRepository:
         
         return items, total
     
+    def get_by_barcodes(self, barcodes: List[str]) -> Dict[str, List[Product]]:
+        """Resolve barcodes to their products (by id) with one indexed lookup."""
+        result: Dict[str, List[Product]] = {}
+        if barcodes:
+            products = self.db.query(Product).filter(Product.barcode.in_(set(barcodes))).order_by(Product.id)
+            for product in products:
+                result.setdefault(product.barcode, []).append(product)
+        return result
+    
+    def ids_by_barcode(self, barcodes: Iterable[str]) -> Dict[str, List[int]]:
+        """Barcode → ids of the products carrying it, for the given barcodes."""
+        barcodes = list(barcodes)
+        ids: Dict[str, List[int]] = {}
+        if barcodes:
+            rows = self.db.query(Product.id, Product.barcode).filter(Product.barcode.in_(barcodes))
+            for product_id, barcode in rows:
+                ids.setdefault(barcode, []).append(product_id)
+        return ids
+    
+    def existing_ids(self, product_ids: Iterable[int]) -> Set[int]:
+        """The subset of ``product_ids`` that exist, in one query."""
+        product_ids = set(product_ids)
+        if not product_ids:
+            return set()
+        return set(self.db.scalars(select(Product.id).where(Product.id.in_(product_ids))))
+    
+    def bulk_insert(self, rows: List[dict], user_id: int) -> List[int]:
+        """
+        Insert product rows (column → value dicts) with one executemany and
+        return their ids in input order.  Not committed.
+        """
+        now = datetime.utcnow()
+        products_t = Product.__table__
+        result = self.db.execute(
+            insert(products_t).returning(products_t.c.id, sort_by_parameter_order=True),
+            [
+                {**row, "created_by": user_id, "updated_by": user_id, "created_at": now, "updated_at": now}
+                for row in rows
+            ]
+        )
+        return list(result.scalars())
+    
+    def bulk_update(self, rows: List[dict], user_id: int) -> None:
+        """
+        Update name, description, category and list price of existing
+        products (dicts with an ``id`` key) with one executemany.  A None
+        description or list price keeps the current value; stock is left
+        alone.  Not committed.
+        """
+        if not rows:
+            return
+        products_t = Product.__table__
+        statement = (
+            products_t.update()
+            .where(products_t.c.id == bindparam("pid"))
+            .values(
+                name=bindparam("name"),
+                description=func.coalesce(bindparam("description"), products_t.c.description),
+                category_id=bindparam("category_id"),
+                list_price=func.coalesce(bindparam("list_price"), products_t.c.list_price),
+                updated_by=bindparam("uid"),
+                updated_at=bindparam("now")
+            )
+        )
+        now = datetime.utcnow()
+        self.db.execute(statement, [
+            {
+                "pid": row["id"],
+                "name": row["name"],
+                "description": row["description"],
+                "category_id": row["category_id"],
+                "list_price": row["list_price"],
+                "uid": user_id,
+                "now": now
+            }
+            for row in rows
+        ])
+    
     def create(self, data: ProductCreate, user_id: int) -> Product:
         product = Product(
             **data.model_dump(),
@@ -81,6 +157,28 @@ class ProductRepository:
         self.db.refresh(product)
         return product
     
+    def names_by_id(self, product_ids: Iterable[int]) -> Dict[int, str]:
+        product_ids = set(product_ids)
+        if not product_ids:
+            return {}
+        return dict(self.db.execute(select(Product.id, Product.name).where(Product.id.in_(product_ids))).all())
+    
+    def bulk_update_stock(self, deltas: Dict[int, int]) -> None:
+        """
+        Add ``deltas`` (product id → quantity) to current stock with one
+        executemany of ``current_stock = current_stock + :delta``.  Not
+        committed; Product instances already in the session are not refreshed.
+        """
+        if not deltas:
+            return
+        products_t = Product.__table__
+        self.db.execute(
+            products_t.update()
+            .where(products_t.c.id == bindparam("pid"))
+            .values(current_stock=products_t.c.current_stock + bindparam("delta")),
+            [{"pid": product_id, "delta": delta} for product_id, delta in deltas.items()]
+        )
+    
     def delete(self, product: Product) -> None:
         self.db.delete(product)
         self.db.commit()
@@ -0,0 +1,135 @@
+from datetime import date, datetime, time, timedelta
+from typing import List, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, delete, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models import Product, ProductSalesDay, ProductStats, StockMovement, StockMovementType
+
+# Longest rolling window; older daily totals are pruned
+SALES_WINDOW_DAYS = 90
+
+# Movements below the watermark that are read again on every run.  On
+# PostgreSQL ids are handed out at insert but become visible at commit, so a
+# movement can appear after a higher id was already counted; it is picked up
+# as long as fewer than this many movements were inserted in between.
+WATERMARK_OVERLAP = 1000
+
+
+class ProductStatsRepository:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def _insert(self, table):
+        dialect = postgresql if self.db.get_bind().dialect.name == "postgresql" else sqlite
+        return dialect.insert(table)
+    
+    def refresh(self, today: date, lead_days: float) -> dict:
+        """
+        Bring product_sales_days up to date with the OUT stock movements added
+        since the last run, then recompute every product_stats row from those
+        daily totals.  Only movements with an id above the newest one already
+        counted (less WATERMARK_OVERLAP) are read, a primary key range; the
+        days they fall on are then recounted from stock_movements for their
+        products through ix_stock_movements_product_created and replaced, not
+        incremented.  Reading a movement twice, or two workers refreshing at
+        once, therefore never counts a sale twice.  Commits.
+        """
+        stats_t, days_t, moves_t = ProductStats.__table__, ProductSalesDay.__table__, StockMovement.__table__
+        window_start = today - timedelta(days=SALES_WINDOW_DAYS - 1)
+        watermark = self.db.scalar(select(func.coalesce(func.max(stats_t.c.last_movement_id), 0)))
+        is_sale = and_(
+            moves_t.c.type == StockMovementType.OUT,
+            moves_t.c.created_at >= datetime.combine(window_start, time.min)
+        )
+        new_sales = and_(moves_t.c.id > watermark - WATERMARK_OVERLAP, is_sale)
+        
+        # Each product with new sales is recounted from its first new sale's day on
+        first_new = (
+            select(moves_t.c.product_id, func.date(func.min(moves_t.c.created_at)).label("since"))
+            .where(new_sales)
+            .group_by(moves_t.c.product_id)
+            .subquery()
+        )
+        # OUT movements store negative quantities
+        day = func.date(moves_t.c.created_at)
+        recount = (
+            select(moves_t.c.product_id, day, func.sum(-moves_t.c.quantity))
+            .join(first_new, first_new.c.product_id == moves_t.c.product_id)
+            .where(is_sale, moves_t.c.created_at >= first_new.c.since)
+            .group_by(moves_t.c.product_id, day)
+        )
+        insert_days = self._insert(days_t).from_select(["product_id", "day", "quantity"], recount)
+        self.db.execute(insert_days.on_conflict_do_update(
+            index_elements=[days_t.c.product_id, days_t.c.day],
+            set_={"quantity": insert_days.excluded.quantity}
+        ))
+        
+        latest = self.db.execute(
+            select(moves_t.c.product_id, func.max(moves_t.c.id)).where(new_sales).group_by(moves_t.c.product_id)
+        ).all()
+        if latest:
+            insert_stats = self._insert(stats_t)
+            self.db.execute(
+                insert_stats.on_conflict_do_update(
+                    index_elements=[stats_t.c.product_id],
+                    set_={"last_movement_id": insert_stats.excluded.last_movement_id}
+                ),
+                [{"product_id": product_id, "last_movement_id": movement_id} for product_id, movement_id in latest]
+            )
+        
+        self.db.execute(delete(days_t).where(days_t.c.day < window_start))
+        
+        def sold(days: int):
+            return (
+                select(func.coalesce(func.sum(days_t.c.quantity), 0))
+                .where(days_t.c.product_id == stats_t.c.product_id,
+                       days_t.c.day >= today - timedelta(days=days - 1))
+                .scalar_subquery()
+            )
+        
+        result = self.db.execute(update(stats_t).values(
+            sold_7d=sold(7), sold_30d=sold(30), sold_90d=sold(90), computed_at=datetime.utcnow()
+        ))
+        
+        # Second statement: SET expressions see the sold_30d of before the update
+        stock = select(Product.current_stock).where(Product.id == stats_t.c.product_id).scalar_subquery()
+        # Oversold products (negative stock) have no cover left, not negative cover
+        stock = case((stock > 0, stock), else_=0)
+        velocity = stats_t.c.sold_30d / 30.0
+        self.db.execute(update(stats_t).values(
+            daily_velocity=velocity,
+            days_of_cover=case((stats_t.c.sold_30d > 0, stock / velocity), else_=None),
+            reorder=and_(stats_t.c.sold_30d > 0, stock < velocity * lead_days)
+        ))
+        self.db.commit()
+        
+        at_risk = self.db.scalar(select(func.count()).select_from(stats_t).where(stats_t.c.reorder))
+        return {"products": result.rowcount, "recounted": len(latest), "reorder": at_risk}
+    
+    def list_at_risk(
+        self,
+        max_days_of_cover: float,
+        page: int = 1,
+        page_size: int = 20
+    ) -> Tuple[List, int]:
+        """
+        Products with less than ``max_days_of_cover`` days of stock left at
+        the last refresh, soonest first: a range scan on ix_product_stats_cover.
+        """
+        query = (
+            select(
+                *ProductStats.__table__.c,
+                Product.name,
+                Product.barcode,
+                Product.current_stock
+            )
+            .join(Product, Product.id == ProductStats.product_id)
+            .where(ProductStats.days_of_cover < max_days_of_cover)
+        )
+        total = self.db.scalar(select(func.count()).select_from(query.subquery()))
+        rows = self.db.execute(
+            query.order_by(ProductStats.days_of_cover.asc(), ProductStats.product_id.asc())
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        ).all()
+        return rows, total
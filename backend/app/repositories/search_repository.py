@@ -0,0 +1,20 @@
+from typing import Optional, List
+from sqlalchemy.orm import Session
+from app.models import Order, Customer
+from app.db.search_index import global_search
+
+
+class SearchRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def search_documents(self, term: str, limit: int) -> List[dict]:
+        return global_search(self.db, term, limit)
+
+    def get_order_with_customer_name(self, order_id: int) -> Optional[tuple]:
+        return (
+            self.db.query(Order.id, Customer.name)
+            .join(Customer, Customer.id == Order.customer_id)
+            .filter(Order.id == order_id)
+            .first()
+        )
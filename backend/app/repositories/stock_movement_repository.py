@@ -1,5 +1,7 @@
-from typing import Optional, List, Tuple
-from sqlalchemy.orm import Session, joinedload
+from typing import Optional, List, Tuple, Iterator
+from datetime import datetime
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
 from app.models import StockMovement, StockMovementType
 from app.schemas.stock_movement import StockMovementCreate
 
@@ -11,7 +13,6 @@ class StockMovementRepository:
     def get_by_id(self, movement_id: int) -> Optional[StockMovement]:
         return (
             self.db.query(StockMovement)
-            .options(joinedload(StockMovement.performed_by_user))
             .filter(StockMovement.id == movement_id)
             .first()
         )
@@ -24,7 +25,6 @@ class StockMovementRepository:
     ) -> Tuple[List[StockMovement], int]:
         query = (
             self.db.query(StockMovement)
-            .options(joinedload(StockMovement.performed_by_user))
             .filter(StockMovement.product_id == product_id)
         )
         total = query.count()
@@ -41,7 +41,7 @@ class StockMovementRepository:
         page_size: int = 20,
         product_id: Optional[int] = None
     ) -> Tuple[List[StockMovement], int]:
-        query = self.db.query(StockMovement).options(joinedload(StockMovement.performed_by_user))
+        query = self.db.query(StockMovement)
         
         if product_id:
             query = query.filter(StockMovement.product_id == product_id)
@@ -54,6 +54,13 @@ class StockMovementRepository:
         
         return items, total
     
+    def stream_all(self, product_id: Optional[int] = None, batch_size: int = 1000) -> Iterator[StockMovement]:
+        """Every matching movement, oldest first, fetched batch_size rows at a time."""
+        query = self.db.query(StockMovement)
+        if product_id:
+            query = query.filter(StockMovement.product_id == product_id)
+        return iter(query.order_by(StockMovement.created_at.asc(), StockMovement.id.asc()).yield_per(batch_size))
+    
     def create(
         self,
         product_id: int,
@@ -75,7 +82,31 @@ class StockMovementRepository:
         self.db.add(movement)
         self.db.commit()
         self.db.refresh(movement)
-        
-        # Load user relationship
-        self.db.refresh(movement, attribute_names=['performed_by_user'])
         return movement
+    
+    def bulk_create(
+        self,
+        movements: List[Tuple[int, int]],
+        movement_type: StockMovementType,
+        user_id: int,
+        reason: Optional[str] = None,
+        related_order_id: Optional[int] = None
+    ) -> None:
+        """Insert ``(product_id, quantity)`` movements with one executemany.  Not committed."""
+        if not movements:
+            return
+        now = datetime.utcnow()
+        self.db.execute(insert(StockMovement.__table__), [
+            {
+                "product_id": product_id,
+                "quantity": quantity,
+                "type": movement_type,
+                "reason": reason,
+                "related_order_id": related_order_id,
+                "created_by": user_id,
+                "updated_by": user_id,
+                "created_at": now,
+                "updated_at": now
+            }
+            for product_id, quantity in movements
+        ])
@@ -1,18 +1,29 @@
 from typing import Optional, List, Tuple
 from sqlalchemy.orm import Session
 from app.models import Tag, TagLink, TagEntityType
+from app.db.entity_cache import EntityCache
+from app.db.table_versions import bump_table_versions
 from app.schemas.tag import TagCreate
 
 
+tag_cache = EntityCache(Tag)
+
+
 class TagRepository:
     def __init__(self, db: Session):
         self.db = db
     
     def get_by_id(self, tag_id: int) -> Optional[Tag]:
-        return self.db.query(Tag).filter(Tag.id == tag_id).first()
+        return tag_cache.get(
+            self.db, ("id", tag_id),
+            lambda: self.db.query(Tag).filter(Tag.id == tag_id).first()
+        )
     
     def get_by_name(self, name: str) -> Optional[Tag]:
-        return self.db.query(Tag).filter(Tag.name == name).first()
+        return tag_cache.get(
+            self.db, ("name", name),
+            lambda: self.db.query(Tag).filter(Tag.name == name).first()
+        )
     
     def list_all(
         self,
@@ -35,13 +46,17 @@ class TagRepository:
             updated_by=user_id
         )
         self.db.add(tag)
+        bump_table_versions(self.db, "tags")
         self.db.commit()
+        tag_cache.invalidate()
         self.db.refresh(tag)
         return tag
     
     def delete(self, tag: Tag) -> None:
         self.db.delete(tag)
+        bump_table_versions(self.db, "tags")
         self.db.commit()
+        tag_cache.invalidate()
     
     def link_to_entity(
         self,
@@ -3,6 +3,8 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from app.models import User
+from app.core.cache import invalidate
+from app.db.table_versions import bump_table_versions
 
 
 class UserRepository:
@@ -10,6 +12,8 @@ class UserRepository:
         self.db = db
     
     def get_by_id(self, user_id: int) -> Optional[User]:
+        # Not cached: this is the authentication lookup, and is_active,
+        # is_admin and hashed_password must take effect on the next request
         return self.db.query(User).filter(User.id == user_id).first()
     
     def get_by_username(self, username: str) -> Optional[User]:
@@ -37,6 +41,7 @@ class UserRepository:
             phone_number=phone_number
         )
         self.db.add(user)
+        bump_table_versions(self.db, "users")
         self.db.commit()
         self.db.refresh(user)
         return user
@@ -57,7 +62,10 @@ class UserRepository:
             if hasattr(user, key):
                 setattr(user, key, value)
         user.updated_at = datetime.utcnow()
+        bump_table_versions(self.db, "users")
         self.db.commit()
+        if "username" in kwargs:
+            invalidate("usernames")
         self.db.refresh(user)
         return user
     
@@ -65,6 +73,7 @@ class UserRepository:
         user.is_active = False
         user.deactivated_at = datetime.utcnow()
         user.updated_at = datetime.utcnow()
+        bump_table_versions(self.db, "users")
         self.db.commit()
         self.db.refresh(user)
         return user
@@ -76,6 +85,7 @@ class UserRepository:
         user.security_question_2 = question_2
         user.security_answer_2_hash = answer_2_hash
         user.updated_at = datetime.utcnow()
+        bump_table_versions(self.db, "users")
         self.db.commit()
         self.db.refresh(user)
         return user
@@ -83,6 +93,7 @@ class UserRepository:
     def update_password(self, user: User, hashed_password: str) -> User:
         user.hashed_password = hashed_password
         user.updated_at = datetime.utcnow()
+        bump_table_versions(self.db, "users")
         self.db.commit()
         self.db.refresh(user)
         return user
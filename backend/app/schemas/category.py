@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
+from app.schemas.common import Username, username_of
 
 
 class CategoryBase(BaseModel):
@@ -21,7 +22,8 @@ class CategoryResponse(CategoryBase):
     created_by: int
     updated_at: datetime
     updated_by: int
-    created_by_username: Optional[str] = None
+    created_by_username: Username = username_of("created_by")
     
     class Config:
         from_attributes = True
+        populate_by_name = True
@@ -1,8 +1,61 @@
-from typing import Generic, TypeVar, List
-from pydantic import BaseModel
+from enum import Enum
+from math import ceil
+from typing import Annotated, Any, Generic, Iterable, Optional, Type, TypeVar, List
+from pydantic import AliasChoices, AliasPath, BaseModel, BeforeValidator, Field, ValidationError, ValidationInfo
 
 T = TypeVar("T")
 
+# Validation context key holding the {user id: username} map of a response
+USERNAMES = "usernames"
+
+
+def related(*path: str) -> Any:
+    """
+    Optional field read through a relationship when validating from an ORM
+    object, e.g. ``related("created_by_user", "username")``.
+
+    Stays None when the relationship is unset.  Schemas using it set
+    ``populate_by_name`` so the field can still be passed by name.
+    """
+    return Field(default=None, validation_alias=AliasPath(*path))
+
+
+def _lookup_username(value: Any, info: ValidationInfo) -> Any:
+    if value is None or isinstance(value, str):
+        return value
+    return (info.context or {}).get(USERNAMES, {}).get(value)
+
+
+Username = Annotated[Optional[str], BeforeValidator(_lookup_username)]
+
+
+def username_of(fk: str, name: Optional[str] = None) -> Any:
+    """
+    ``Username`` field read from the user id in column ``fk``, e.g.
+    ``created_by_username: Username = username_of("created_by")``; ``name``
+    is the field's own name when it is not ``<fk>_username``.
+
+    The id is looked up in the map that ``with_usernames`` (app/db/usernames)
+    passes as validation context, so a page needs one query for all of its
+    users instead of a User row per item; without that context the field is
+    None.  The field's own name is tried first, so re-validating a dumped
+    response keeps the username.
+    """
+    return Field(default=None, validation_alias=AliasChoices(name or f"{fk}_username", fk))
+
+
+def describe_errors(exc: ValidationError) -> str:
+    """One-line summary of a ValidationError for per-row error reports."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in exc.errors()
+    )
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
 
 class PaginatedResponse(BaseModel, Generic[T]):
     items: List[T]
@@ -10,3 +63,27 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page: int
     page_size: int
     total_pages: int
+
+
+def paginate(
+    schema: Type[T],
+    items: Iterable[Any],
+    total: int,
+    page: int,
+    page_size: int,
+    context: Optional[dict] = None
+) -> PaginatedResponse[T]:
+    """
+    Validate a page of ORM rows into ``PaginatedResponse[schema]`` in one pass.
+    ``context`` is the validation context, e.g. from ``with_usernames``.
+    """
+    return PaginatedResponse[schema].model_validate(
+        {
+            "items": items,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": ceil(total / page_size) if total > 0 else 0,
+        },
+        context=context
+    )
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
+from app.schemas.common import Username, username_of
 
 
 class ContactBase(BaseModel):
@@ -39,8 +40,9 @@ class ContactResponse(ContactBase):
     created_by: int
     updated_at: datetime
     updated_by: int
-    created_by_username: Optional[str] = None
+    created_by_username: Username = username_of("created_by")
     customers: List[CustomerInfo] = []
     
     class Config:
         from_attributes = True
+        populate_by_name = True
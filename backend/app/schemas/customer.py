@@ -1,6 +1,8 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import AfterValidator, BaseModel
+from typing import Annotated, Literal, Optional, List
 from datetime import datetime
+from app.models import OrderStatus, PaymentMethod
+from app.schemas.common import PaginatedResponse, Username, related, username_of
 
 
 class CustomerBase(BaseModel):
@@ -35,6 +37,10 @@ class ContactInfo(BaseModel):
         from_attributes = True
 
 
+# Incrementally maintained sums drift in the last float digits
+Amount = Annotated[Optional[float], AfterValidator(lambda v: None if v is None else round(v, 2))]
+
+
 class CustomerResponse(CustomerBase):
     id: int
     created_at: datetime
@@ -42,7 +48,57 @@ class CustomerResponse(CustomerBase):
     updated_at: datetime
     updated_by: int
     contacts: List[ContactInfo] = []
-    created_by_username: Optional[str] = None
+    created_by_username: Username = username_of("created_by")
+    # From customer_metrics; None while the customer has no row there yet
+    order_count: Optional[int] = related("metrics", "order_count")
+    revenue: Amount = related("metrics", "revenue")
+    paid: Amount = related("metrics", "paid")
+    outstanding: Amount = related("metrics", "outstanding")
+    last_order_at: Optional[datetime] = related("metrics", "last_order_at")
+    
+    class Config:
+        from_attributes = True
+        populate_by_name = True
+
+
+class AgingBuckets(BaseModel):
+    current: float = 0.0  # 0-30 days
+    days_31_60: float = 0.0
+    days_61_90: float = 0.0
+    over_90: float = 0.0
+    total_outstanding: float = 0.0
+
+
+class CustomerAging(AgingBuckets):
+    customer_id: int
+    customer_name: str
+    open_orders: int
+    oldest_order_at: datetime
     
     class Config:
         from_attributes = True
+
+
+class ReceivablesAgingResponse(PaginatedResponse[CustomerAging]):
+    as_of: datetime
+    totals: AgingBuckets
+
+
+class LedgerEntry(BaseModel):
+    kind: Literal["order", "payment"]
+    entry_id: int  # order id or payment id, depending on kind
+    order_id: int
+    created_at: datetime
+    debit: float
+    credit: float
+    balance: float  # running balance after this entry
+    order_status: Optional[OrderStatus] = None
+    payment_method: Optional[PaymentMethod] = None
+
+
+class CustomerLedger(BaseModel):
+    customer_id: int
+    customer_name: str
+    balance: float  # current balance over the whole timeline
+    entries: List[LedgerEntry]
+    next_cursor: Optional[str] = None
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
+from app.schemas.common import Username, related, username_of
 
 
 class ExpenseCategoryBase(BaseModel):
@@ -57,11 +58,12 @@ class ExpenseResponse(BaseModel):
     created_by: int
     updated_at: datetime
     updated_by: int
-    created_by_username: Optional[str] = None  # WHO created this expense
-    category_name: Optional[str] = None
+    created_by_username: Username = username_of("created_by")  # WHO created this expense
+    category_name: Optional[str] = related("category", "name")
     
     class Config:
         from_attributes = True
+        populate_by_name = True
 
 
 class ExpenseHistoryResponse(BaseModel):
@@ -69,10 +71,11 @@ class ExpenseHistoryResponse(BaseModel):
     expense_id: int
     changed_at: datetime
     changed_by: int
-    changed_by_username: Optional[str] = None
+    changed_by_username: Username = username_of("changed_by")
     field_name: str
     old_value: Optional[str] = None
     new_value: Optional[str] = None
     
     class Config:
         from_attributes = True
+        populate_by_name = True
@@ -0,0 +1,37 @@
+from pydantic import BaseModel, model_validator
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+
+class AnalyticsTable(str, Enum):
+    PAYMENTS = "payments"
+    EXPENSES = "expenses"
+    ORDER_ITEMS = "order_items"
+    STOCK_MOVEMENTS = "stock_movements"
+
+
+class AnalyticsExportRequest(BaseModel):
+    tables: Optional[List[AnalyticsTable]] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    partition_by_month: Optional[bool] = None
+
+    @model_validator(mode="after")
+    def check_range(self):
+        if self.start_date and self.end_date and self.start_date > self.end_date:
+            raise ValueError("start_date must not be after end_date")
+        return self
+
+
+class MaintenanceJob(BaseModel):
+    name: str
+    interval_seconds: Optional[float] = None
+    running: bool
+    pending: bool
+    runs: int
+    last_started_at: Optional[datetime] = None
+    last_finished_at: Optional[datetime] = None
+    last_status: Optional[str] = None
+    last_error: Optional[str] = None
+    last_result: Optional[Dict[str, Any]] = None
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class CacheStats(BaseModel):
+    name: str
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    size: int
+    maxsize: int
+    ttl_seconds: Optional[float] = None
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from datetime import datetime
 from app.models import EntityType
+from app.schemas.common import Username, username_of
 
 
 class NoteBase(BaseModel):
@@ -17,8 +18,9 @@ class NoteResponse(NoteBase):
     id: int
     created_at: datetime
     created_by: int
-    created_by_username: str | None = None  # WHO created the note
+    created_by_username: Username = username_of("created_by")  # WHO created the note
     
     class Config:
         from_attributes = True
+        populate_by_name = True
 
@@ -1,7 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional
 from datetime import datetime
 from app.models import PaymentStatus, DeliveryStatus, OrderStatus
+from app.schemas.common import Username, username_of
 
 
 class OrderItemBase(BaseModel):
@@ -43,16 +44,56 @@ class OrderResponse(BaseModel):
     payment_status: PaymentStatus
     delivery_status: DeliveryStatus
     order_status: OrderStatus
+    paid_amount: float
+    total_quantity: int
+    delivered_quantity: int
     created_at: datetime
     created_by: int
     updated_at: datetime
     updated_by: int
-    created_by_username: Optional[str] = None  # WHO created this order
+    created_by_username: Username = username_of("created_by")  # WHO created this order
     items: list[OrderItemResponse] = []
     
     class Config:
         from_attributes = True
+        populate_by_name = True
 
 
 class DeliverOrderItemRequest(BaseModel):
     quantity: int
+
+
+class DeliverOrderLine(BaseModel):
+    item_id: int
+    quantity: int = Field(..., gt=0)
+
+
+class DeliverOrderRequest(BaseModel):
+    """Either ``items`` to deliver or ``deliver_all`` for everything outstanding."""
+    items: list[DeliverOrderLine] = []
+    deliver_all: bool = False
+    note: Optional[str] = None
+    
+    @model_validator(mode="after")
+    def require_items(self):
+        if self.deliver_all == bool(self.items):
+            raise ValueError("Give either items or deliver_all")
+        return self
+
+
+class OrderBatchCreated(BaseModel):
+    index: int
+    order_id: int
+
+
+class OrderBatchError(BaseModel):
+    index: int
+    customer_id: Optional[int] = None
+    error: str
+
+
+class OrderBatchResponse(BaseModel):
+    created: int = 0
+    failed: int = 0
+    orders: list[OrderBatchCreated] = []
+    errors: list[OrderBatchError] = []
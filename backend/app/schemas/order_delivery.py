@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
+from app.schemas.common import Username, username_of
 
 
 class OrderDeliveryBase(BaseModel):
@@ -16,8 +17,9 @@ class OrderDeliveryCreate(OrderDeliveryBase):
 class OrderDeliveryResponse(OrderDeliveryBase):
     id: int
     delivered_by_user_id: int
-    delivered_by_username: Optional[str] = None  # WHO performed the delivery
+    delivered_by_username: Username = username_of("delivered_by_user_id", "delivered_by_username")  # WHO performed the delivery
     created_at: datetime
     
     class Config:
         from_attributes = True
+        populate_by_name = True
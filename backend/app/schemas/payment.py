@@ -2,6 +2,7 @@ from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
 from app.models import PaymentMethod
+from app.schemas.common import Username, username_of
 
 
 class PaymentBase(BaseModel):
@@ -20,7 +21,8 @@ class PaymentResponse(PaymentBase):
     created_by: int
     updated_at: datetime
     updated_by: int
-    received_by_username: Optional[str] = None  # WHO collected/received this payment
+    received_by_username: Username = username_of("created_by", "received_by_username")  # WHO collected/received this payment
     
     class Config:
         from_attributes = True
+        populate_by_name = True
@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import Optional
 from datetime import datetime
+from app.schemas.common import Username, username_of
 
 
 class ProductBase(BaseModel):
@@ -30,7 +31,82 @@ class ProductResponse(ProductBase):
     created_by: int
     updated_at: datetime
     updated_by: int
-    created_by_username: Optional[str] = None
+    created_by_username: Username = username_of("created_by")
     
     class Config:
         from_attributes = True
+        populate_by_name = True
+
+
+class BarcodeLookupRequest(BaseModel):
+    barcodes: list[str]
+
+
+class ProductBarcodeMatch(BaseModel):
+    barcode: str
+    id: int
+    name: str
+    category_id: int
+    list_price: float
+    current_stock: int
+    
+    class Config:
+        from_attributes = True
+
+
+class BarcodeLookupResponse(BaseModel):
+    items: list[ProductBarcodeMatch]
+    missing: list[str]
+
+
+class ProductImportRow(BaseModel):
+    """One product of a bulk import; the category is given by id or name."""
+    name: str = Field(..., min_length=1, max_length=255)
+    description: Optional[str] = None
+    barcode: Optional[str] = Field(None, max_length=100)
+    category_id: Optional[int] = None
+    category: Optional[str] = None
+    list_price: float = Field(0.0, ge=0)
+    initial_stock: int = Field(0, ge=0)
+    
+    @field_validator("name", "description", "barcode", "category", mode="before")
+    @classmethod
+    def strip_text(cls, value):
+        if isinstance(value, str):
+            value = value.strip()
+            return value or None
+        return value
+    
+    @model_validator(mode="after")
+    def require_category(self):
+        if self.category_id is None and self.category is None:
+            raise ValueError("category_id or category is required")
+        return self
+
+
+class ProductImportError(BaseModel):
+    row: int
+    barcode: Optional[str] = None
+    error: str
+
+
+class ProductImportResponse(BaseModel):
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    stock_movements: int = 0
+    errors: list[ProductImportError] = []
+
+
+class ProductAtRisk(BaseModel):
+    product_id: int
+    name: str
+    barcode: Optional[str] = None
+    current_stock: int  # now; days_of_cover is as of computed_at
+    sold_7d: int
+    sold_30d: int
+    sold_90d: int
+    daily_velocity: float
+    days_of_cover: float
+    reorder: bool
+    computed_at: Optional[datetime] = None
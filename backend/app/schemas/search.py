@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Optional, Literal
+
+
+class SearchHit(BaseModel):
+    type: Literal["product", "customer", "contact", "order", "note"]
+    id: int
+    title: str
+    subtitle: Optional[str] = None
+    # For notes: the entity the note is attached to
+    parent_type: Optional[str] = None
+    parent_id: Optional[int] = None
+
+
+class SearchResponse(BaseModel):
+    query: str
+    hits: list[SearchHit]
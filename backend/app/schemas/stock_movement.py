@@ -2,6 +2,7 @@ from pydantic import BaseModel
 from datetime import datetime
 from app.models import StockMovementType
 from typing import Optional
+from app.schemas.common import Username, username_of
 
 
 class StockMovementBase(BaseModel):
@@ -22,7 +23,8 @@ class StockMovementResponse(StockMovementBase):
     created_by: int
     updated_at: datetime
     updated_by: int
-    performed_by_username: Optional[str] = None  # WHO performed this stock movement
+    performed_by_username: Username = username_of("created_by", "performed_by_username")  # WHO performed this stock movement
     
     class Config:
         from_attributes = True
+        populate_by_name = True
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
+from app.schemas.common import Username, username_of
 
 
 class UserBase(BaseModel):
@@ -44,7 +45,7 @@ class UserResponse(UserBase):
     is_admin: bool
     is_active: bool
     created_by: Optional[int] = None
-    created_by_username: Optional[str] = None
+    created_by_username: Username = username_of("created_by")
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     deactivated_at: Optional[datetime] = None
@@ -59,6 +60,7 @@ class UserResponse(UserBase):
     
     class Config:
         from_attributes = True
+        populate_by_name = True
 
 
 class SecurityQuestionSetup(BaseModel):
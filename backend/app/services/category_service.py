@@ -2,9 +2,9 @@ from typing import Optional
 from sqlalchemy.orm import Session
 from app.repositories.category_repository import CategoryRepository
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
-from app.schemas.common import PaginatedResponse
+from app.db.usernames import with_usernames
+from app.schemas.common import PaginatedResponse, paginate
 from app.core.exceptions import NotFoundException
-from math import ceil
 from loguru import logger
 
 
@@ -17,10 +17,7 @@ class CategoryService:
         category = self.repo.get_by_id(category_id)
         if not category:
             raise NotFoundException("Category not found")
-        response = CategoryResponse.model_validate(category)
-        if category.created_by_user:
-            response.created_by_username = category.created_by_user.username
-        return response
+        return CategoryResponse.model_validate(category, context=with_usernames(self.db, [category]))
     
     def list_categories(
         self,
@@ -30,28 +27,13 @@ class CategoryService:
         order: str = "asc"
     ) -> PaginatedResponse[CategoryResponse]:
         items, total = self.repo.list_all(page, page_size, sort_by, order)
-        responses = []
-        for item in items:
-            response = CategoryResponse.model_validate(item)
-            if item.created_by_user:
-                response.created_by_username = item.created_by_user.username
-            responses.append(response)
-        return PaginatedResponse(
-            items=responses,
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=ceil(total / page_size) if total > 0 else 0
-        )
+        return paginate(CategoryResponse, items, total, page, page_size, context=with_usernames(self.db, items))
     
     def create_category(self, data: CategoryCreate, user_id: int) -> CategoryResponse:
         logger.info(f"Creating category: {data.name} (by user {user_id})")
         category = self.repo.create(data, user_id)
         logger.info(f"Category created successfully - ID: {category.id}, Name: {category.name}")
-        response = CategoryResponse.model_validate(category)
-        if category.created_by_user:
-            response.created_by_username = category.created_by_user.username
-        return response
+        return CategoryResponse.model_validate(category, context=with_usernames(self.db, [category]))
     
     def update_category(self, category_id: int, data: CategoryUpdate, user_id: int) -> CategoryResponse:
         category = self.repo.get_by_id(category_id)
@@ -59,10 +41,7 @@ class CategoryService:
             raise NotFoundException("Category not found")
         
         category = self.repo.update(category, data, user_id)
-        response = CategoryResponse.model_validate(category)
-        if category.created_by_user:
-            response.created_by_username = category.created_by_user.username
-        return response
+        return CategoryResponse.model_validate(category, context=with_usernames(self.db, [category]))
     
     def delete_category(self, category_id: int) -> None:
         category = self.repo.get_by_id(category_id)
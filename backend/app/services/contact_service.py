@@ -1,10 +1,10 @@
 from typing import Optional
 from sqlalchemy.orm import Session
 from app.repositories.contact_repository import ContactRepository
-from app.schemas.contact import ContactCreate, ContactUpdate, ContactResponse, CustomerInfo
-from app.schemas.common import PaginatedResponse
+from app.schemas.contact import ContactCreate, ContactUpdate, ContactResponse
+from app.db.usernames import with_usernames
+from app.schemas.common import PaginatedResponse, paginate
 from app.core.exceptions import NotFoundException
-from math import ceil
 from loguru import logger
 
 
@@ -14,12 +14,7 @@ class ContactService:
         self.repo = ContactRepository(db)
     
     def _build_response(self, contact) -> ContactResponse:
-        response = ContactResponse.model_validate(contact)
-        if contact.created_by_user:
-            response.created_by_username = contact.created_by_user.username
-        if hasattr(contact, 'customers') and contact.customers:
-            response.customers = [CustomerInfo.model_validate(c) for c in contact.customers]
-        return response
+        return ContactResponse.model_validate(contact, context=with_usernames(self.db, [contact]))
     
     def get_contact(self, contact_id: int) -> ContactResponse:
         contact = self.repo.get_by_id(contact_id)
@@ -36,16 +31,7 @@ class ContactService:
         search: Optional[str] = None
     ) -> PaginatedResponse[ContactResponse]:
         items, total = self.repo.list_all(page, page_size, sort_by, order, search)
-        responses = []
-        for item in items:
-            responses.append(self._build_response(item))
-        return PaginatedResponse(
-            items=responses,
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=ceil(total / page_size) if total > 0 else 0
-        )
+        return paginate(ContactResponse, items, total, page, page_size, context=with_usernames(self.db, items))
     
     def create_contact(self, data: ContactCreate, user_id: int) -> ContactResponse:
         logger.info(f"Creating contact: {data.name} with {len(data.customer_ids)} customers (by user {user_id})")
@@ -1,13 +1,37 @@
-from typing import Optional
+import base64
+import binascii
+from math import ceil
+from datetime import datetime
+from typing import Optional, Tuple
 from sqlalchemy.orm import Session
 from app.repositories.customer_repository import CustomerRepository
-from app.schemas.customer import CustomerCreate, CustomerUpdate, CustomerResponse
-from app.schemas.common import PaginatedResponse
-from app.core.exceptions import NotFoundException
-from math import ceil
+from app.repositories.order_repository import OrderRepository
+from app.schemas.customer import (
+    CustomerCreate, CustomerUpdate, CustomerResponse, AgingBuckets, ReceivablesAgingResponse,
+    CustomerLedger, LedgerEntry
+)
+from app.db.usernames import with_usernames
+from app.schemas.common import PaginatedResponse, paginate
+from app.core.exceptions import BadRequestException, NotFoundException
 from loguru import logger
 
 
+def _encode_cursor(entry: LedgerEntry) -> str:
+    raw = f"{entry.created_at.isoformat()}|{entry.kind}|{entry.entry_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, kind, entry_id = raw.split("|")
+        if kind not in ("order", "payment"):
+            raise ValueError(kind)
+        return datetime.fromisoformat(created_at), kind, int(entry_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise BadRequestException("Invalid cursor")
+
+
 class CustomerService:
     def __init__(self, db: Session):
         self.db = db
@@ -17,10 +41,7 @@ class CustomerService:
         customer = self.repo.get_by_id(customer_id)
         if not customer:
             raise NotFoundException("Customer not found")
-        response = CustomerResponse.model_validate(customer)
-        if customer.created_by_user:
-            response.created_by_username = customer.created_by_user.username
-        return response
+        return CustomerResponse.model_validate(customer, context=with_usernames(self.db, [customer]))
     
     def list_customers(
         self,
@@ -28,31 +49,75 @@ class CustomerService:
         page_size: int = 20,
         sort_by: str = "id",
         order: str = "asc",
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        min_orders: Optional[int] = None,
+        min_revenue: Optional[float] = None,
+        min_outstanding: Optional[float] = None,
+        last_order_after: Optional[datetime] = None,
+        last_order_before: Optional[datetime] = None
     ) -> PaginatedResponse[CustomerResponse]:
-        items, total = self.repo.list_all(page, page_size, sort_by, order, search)
-        responses = []
-        for item in items:
-            response = CustomerResponse.model_validate(item)
-            if item.created_by_user:
-                response.created_by_username = item.created_by_user.username
-            responses.append(response)
-        return PaginatedResponse(
-            items=responses,
+        items, total = self.repo.list_all(
+            page, page_size, sort_by, order, search,
+            min_orders, min_revenue, min_outstanding, last_order_after, last_order_before
+        )
+        return paginate(CustomerResponse, items, total, page, page_size, context=with_usernames(self.db, items))
+    
+    def receivables_aging(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        sort_by: str = "total_outstanding",
+        order: str = "desc"
+    ) -> ReceivablesAgingResponse:
+        as_of = datetime.utcnow()
+        rows, total, totals = OrderRepository(self.db).receivables_aging(as_of, page, page_size, sort_by, order)
+        amounts = list(AgingBuckets.model_fields)
+        items = [
+            {**row._mapping, **{name: round(row._mapping[name], 2) for name in amounts}}
+            for row in rows
+        ]
+        return ReceivablesAgingResponse(
+            items=items,
             total=total,
             page=page,
             page_size=page_size,
-            total_pages=ceil(total / page_size) if total > 0 else 0
+            total_pages=ceil(total / page_size) if total > 0 else 0,
+            as_of=as_of,
+            totals=AgingBuckets(**{name: round(value, 2) for name, value in zip(amounts, totals)})
+        )
+    
+    def get_ledger(self, customer_id: int, cursor: Optional[str] = None, limit: int = 50) -> CustomerLedger:
+        """
+        One page of the customer's orders and payments, oldest first, with a
+        running balance.  ``cursor`` is the previous page's ``next_cursor``;
+        the balance carried into a later page is summed in SQL from the
+        entries before it, so pages stay correct however deep they go.
+        """
+        summary = self.repo.balance(customer_id)
+        if summary is None:
+            raise NotFoundException("Customer not found")
+        name, balance = summary
+        
+        after = _decode_cursor(cursor) if cursor else None
+        opening = self.repo.balance_before(customer_id, after) if after else 0.0
+        rows = self.repo.ledger(customer_id, after, limit + 1)
+        entries = [
+            LedgerEntry(**row._mapping, balance=round(opening + row.running, 2))
+            for row in rows[:limit]
+        ]
+        return CustomerLedger(
+            customer_id=customer_id,
+            customer_name=name,
+            balance=round(balance, 2),
+            entries=entries,
+            next_cursor=_encode_cursor(entries[-1]) if len(rows) > limit else None
         )
     
     def create_customer(self, data: CustomerCreate, user_id: int) -> CustomerResponse:
         logger.info(f"Creating customer: {data.name} (by user ID: {user_id})")
         customer = self.repo.create(data, user_id)
         logger.info(f"Customer created successfully - ID: {customer.id}, Name: {customer.name}")
-        response = CustomerResponse.model_validate(customer)
-        if customer.created_by_user:
-            response.created_by_username = customer.created_by_user.username
-        return response
+        return CustomerResponse.model_validate(customer, context=with_usernames(self.db, [customer]))
     
     def update_customer(self, customer_id: int, data: CustomerUpdate, user_id: int) -> CustomerResponse:
         customer = self.repo.get_by_id(customer_id)
@@ -63,10 +128,7 @@ class CustomerService:
         logger.info(f"Updating customer ID: {customer_id} (by user ID: {user_id})")
         customer = self.repo.update(customer, data, user_id)
         logger.info(f"Customer updated successfully - ID: {customer.id}")
-        response = CustomerResponse.model_validate(customer)
-        if customer.created_by_user:
-            response.created_by_username = customer.created_by_user.username
-        return response
+        return CustomerResponse.model_validate(customer, context=with_usernames(self.db, [customer]))
     
     def delete_customer(self, customer_id: int) -> None:
         customer = self.repo.get_by_id(customer_id)
@@ -11,10 +11,10 @@ from app.schemas.expense import (
     ExpenseCategoryResponse,
     ExpenseHistoryResponse
 )
-from app.schemas.common import PaginatedResponse
+from app.db.usernames import with_usernames
+from app.schemas.common import PaginatedResponse, paginate
 from app.core.exceptions import NotFoundException, BadRequestException
 from app.models import ExpenseHistory
-from math import ceil
 from loguru import logger
 
 
@@ -29,14 +29,7 @@ class ExpenseService:
         if not expense:
             raise NotFoundException("Expense not found")
         
-        response = ExpenseResponse.model_validate(expense)
-        # Populate username and category name
-        if expense.created_by_user:
-            response.created_by_username = expense.created_by_user.username
-        if expense.category:
-            response.category_name = expense.category.name
-        
-        return response
+        return ExpenseResponse.model_validate(expense, context=with_usernames(self.db, [expense]))
     
     def list_expenses(
         self,
@@ -53,22 +46,7 @@ class ExpenseService:
             category_id, start_date, end_date
         )
         
-        responses = []
-        for item in items:
-            response = ExpenseResponse.model_validate(item)
-            if item.created_by_user:
-                response.created_by_username = item.created_by_user.username
-            if item.category:
-                response.category_name = item.category.name
-            responses.append(response)
-        
-        return PaginatedResponse(
-            items=responses,
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=ceil(total / page_size) if total > 0 else 0
-        )
+        return paginate(ExpenseResponse, items, total, page, page_size, context=with_usernames(self.db, items))
     
     def create_expense(self, data: ExpenseCreate, user_id: int) -> ExpenseResponse:
         # Validate category exists
@@ -79,13 +57,7 @@ class ExpenseService:
         expense = self.expense_repo.create(data, user_id)
         logger.info(f"Expense {expense.id} created by user {user_id}")
         
-        response = ExpenseResponse.model_validate(expense)
-        if expense.created_by_user:
-            response.created_by_username = expense.created_by_user.username
-        if expense.category:
-            response.category_name = expense.category.name
-        
-        return response
+        return ExpenseResponse.model_validate(expense, context=with_usernames(self.db, [expense]))
     
     def update_expense(self, expense_id: int, data: ExpenseUpdate, user_id: int) -> ExpenseResponse:
         expense = self.expense_repo.get_by_id(expense_id)
@@ -93,6 +65,7 @@ class ExpenseService:
             raise NotFoundException("Expense not found")
         
         # Validate category if being changed
+        category = None
         if data.category_id is not None:
             category = self.category_repo.get_by_id(data.category_id)
             if not category:
@@ -112,11 +85,10 @@ class ExpenseService:
                 new_val = update_data[field]
                 if str(old_val) != str(new_val):
                     # For category_id, store category name instead
+                    # (both are already loaded — no per-field lookups)
                     if field == 'category_id':
-                        old_cat = self.category_repo.get_by_id(old_val) if old_val else None
-                        new_cat = self.category_repo.get_by_id(new_val) if new_val else None
-                        old_display = old_cat.name if old_cat else str(old_val)
-                        new_display = new_cat.name if new_cat else str(new_val)
+                        old_display = expense.category.name if expense.category else str(old_val)
+                        new_display = category.name if category else str(new_val)
                     else:
                         old_display = str(old_val) if old_val is not None else None
                         new_display = str(new_val) if new_val is not None else None
@@ -133,36 +105,23 @@ class ExpenseService:
         expense = self.expense_repo.update(expense, data, user_id)
         logger.info(f"Expense {expense_id} updated by user {user_id}")
         
-        response = ExpenseResponse.model_validate(expense)
-        if expense.created_by_user:
-            response.created_by_username = expense.created_by_user.username
-        if expense.category:
-            response.category_name = expense.category.name
-        
-        return response
+        return ExpenseResponse.model_validate(expense, context=with_usernames(self.db, [expense]))
     
     def get_expense_history(self, expense_id: int) -> list[ExpenseHistoryResponse]:
         expense = self.expense_repo.get_by_id(expense_id)
         if not expense:
             raise NotFoundException("Expense not found")
         
-        from sqlalchemy.orm import joinedload
         from app.models import ExpenseHistory as EH
         history_items = (
             self.db.query(EH)
-            .options(joinedload(EH.changed_by_user))
             .filter(EH.expense_id == expense_id)
             .order_by(EH.changed_at.desc())
             .all()
         )
         
-        responses = []
-        for item in history_items:
-            resp = ExpenseHistoryResponse.model_validate(item)
-            if item.changed_by_user:
-                resp.changed_by_username = item.changed_by_user.username
-            responses.append(resp)
-        return responses
+        context = with_usernames(self.db, history_items, "changed_by")
+        return [ExpenseHistoryResponse.model_validate(item, context=context) for item in history_items]
     
     def delete_expense(self, expense_id: int) -> None:
         expense = self.expense_repo.get_by_id(expense_id)
@@ -187,13 +146,7 @@ class ExpenseService:
     ) -> PaginatedResponse[ExpenseCategoryResponse]:
         items, total = self.category_repo.list_all(page, page_size)
         
-        return PaginatedResponse(
-            items=[ExpenseCategoryResponse.model_validate(item) for item in items],
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=ceil(total / page_size) if total > 0 else 0
-        )
+        return paginate(ExpenseCategoryResponse, items, total, page, page_size)
     
     def create_category(self, data: ExpenseCategoryCreate, user_id: int) -> ExpenseCategoryResponse:
         # Check if category name already exists
@@ -227,7 +180,7 @@ class ExpenseService:
             raise NotFoundException("Expense category not found")
         
         # Check if category has expenses
-        if category.expenses:
+        if self.category_repo.has_expenses(category_id):
             raise BadRequestException("Cannot delete category with existing expenses")
         
         self.category_repo.delete(category)
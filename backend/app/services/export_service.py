@@ -0,0 +1,163 @@
+"""
+Streamed exports.
+
+An export runs as a generator feeding a StreamingResponse: rows come from the
+repository's ``stream_all`` (a ``yield_per`` cursor, server-side on
+PostgreSQL), are validated with the entity's response schema in batches of
+EXPORT_BATCH_SIZE, and leave as one CSV or NDJSON chunk per batch.  Only one
+batch is held in memory, whatever the size of the export.
+
+The generator keeps running after the endpoint has returned, when the
+request's session is already closed, so every export opens its own session.
+"""
+
+import csv
+import io
+from datetime import date, datetime
+from enum import Enum
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Type
+
+import orjson
+from fastapi.responses import StreamingResponse
+from loguru import logger
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.db.usernames import with_usernames
+from app.models import OrderStatus, PaymentStatus, DeliveryStatus
+from app.repositories.expense_repository import ExpenseRepository
+from app.repositories.order_repository import OrderRepository
+from app.repositories.payment_repository import PaymentRepository
+from app.repositories.stock_movement_repository import StockMovementRepository
+from app.schemas.common import ExportFormat
+from app.schemas.expense import ExpenseResponse
+from app.schemas.order import OrderResponse
+from app.schemas.payment import PaymentResponse
+from app.schemas.stock_movement import StockMovementResponse
+
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+def _cell(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _encode_csv(records: List[dict], columns: List[str]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for record in records:
+        writer.writerow([_cell(record[column]) for column in columns])
+    return buffer.getvalue().encode()
+
+
+def _encode_ndjson(records: List[dict]) -> bytes:
+    return b"".join(orjson.dumps(record) + b"\n" for record in records)
+
+
+def stream_export(
+    load: Callable[[Session], Iterable[Any]],
+    schema: Type[BaseModel],
+    fmt: ExportFormat,
+    fks: tuple = ("created_by",),
+    exclude: frozenset = frozenset()
+) -> Iterator[bytes]:
+    """
+    Yield ``load(session)`` rendered as ``schema`` records, one chunk per
+    batch.  ``fks`` are the user id columns behind the schema's username
+    fields; ``exclude`` drops fields (nested collections do not fit a CSV row).
+    """
+    columns = [name for name in schema.model_fields if name not in exclude]
+    include = set(columns)
+    db = SessionLocal()
+    try:
+        rows = iter(load(db))
+        if fmt == ExportFormat.CSV:
+            header = io.StringIO()
+            csv.writer(header).writerow(columns)
+            yield header.getvalue().encode()
+        exported = 0
+        while True:
+            batch = list(islice(rows, EXPORT_BATCH_SIZE))
+            if not batch:
+                break
+            context = with_usernames(db, batch, *fks)
+            records = [
+                schema.model_validate(row, context=context).model_dump(include=include)
+                for row in batch
+            ]
+            if fmt == ExportFormat.CSV:
+                yield _encode_csv(records, columns)
+            else:
+                yield _encode_ndjson(records)
+            exported += len(batch)
+        logger.info(f"Exported {exported} {schema.__name__} rows as {fmt.value}")
+    finally:
+        db.close()
+
+
+def export_response(name: str, fmt: ExportFormat, body: Iterator[bytes]) -> StreamingResponse:
+    filename = f"{name}-{datetime.utcnow():%Y%m%d-%H%M%S}.{fmt.value}"
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+class ExportService:
+    """Export builders, one per entity, taking the filters of its list endpoint."""
+
+    def export_orders(
+        self,
+        fmt: ExportFormat,
+        customer_id: Optional[int] = None,
+        order_status: Optional[OrderStatus] = None,
+        payment_status: Optional[PaymentStatus] = None,
+        delivery_status: Optional[DeliveryStatus] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        min_outstanding: Optional[float] = None
+    ) -> StreamingResponse:
+        def load(db: Session):
+            return OrderRepository(db).stream_all(
+                customer_id, order_status, payment_status, delivery_status, start_date, end_date,
+                min_outstanding, batch_size=EXPORT_BATCH_SIZE
+            )
+        body = stream_export(load, OrderResponse, fmt, exclude=frozenset({"items"}))
+        return export_response("orders", fmt, body)
+
+    def export_payments(self, fmt: ExportFormat, order_id: Optional[int] = None) -> StreamingResponse:
+        def load(db: Session):
+            return PaymentRepository(db).stream_all(order_id, batch_size=EXPORT_BATCH_SIZE)
+        return export_response("payments", fmt, stream_export(load, PaymentResponse, fmt))
+
+    def export_expenses(
+        self,
+        fmt: ExportFormat,
+        category_id: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> StreamingResponse:
+        def load(db: Session):
+            return ExpenseRepository(db).stream_all(
+                category_id, start_date, end_date, batch_size=EXPORT_BATCH_SIZE
+            )
+        return export_response("expenses", fmt, stream_export(load, ExpenseResponse, fmt))
+
+    def export_stock_movements(self, fmt: ExportFormat, product_id: Optional[int] = None) -> StreamingResponse:
+        def load(db: Session):
+            return StockMovementRepository(db).stream_all(product_id, batch_size=EXPORT_BATCH_SIZE)
+        return export_response("stock-movements", fmt, stream_export(load, StockMovementResponse, fmt))
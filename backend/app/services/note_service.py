@@ -2,10 +2,10 @@ from typing import Optional
 from sqlalchemy.orm import Session
 from app.repositories.note_repository import NoteRepository
 from app.schemas.note import NoteCreate, NoteResponse
-from app.schemas.common import PaginatedResponse
+from app.db.usernames import with_usernames
+from app.schemas.common import PaginatedResponse, paginate
 from app.core.exceptions import NotFoundException
 from app.models import EntityType
-from math import ceil
 from loguru import logger
 
 
@@ -18,7 +18,7 @@ class NoteService:
         note = self.repo.get_by_id(note_id)
         if not note:
             raise NotFoundException("Note not found")
-        return NoteResponse.model_validate(note)
+        return NoteResponse.model_validate(note, context=with_usernames(self.db, [note]))
     
     def list_notes(
         self,
@@ -29,31 +29,14 @@ class NoteService:
     ) -> PaginatedResponse[NoteResponse]:
         items, total = self.repo.list_all(page, page_size, entity_type, entity_id)
         
-        responses = []
-        for item in items:
-            response = NoteResponse.model_validate(item)
-            if item.created_by_user:
-                response.created_by_username = item.created_by_user.username
-            responses.append(response)
-        
-        return PaginatedResponse(
-            items=responses,
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=ceil(total / page_size) if total > 0 else 0
-        )
+        return paginate(NoteResponse, items, total, page, page_size, context=with_usernames(self.db, items))
     
     def create_note(self, data: NoteCreate, user_id: int) -> NoteResponse:
         logger.info(f"Creating note for {data.entity_type}:{data.entity_id} (by user {user_id})")
         note = self.repo.create(data, user_id)
         logger.info(f"Note created successfully - ID: {note.id}")
         
-        response = NoteResponse.model_validate(note)
-        if note.created_by_user:
-            response.created_by_username = note.created_by_user.username
-        
-        return response
+        return NoteResponse.model_validate(note, context=with_usernames(self.db, [note]))
     
     def delete_note(self, note_id: int) -> None:
         note = self.repo.get_by_id(note_id)
@@ -1,42 +1,64 @@
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from app.repositories.order_repository import OrderRepository
 from app.repositories.order_item_repository import OrderItemRepository
-from app.repositories.payment_repository import PaymentRepository
 from app.repositories.stock_movement_repository import StockMovementRepository
 from app.repositories.product_repository import ProductRepository
 from app.repositories.order_delivery_repository import OrderDeliveryRepository
-from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse, DeliverOrderItemRequest
+from app.repositories.customer_repository import CustomerRepository
+from app.repositories.customer_metrics_repository import CustomerMetricsRepository
+from app.schemas.order import (
+    OrderCreate, OrderUpdate, OrderResponse, DeliverOrderItemRequest, DeliverOrderRequest,
+    OrderBatchCreated, OrderBatchError, OrderBatchResponse
+)
 from app.schemas.order_delivery import OrderDeliveryCreate, OrderDeliveryResponse
-from app.schemas.common import PaginatedResponse
+from app.db.session import SessionLocal
+from app.db.usernames import with_usernames
+from app.schemas.common import PaginatedResponse, describe_errors, paginate
 from app.core.exceptions import NotFoundException, BadRequestException
 from app.models import OrderStatus, PaymentStatus, DeliveryStatus, StockMovementType
 from datetime import datetime
-from math import ceil
 from loguru import logger
 
+MAX_ORDERS_PER_BATCH = 10000
+
+# Orders validated and written per transaction of a batch: one customer and
+# one product lookup, then one INSERT for the orders and one for their items.
+ORDER_BATCH_CHUNK_SIZE = 500
+
+
+def _order_total(data: OrderCreate) -> float:
+    return sum(item.quantity * item.unit_price for item in data.items)
+
+
+def reconcile_order_totals() -> dict:
+    """Maintenance job: verify the running totals of every order."""
+    db = SessionLocal()
+    try:
+        return OrderService(db).reconcile_totals()
+    finally:
+        db.close()
+
 
 class OrderService:
     def __init__(self, db: Session):
         self.db = db
         self.order_repo = OrderRepository(db)
         self.order_item_repo = OrderItemRepository(db)
-        self.payment_repo = PaymentRepository(db)
         self.stock_repo = StockMovementRepository(db)
         self.product_repo = ProductRepository(db)
         self.delivery_repo = OrderDeliveryRepository(db)
+        self.customer_repo = CustomerRepository(db)
+        self.metrics_repo = CustomerMetricsRepository(db)
     
     def get_order(self, order_id: int) -> OrderResponse:
         order = self.order_repo.get_by_id(order_id)
         if not order:
             raise NotFoundException("Order not found")
         
-        response = OrderResponse.model_validate(order)
-        # Populate username from relationship
-        if order.created_by_user:
-            response.created_by_username = order.created_by_user.username
-        
-        return response
+        return OrderResponse.model_validate(order, context=with_usernames(self.db, [order]))
     
     def list_orders(
         self,
@@ -49,33 +71,105 @@ class OrderService:
         payment_status: Optional[PaymentStatus] = None,
         delivery_status: Optional[DeliveryStatus] = None,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        min_outstanding: Optional[float] = None
     ) -> PaginatedResponse[OrderResponse]:
         items, total = self.order_repo.list_all(
             page, page_size, sort_by, order,
             customer_id, order_status, payment_status, delivery_status,
-            start_date, end_date
+            start_date, end_date, min_outstanding
         )
         
-        responses = []
-        for item in items:
-            response = OrderResponse.model_validate(item)
-            if item.created_by_user:
-                response.created_by_username = item.created_by_user.username
-            responses.append(response)
-        
-        return PaginatedResponse(
-            items=responses,
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=ceil(total / page_size) if total > 0 else 0
-        )
+        return paginate(OrderResponse, items, total, page, page_size, context=with_usernames(self.db, items))
     
     def create_order(self, data: OrderCreate, user_id: int) -> OrderResponse:
-        order = self.order_repo.create(data, user_id)
+        now = datetime.utcnow()
+        self.metrics_repo.add(data.customer_id, orders=1, revenue=_order_total(data), last_order_at=now)
+        order = self.order_repo.create(data, user_id, created_at=now)
         logger.info(f"Order {order.id} created by user {user_id}")
-        return OrderResponse.model_validate(order)
+        return OrderResponse.model_validate(order, context=with_usernames(self.db, [order]))
+    
+    def create_orders_batch(self, payloads: List[Any], user_id: int) -> OrderBatchResponse:
+        """
+        Create many orders from raw OrderCreate payloads.
+
+        Payloads are processed in chunks of ORDER_BATCH_CHUNK_SIZE, each
+        validated with set-based customer / product lookups and committed on
+        its own.  Invalid orders are skipped and reported by their 1-based
+        ``index``; a chunk that fails to write is reported as a whole and
+        does not affect the chunks before or after it.
+        """
+        if len(payloads) > MAX_ORDERS_PER_BATCH:
+            raise BadRequestException(f"At most {MAX_ORDERS_PER_BATCH} orders per batch")
+        
+        report = OrderBatchResponse()
+        for start in range(0, len(payloads), ORDER_BATCH_CHUNK_SIZE):
+            chunk = list(enumerate(payloads[start:start + ORDER_BATCH_CHUNK_SIZE], start=start + 1))
+            self._create_batch_chunk(chunk, report, user_id)
+        
+        logger.info(f"Order batch by user {user_id}: {report.created} created, {report.failed} failed")
+        return report
+    
+    def _create_batch_chunk(self, chunk: List[Tuple[int, Any]], report: OrderBatchResponse, user_id: int) -> None:
+        parsed: List[Tuple[int, OrderCreate]] = []
+        for index, raw in chunk:
+            try:
+                data = OrderCreate.model_validate(raw)
+            except ValidationError as exc:
+                customer_id = raw.get("customer_id") if isinstance(raw, dict) else None
+                self._batch_error(report, index, customer_id if isinstance(customer_id, int) else None,
+                                  describe_errors(exc))
+                continue
+            if not data.items:
+                self._batch_error(report, index, data.customer_id, "Order has no items")
+            elif any(item.quantity <= 0 for item in data.items):
+                self._batch_error(report, index, data.customer_id, "Item quantity must be positive")
+            elif any(item.unit_price < 0 for item in data.items):
+                self._batch_error(report, index, data.customer_id, "Item unit price must not be negative")
+            else:
+                parsed.append((index, data))
+        
+        customers = self.customer_repo.existing_ids(data.customer_id for _, data in parsed)
+        products = self.product_repo.existing_ids(item.product_id for _, data in parsed for item in data.items)
+        accepted: List[Tuple[int, OrderCreate]] = []
+        for index, data in parsed:
+            missing = sorted({item.product_id for item in data.items} - products)
+            if data.customer_id not in customers:
+                self._batch_error(report, index, data.customer_id, f"Customer {data.customer_id} not found")
+            elif missing:
+                self._batch_error(report, index, data.customer_id,
+                                  f"Product(s) not found: {', '.join(map(str, missing))}")
+            else:
+                accepted.append((index, data))
+        
+        now = datetime.utcnow()
+        metrics: Dict[int, dict] = {}
+        for _, data in accepted:
+            delta = metrics.setdefault(data.customer_id, {"order_count": 0, "revenue": 0.0, "last_order_at": now})
+            delta["order_count"] += 1
+            delta["revenue"] += _order_total(data)
+        
+        try:
+            order_ids = self.order_repo.bulk_create([data for _, data in accepted], user_id, created_at=now)
+            self.metrics_repo.add_many(metrics)
+            self.db.commit()
+        except SQLAlchemyError as exc:
+            self.db.rollback()
+            logger.error(f"Order batch chunk starting at index {chunk[0][0]} failed: {exc}")
+            for index, data in accepted:
+                self._batch_error(report, index, data.customer_id, "Could not save this chunk of orders")
+            return
+        
+        report.created += len(order_ids)
+        report.orders.extend(
+            OrderBatchCreated(index=index, order_id=order_id)
+            for (index, _), order_id in zip(accepted, order_ids)
+        )
+    
+    @staticmethod
+    def _batch_error(report: OrderBatchResponse, index: int, customer_id: Optional[int], message: str) -> None:
+        report.failed += 1
+        report.errors.append(OrderBatchError(index=index, customer_id=customer_id, error=message))
     
     def update_order(self, order_id: int, data: OrderUpdate, user_id: int) -> OrderResponse:
         order = self.order_repo.get_by_id(order_id)
@@ -85,8 +179,16 @@ class OrderService:
         if order.order_status == OrderStatus.CANCELED:
             raise BadRequestException("Cannot update a canceled order")
         
+        if data.customer_id is not None and data.customer_id != order.customer_id:
+            # The order's totals move to the new customer's metrics
+            self.metrics_repo.add(order.customer_id, orders=-1, revenue=-order.total_amount,
+                                  paid=-order.paid_amount)
+            self.metrics_repo.refresh_last_order(order.customer_id, exclude_order_id=order.id)
+            self.metrics_repo.add(data.customer_id, orders=1, revenue=order.total_amount,
+                                  paid=order.paid_amount, last_order_at=order.created_at)
+        
         order = self.order_repo.update(order, data, user_id)
-        return OrderResponse.model_validate(order)
+        return OrderResponse.model_validate(order, context=with_usernames(self.db, [order]))
     
     def cancel_order(self, order_id: int, user_id: int) -> OrderResponse:
         order = self.order_repo.get_by_id(order_id)
@@ -112,10 +214,13 @@ class OrderService:
                 )
         
         order.order_status = OrderStatus.CANCELED
+        self.metrics_repo.add(order.customer_id, orders=-1, revenue=-order.total_amount,
+                              paid=-order.paid_amount)
+        self.metrics_repo.refresh_last_order(order.customer_id, exclude_order_id=order.id)
         order = self.order_repo.update_status(order, user_id)
         logger.info(f"Order {order.id} canceled by user {user_id}")
         
-        return OrderResponse.model_validate(order)
+        return OrderResponse.model_validate(order, context=with_usernames(self.db, [order]))
     
     def delete_order(self, order_id: int, user_id: int) -> None:
         order = self.order_repo.get_by_id(order_id)
@@ -129,6 +234,14 @@ class OrderService:
                     item.delivered_quantity
                 )
         
+        live = order.order_status != OrderStatus.CANCELED
+        self.metrics_repo.add(
+            order.customer_id,
+            orders=-1 if live else 0,
+            revenue=-order.total_amount if live else 0.0,
+            paid=-order.paid_amount if live else 0.0
+        )
+        self.metrics_repo.refresh_last_order(order.customer_id, exclude_order_id=order.id)
         self.order_repo.delete(order)
         logger.info(f"Order {order_id} deleted by user {user_id}")
     
@@ -137,82 +250,148 @@ class OrderService:
         if not item:
             raise NotFoundException("Order item not found")
         
-        if item.order.order_status == OrderStatus.CANCELED:
-            raise BadRequestException("Cannot deliver items from a canceled order")
-        
-        if item.delivered_quantity + data.quantity > item.quantity:
-            raise BadRequestException("Delivery quantity exceeds ordered quantity")
-        
-        if data.quantity <= 0:
-            raise BadRequestException("Delivery quantity must be positive")
-        
-        item = self.order_item_repo.update_delivered_quantity(item, data.quantity, user_id)
+        order = self.order_repo.get_by_id(item.order_id)
+        order = self._deliver(order, {item.id: data.quantity}, None, user_id)
+        logger.info(f"Order item {item_id} delivered {data.quantity} units by user {user_id}")
+        return OrderResponse.model_validate(order, context=with_usernames(self.db, [order]))
+    
+    def deliver_order(self, order_id: int, data: DeliverOrderRequest, user_id: int) -> OrderResponse:
+        """
+        Deliver several items of an order, or everything still outstanding,
+        as one delivery: stock, movements, the delivery record and the order
+        status are written in a single transaction.
+        """
+        order = self.order_repo.get_by_id(order_id)
+        if not order:
+            raise NotFoundException("Order not found")
         
-        product = self.product_repo.get_by_id(item.product_id)
-        self.product_repo.update_stock(product, -data.quantity)
+        if order.order_status == OrderStatus.CANCELED:
+            raise BadRequestException("Cannot deliver items from a canceled order")
         
-        self.stock_repo.create(
-            product_id=item.product_id,
-            quantity=-data.quantity,
-            movement_type=StockMovementType.OUT,
-            user_id=user_id,
-            related_order_id=item.order_id,
-            reason=f"Delivered for Order #{item.order_id}"
+        if data.deliver_all:
+            quantities = {
+                item.id: item.quantity - item.delivered_quantity
+                for item in order.items
+                if item.delivered_quantity < item.quantity
+            }
+            if not quantities:
+                raise BadRequestException("Order has nothing left to deliver")
+        else:
+            quantities = {}
+            for line in data.items:
+                if line.item_id in quantities:
+                    raise BadRequestException(f"Order item {line.item_id} is listed more than once")
+                quantities[line.item_id] = line.quantity
+        
+        order = self._deliver(order, quantities, data.note, user_id)
+        logger.info(
+            f"Order {order_id}: {len(quantities)} item(s), {sum(quantities.values())} units delivered by user {user_id}"
         )
+        return OrderResponse.model_validate(order, context=with_usernames(self.db, [order]))
+    
+    def _deliver(self, order, quantities: Dict[int, int], note: Optional[str], user_id: int):
+        """Apply ``quantities`` (order item id → units) to ``order`` and commit once."""
+        if order.order_status == OrderStatus.CANCELED:
+            raise BadRequestException("Cannot deliver items from a canceled order")
         
-        # Record delivery history entry
-        delivery_data = OrderDeliveryCreate(
-            order_id=item.order_id,
-            note=f"Delivered {data.quantity}x {product.name if product else 'item'}"
+        items = {item.id: item for item in order.items}
+        for item_id, quantity in quantities.items():
+            item = items.get(item_id)
+            if item is None:
+                raise NotFoundException(f"Order item {item_id} not found in order {order.id}")
+            if item.delivered_quantity + quantity > item.quantity:
+                raise BadRequestException("Delivery quantity exceeds ordered quantity")
+            if quantity <= 0:
+                raise BadRequestException("Delivery quantity must be positive")
+        
+        stock_deltas: Dict[int, int] = {}
+        movements = []
+        for item_id, quantity in quantities.items():
+            item = items[item_id]
+            stock_deltas[item.product_id] = stock_deltas.get(item.product_id, 0) - quantity
+            movements.append((item.product_id, -quantity))
+        names = self.product_repo.names_by_id(stock_deltas)
+        
+        self.product_repo.bulk_update_stock(stock_deltas)
+        self.stock_repo.bulk_create(
+            movements, StockMovementType.OUT, user_id,
+            reason=f"Delivered for Order #{order.id}", related_order_id=order.id
         )
-        self.delivery_repo.create(delivery_data, user_id)
-        
-        self._update_order_delivery_status(item.order, user_id)
-        self._update_order_completion_status(item.order, user_id)
-        
-        logger.info(f"Order item {item_id} delivered {data.quantity} units by user {user_id}")
+        for item_id, quantity in quantities.items():
+            items[item_id].delivered_quantity += quantity
+            items[item_id].updated_by = user_id
+        self.order_repo.add_totals(order, delivered=sum(quantities.values()))
         
-        return OrderResponse.model_validate(item.order)
+        # Record delivery history entry
+        if note is None:
+            note = "Delivered " + ", ".join(
+                f"{quantity}x {names.get(items[item_id].product_id, 'item')}"
+                for item_id, quantity in quantities.items()
+            )
+        self.delivery_repo.add(OrderDeliveryCreate(order_id=order.id, note=note), user_id)
+        self.db.flush()
+        
+        self._set_delivery_status(order)
+        self._set_completion_status(order)
+        return self.order_repo.update_status(order, user_id)
     
-    def _update_order_delivery_status(self, order, user_id: int):
-        total_quantity = sum(item.quantity for item in order.items)
-        total_delivered = sum(item.delivered_quantity for item in order.items)
-        
-        if total_delivered == 0:
+    # Statuses are derived from the running totals on the order row
+    # (paid_amount, total_quantity, delivered_quantity), so none of these
+    # load payments or items.
+    def _set_delivery_status(self, order) -> None:
+        if order.delivered_quantity == 0:
             order.delivery_status = DeliveryStatus.NOT_DELIVERED
-        elif total_delivered < total_quantity:
+        elif order.delivered_quantity < order.total_quantity:
             order.delivery_status = DeliveryStatus.PARTIALLY_DELIVERED
         else:
             order.delivery_status = DeliveryStatus.DELIVERED
-        
-        self.order_repo.update_status(order, user_id)
     
-    def _update_order_payment_status(self, order, user_id: int):
-        payments = self.payment_repo.list_by_order(order.id)
-        total_paid = sum(payment.amount for payment in payments)
-        
-        if total_paid == 0:
+    def _set_payment_status(self, order) -> None:
+        # Running float sums can drift by fractions of a cent
+        paid = round(order.paid_amount, 2)
+        if paid <= 0:
             order.payment_status = PaymentStatus.UNPAID
-        elif total_paid < order.total_amount:
+        elif paid < round(order.total_amount, 2):
             order.payment_status = PaymentStatus.PARTIALLY_PAID
         else:
             order.payment_status = PaymentStatus.PAID
-        
-        self.order_repo.update_status(order, user_id)
     
-    def _update_order_completion_status(self, order, user_id: int):
+    def _set_completion_status(self, order) -> bool:
         if (order.payment_status == PaymentStatus.PAID and 
             order.delivery_status == DeliveryStatus.DELIVERED):
             order.order_status = OrderStatus.COMPLETED
-            self.order_repo.update_status(order, user_id)
             logger.info(f"Order {order.id} marked as completed")
+            return True
+        return False
     
     def recalculate_order_statuses(self, order_id: int, user_id: int):
         order = self.order_repo.get_by_id(order_id)
         if order:
-            self._update_order_delivery_status(order, user_id)
-            self._update_order_payment_status(order, user_id)
-            self._update_order_completion_status(order, user_id)
+            self._set_delivery_status(order)
+            self._set_payment_status(order)
+            self._set_completion_status(order)
+            self.order_repo.update_status(order, user_id)
+    
+    def reconcile_totals(self) -> dict:
+        """
+        Recompute every order's running totals from its payments and items,
+        repair the ones that drifted and re-derive their statuses.
+        """
+        mismatches = self.order_repo.total_mismatches()
+        if mismatches:
+            order_ids = [row[0] for row in mismatches]
+            logger.warning(
+                f"Order totals out of sync for {len(order_ids)} order(s), repairing: "
+                f"{order_ids[:20]}{' …' if len(order_ids) > 20 else ''}"
+            )
+            self.order_repo.set_totals(mismatches)
+            for order in self.order_repo.list_by_ids(order_ids):
+                if order.order_status != OrderStatus.CANCELED:
+                    self._set_delivery_status(order)
+                    self._set_payment_status(order)
+                    self._set_completion_status(order)
+            self.db.commit()
+        return {"repaired": len(mismatches)}
     
     # Order Delivery Management
     def list_order_deliveries(self, order_id: int) -> List[OrderDeliveryResponse]:
@@ -226,14 +405,8 @@ class OrderService:
         
         deliveries = self.delivery_repo.list_by_order(order_id)
         
-        responses = []
-        for delivery in deliveries:
-            response = OrderDeliveryResponse.model_validate(delivery)
-            if delivery.delivered_by_user:
-                response.delivered_by_username = delivery.delivered_by_user.username
-            responses.append(response)
-        
-        return responses
+        context = with_usernames(self.db, deliveries, "delivered_by_user_id")
+        return [OrderDeliveryResponse.model_validate(delivery, context=context) for delivery in deliveries]
     
     def create_order_delivery(self, data: OrderDeliveryCreate, user_id: int) -> OrderDeliveryResponse:
         """
@@ -250,8 +423,5 @@ class OrderService:
         delivery = self.delivery_repo.create(data, user_id)
         logger.info(f"Delivery recorded for order {data.order_id} by user {user_id}")
         
-        response = OrderDeliveryResponse.model_validate(delivery)
-        if delivery.delivered_by_user:
-            response.delivered_by_username = delivery.delivered_by_user.username
-        
-        return response
+        context = with_usernames(self.db, [delivery], "delivered_by_user_id")
+        return OrderDeliveryResponse.model_validate(delivery, context=context)
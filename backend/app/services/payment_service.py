@@ -2,11 +2,12 @@ from typing import Optional
 from sqlalchemy.orm import Session
 from app.repositories.payment_repository import PaymentRepository
 from app.repositories.order_repository import OrderRepository
+from app.repositories.customer_metrics_repository import CustomerMetricsRepository
 from app.schemas.payment import PaymentCreate, PaymentResponse
-from app.schemas.common import PaginatedResponse
+from app.db.usernames import with_usernames
+from app.schemas.common import PaginatedResponse, paginate
 from app.core.exceptions import NotFoundException, BadRequestException
 from app.models import OrderStatus
-from math import ceil
 from loguru import logger
 
 
@@ -15,18 +16,14 @@ class PaymentService:
         self.db = db
         self.payment_repo = PaymentRepository(db)
         self.order_repo = OrderRepository(db)
+        self.metrics_repo = CustomerMetricsRepository(db)
     
     def get_payment(self, payment_id: int) -> PaymentResponse:
         payment = self.payment_repo.get_by_id(payment_id)
         if not payment:
             raise NotFoundException("Payment not found")
         
-        response = PaymentResponse.model_validate(payment)
-        # Populate username - created_by is semantically "received_by"
-        if payment.received_by_user:
-            response.received_by_username = payment.received_by_user.username
-        
-        return response
+        return PaymentResponse.model_validate(payment, context=with_usernames(self.db, [payment]))
     
     def list_payments(
         self,
@@ -36,20 +33,7 @@ class PaymentService:
     ) -> PaginatedResponse[PaymentResponse]:
         items, total = self.payment_repo.list_all(page, page_size, order_id)
         
-        responses = []
-        for item in items:
-            response = PaymentResponse.model_validate(item)
-            if item.received_by_user:
-                response.received_by_username = item.received_by_user.username
-            responses.append(response)
-        
-        return PaginatedResponse(
-            items=responses,
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=ceil(total / page_size) if total > 0 else 0
-        )
+        return paginate(PaymentResponse, items, total, page, page_size, context=with_usernames(self.db, items))
     
     def create_payment(self, data: PaymentCreate, user_id: int) -> PaymentResponse:
         order = self.order_repo.get_by_id(data.order_id)
@@ -66,6 +50,8 @@ class PaymentService:
             raise BadRequestException("Payment amount must be positive")
         
         logger.info(f"Creating payment for order {data.order_id}: Amount={data.amount}, Method={data.method} (by user {user_id})")
+        self.order_repo.add_totals(order, paid=data.amount)
+        self.metrics_repo.add(order.customer_id, paid=data.amount)
         payment = self.payment_repo.create(data, user_id)
         
         from app.services.order_service import OrderService
@@ -74,7 +60,7 @@ class PaymentService:
         
         logger.info(f"Payment created successfully - ID: {payment.id}, Amount: {payment.amount}, Order: {order.id}")
         
-        return PaymentResponse.model_validate(payment)
+        return PaymentResponse.model_validate(payment, context=with_usernames(self.db, [payment]))
     
     def delete_payment(self, payment_id: int, user_id: int) -> None:
         payment = self.payment_repo.get_by_id(payment_id)
@@ -86,6 +72,9 @@ class PaymentService:
         payment_amount = payment.amount
         
         logger.info(f"Deleting payment - ID: {payment_id}, Amount: {payment_amount}, Order: {order_id} (by user {user_id})")
+        self.order_repo.add_totals(payment.order, paid=-payment_amount)
+        if payment.order.order_status != OrderStatus.CANCELED:
+            self.metrics_repo.add(payment.order.customer_id, paid=-payment_amount)
         self.payment_repo.delete(payment)
         
         from app.services.order_service import OrderService
@@ -1,30 +1,80 @@
-from typing import Optional
+import csv
+import io
+from datetime import datetime
+from typing import Any, BinaryIO, Iterable, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 from app.repositories.product_repository import ProductRepository
 from app.repositories.stock_movement_repository import StockMovementRepository
-from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
+from app.repositories.category_repository import CategoryRepository
+from app.repositories.product_stats_repository import ProductStatsRepository
+from app.schemas.product import (
+    ProductCreate, ProductUpdate, ProductResponse,
+    ProductBarcodeMatch, BarcodeLookupResponse,
+    ProductImportRow, ProductImportError, ProductImportResponse, ProductAtRisk
+)
 from app.schemas.stock_movement import StockMovementCreate, StockMovementResponse
-from app.schemas.common import PaginatedResponse
+from app.db.usernames import with_usernames
+from app.schemas.common import PaginatedResponse, describe_errors, paginate
+from app.core.config import settings
 from app.core.exceptions import NotFoundException, BadRequestException
+from app.db.session import SessionLocal
 from app.models import StockMovementType
-from math import ceil
 from loguru import logger
 
+MAX_BARCODES_PER_LOOKUP = 500
+
+# Rows validated per batch of the bulk import; each batch is one barcode
+# lookup plus one INSERT / UPDATE / stock movement executemany.
+IMPORT_BATCH_SIZE = 1000
+IMPORT_STOCK_REASON = "Initial stock (product import)"
+
+
+def iter_csv_rows(stream: BinaryIO) -> Iterator[Tuple[int, dict]]:
+    """
+    Rows of a UTF-8 CSV upload as ``(line number, fields)``, read lazily.
+    The header names the ProductImportRow fields; empty cells are omitted.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    for record in reader:
+        yield reader.line_num, {
+            key.strip(): value for key, value in record.items()
+            if key and value not in (None, "")
+        }
+
+
+def refresh_product_stats() -> dict:
+    """Maintenance job: fold new sales into the product velocity stats."""
+    db = SessionLocal()
+    try:
+        return ProductStatsRepository(db).refresh(datetime.utcnow().date(), settings.PRODUCT_REORDER_LEAD_DAYS)
+    finally:
+        db.close()
+
 
 class ProductService:
     def __init__(self, db: Session):
         self.db = db
         self.product_repo = ProductRepository(db)
         self.stock_repo = StockMovementRepository(db)
+        self.category_repo = CategoryRepository(db)
     
     def get_product(self, product_id: int) -> ProductResponse:
         product = self.product_repo.get_by_id(product_id)
         if not product:
             raise NotFoundException("Product not found")
-        response = ProductResponse.model_validate(product)
-        if product.created_by_user:
-            response.created_by_username = product.created_by_user.username
-        return response
+        return ProductResponse.model_validate(product, context=with_usernames(self.db, [product]))
+    
+    def list_at_risk(
+        self,
+        max_days_of_cover: Optional[float] = None,
+        page: int = 1,
+        page_size: int = 20
+    ) -> PaginatedResponse[ProductAtRisk]:
+        if max_days_of_cover is None:
+            max_days_of_cover = settings.PRODUCT_REORDER_LEAD_DAYS
+        rows, total = ProductStatsRepository(self.db).list_at_risk(max_days_of_cover, page, page_size)
+        return paginate(ProductAtRisk, [row._mapping for row in rows], total, page, page_size)
     
     def list_products(
         self,
@@ -36,27 +86,156 @@ class ProductService:
         category_id: Optional[int] = None
     ) -> PaginatedResponse[ProductResponse]:
         items, total = self.product_repo.list_all(page, page_size, sort_by, order, search, category_id)
-        responses = []
-        for item in items:
-            response = ProductResponse.model_validate(item)
-            if item.created_by_user:
-                response.created_by_username = item.created_by_user.username
-            responses.append(response)
-        return PaginatedResponse(
-            items=responses,
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=ceil(total / page_size) if total > 0 else 0
+        return paginate(ProductResponse, items, total, page, page_size, context=with_usernames(self.db, items))
+    
+    def lookup_barcodes(self, barcodes: list[str]) -> BarcodeLookupResponse:
+        # Scanners append whitespace/newlines; keep first-seen order, drop repeats
+        wanted = list(dict.fromkeys(b.strip() for b in barcodes if b and b.strip()))
+        if len(wanted) > MAX_BARCODES_PER_LOOKUP:
+            raise BadRequestException(f"At most {MAX_BARCODES_PER_LOOKUP} barcodes per lookup")
+        found = self.product_repo.get_by_barcodes(wanted)
+        items = [
+            ProductBarcodeMatch.model_validate(product)
+            for barcode in wanted
+            for product in found.get(barcode, [])
+        ]
+        return BarcodeLookupResponse(
+            items=items,
+            missing=[barcode for barcode in wanted if barcode not in found]
         )
     
+    def get_product_by_barcode(self, barcode: str) -> ProductBarcodeMatch:
+        result = self.lookup_barcodes([barcode])
+        if not result.items:
+            raise NotFoundException("Product not found")
+        return result.items[0]
+    
     def create_product(self, data: ProductCreate, user_id: int) -> ProductResponse:
+        # Validate category exists
+        if not self.category_repo.get_by_id(data.category_id):
+            raise NotFoundException("Category not found")
+        
         product = self.product_repo.create(data, user_id)
         logger.info(f"Product {product.id} created by user {user_id}")
-        response = ProductResponse.model_validate(product)
-        if product.created_by_user:
-            response.created_by_username = product.created_by_user.username
-        return response
+        return ProductResponse.model_validate(product, context=with_usernames(self.db, [product]))
+    
+    def import_products(
+        self,
+        rows: Iterable[Tuple[int, Any]],
+        user_id: int,
+        seed_stock: bool = True
+    ) -> ProductImportResponse:
+        """
+        Create or update products from ``(row number, fields)`` pairs.
+
+        Rows are validated one at a time and written in batches: a barcode
+        that matches an existing product updates it, anything else is
+        inserted.  With ``seed_stock`` a new product starts at its
+        ``initial_stock`` with a matching IN movement.  Invalid rows are
+        skipped and reported; the rest is committed in one transaction.
+        """
+        report = ProductImportResponse()
+        category_ids, category_names = self.category_repo.name_index()
+        seen_barcodes = set()
+        batch: List[Tuple[int, ProductImportRow, int]] = []
+        
+        try:
+            for row_number, raw in rows:
+                try:
+                    row = ProductImportRow.model_validate(raw)
+                except ValidationError as exc:
+                    barcode = raw.get("barcode") if isinstance(raw, dict) else None
+                    self._import_error(report, row_number, barcode, describe_errors(exc))
+                    continue
+                
+                if row.category_id is not None:
+                    category_id = row.category_id
+                    if category_id not in category_ids:
+                        self._import_error(report, row_number, row.barcode, f"Category {category_id} not found")
+                        continue
+                else:
+                    if row.category.lower() not in category_names:
+                        self._import_error(report, row_number, row.barcode, f"Category '{row.category}' not found")
+                        continue
+                    category_id = category_names[row.category.lower()]
+                    if category_id is None:
+                        self._import_error(
+                            report, row_number, row.barcode,
+                            f"Category name '{row.category}' is ambiguous, use category_id"
+                        )
+                        continue
+                
+                if row.barcode:
+                    if row.barcode in seen_barcodes:
+                        self._import_error(report, row_number, row.barcode, "Duplicate barcode in import")
+                        continue
+                    seen_barcodes.add(row.barcode)
+                
+                batch.append((row_number, row, category_id))
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    self._import_batch(batch, report, user_id, seed_stock)
+                    batch = []
+        except (UnicodeDecodeError, csv.Error) as exc:
+            self.db.rollback()
+            raise BadRequestException(f"Unreadable import file: {exc}")
+        
+        if batch:
+            self._import_batch(batch, report, user_id, seed_stock)
+        self.db.commit()
+        
+        logger.info(
+            f"Product import by user {user_id}: {report.created} created, {report.updated} updated, "
+            f"{report.failed} failed, {report.stock_movements} stock movements"
+        )
+        return report
+    
+    def _import_batch(
+        self,
+        batch: List[Tuple[int, ProductImportRow, int]],
+        report: ProductImportResponse,
+        user_id: int,
+        seed_stock: bool
+    ) -> None:
+        existing = self.product_repo.ids_by_barcode({row.barcode for _, row, _ in batch if row.barcode})
+        inserts, updates = [], []
+        for row_number, row, category_id in batch:
+            matches = existing.get(row.barcode, []) if row.barcode else []
+            if len(matches) > 1:
+                self._import_error(report, row_number, row.barcode, f"Barcode matches {len(matches)} products")
+                continue
+            values = {
+                "name": row.name,
+                "description": row.description,
+                "category_id": category_id
+            }
+            if matches:
+                list_price = row.list_price if "list_price" in row.model_fields_set else None
+                updates.append({**values, "id": matches[0], "list_price": list_price})
+            else:
+                stock = row.initial_stock if seed_stock else 0
+                inserts.append({**values, "barcode": row.barcode, "list_price": row.list_price, "current_stock": stock})
+        
+        product_ids = self.product_repo.bulk_insert(inserts, user_id) if inserts else []
+        self.product_repo.bulk_update(updates, user_id)
+        movements = [
+            (product_id, values["current_stock"])
+            for product_id, values in zip(product_ids, inserts)
+            if values["current_stock"] > 0
+        ]
+        self.stock_repo.bulk_create(movements, StockMovementType.IN, user_id, reason=IMPORT_STOCK_REASON)
+        
+        report.created += len(product_ids)
+        report.updated += len(updates)
+        report.stock_movements += len(movements)
+    
+    @staticmethod
+    def _import_error(report: ProductImportResponse, row: int, barcode: Any, message: str) -> None:
+        report.failed += 1
+        report.errors.append(ProductImportError(
+            row=row,
+            barcode=str(barcode) if barcode is not None else None,
+            error=message
+        ))
     
     def update_product(self, product_id: int, data: ProductUpdate, user_id: int) -> ProductResponse:
         product = self.product_repo.get_by_id(product_id)
@@ -64,13 +243,14 @@ class ProductService:
             logger.warning(f"Update failed - Product not found: ID {product_id}")
             raise NotFoundException("Product not found")
         
+        # Validate category if being changed
+        if data.category_id is not None and not self.category_repo.get_by_id(data.category_id):
+            raise NotFoundException("Category not found")
+        
         logger.info(f"Updating product ID: {product_id} (by user ID: {user_id})")
         product = self.product_repo.update(product, data, user_id)
         logger.info(f"Product updated successfully - ID: {product.id}")
-        response = ProductResponse.model_validate(product)
-        if product.created_by_user:
-            response.created_by_username = product.created_by_user.username
-        return response
+        return ProductResponse.model_validate(product, context=with_usernames(self.db, [product]))
     
     def delete_product(self, product_id: int) -> None:
         product = self.product_repo.get_by_id(product_id)
@@ -102,4 +282,4 @@ class ProductService:
         
         logger.info(f"Stock adjusted for product {data.product_id} ('{product.name}'): {old_stock} -> {product.current_stock} (change: {data.quantity:+d}) by user {user_id}")
         
-        return StockMovementResponse.model_validate(movement)
+        return StockMovementResponse.model_validate(movement, context=with_usernames(self.db, [movement]))
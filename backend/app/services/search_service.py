@@ -0,0 +1,47 @@
+import re
+from sqlalchemy.orm import Session
+from app.repositories.search_repository import SearchRepository
+from app.schemas.search import SearchHit, SearchResponse
+from app.models import EntityType
+
+# "123", "#123" → order lookup by id
+_ORDER_ID_RE = re.compile(r"^#?(\d{1,9})$")
+
+NOTE_SNIPPET_LENGTH = 120
+
+
+class SearchService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = SearchRepository(db)
+
+    def search(self, q: str, limit: int = 10) -> SearchResponse:
+        term = q.strip()
+        hits: list[SearchHit] = []
+        if not term:
+            return SearchResponse(query=q, hits=hits)
+
+        # An order number is an exact match and always ranks first
+        order_match = _ORDER_ID_RE.match(term)
+        if order_match:
+            row = self.repo.get_order_with_customer_name(int(order_match.group(1)))
+            if row:
+                hits.append(SearchHit(type="order", id=row[0], title=f"#{row[0]}", subtitle=row[1]))
+
+        for doc in self.repo.search_documents(term, limit - len(hits)):
+            if doc["kind"] == "note":
+                text = doc["title"]
+                if len(text) > NOTE_SNIPPET_LENGTH:
+                    text = text[:NOTE_SNIPPET_LENGTH].rstrip() + "…"
+                parent = doc["entity_type"]
+                hits.append(SearchHit(
+                    type="note", id=doc["id"], title=text,
+                    parent_type=EntityType[parent].value if parent else None,
+                    parent_id=doc["entity_id"],
+                ))
+            else:
+                hits.append(SearchHit(
+                    type=doc["kind"], id=doc["id"], title=doc["title"],
+                    subtitle=doc["body"].strip() or None,
+                ))
+        return SearchResponse(query=q, hits=hits)
@@ -3,10 +3,10 @@ from sqlalchemy.orm import Session
 from app.repositories.stock_movement_repository import StockMovementRepository
 from app.repositories.product_repository import ProductRepository
 from app.schemas.stock_movement import StockMovementCreate, StockMovementResponse
-from app.schemas.common import PaginatedResponse
+from app.db.usernames import with_usernames
+from app.schemas.common import PaginatedResponse, paginate
 from app.core.exceptions import NotFoundException, BadRequestException
 from app.models import StockMovementType
-from math import ceil
 from loguru import logger
 
 
@@ -24,20 +24,7 @@ class StockMovementService:
     ) -> PaginatedResponse[StockMovementResponse]:
         items, total = self.stock_repo.list_all(page, page_size, product_id)
         
-        responses = []
-        for item in items:
-            response = StockMovementResponse.model_validate(item)
-            if item.performed_by_user:
-                response.performed_by_username = item.performed_by_user.username
-            responses.append(response)
-        
-        return PaginatedResponse(
-            items=responses,
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=ceil(total / page_size) if total > 0 else 0
-        )
+        return paginate(StockMovementResponse, items, total, page, page_size, context=with_usernames(self.db, items))
     
     def create_stock_movement(self, data: StockMovementCreate, user_id: int) -> StockMovementResponse:
         """
@@ -95,8 +82,4 @@ class StockMovementService:
             reason=data.reason
         )
         
-        response = StockMovementResponse.model_validate(movement)
-        if movement.performed_by_user:
-            response.performed_by_username = movement.performed_by_user.username
-        
-        return response
+        return StockMovementResponse.model_validate(movement, context=with_usernames(self.db, [movement]))
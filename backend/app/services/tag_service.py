@@ -2,9 +2,8 @@ from typing import Optional
 from sqlalchemy.orm import Session
 from app.repositories.tag_repository import TagRepository
 from app.schemas.tag import TagCreate, TagResponse, TagLinkRequest, TagUnlinkRequest
-from app.schemas.common import PaginatedResponse
+from app.schemas.common import PaginatedResponse, paginate
 from app.core.exceptions import NotFoundException, BadRequestException
-from math import ceil
 from loguru import logger
 
 
@@ -25,13 +24,7 @@ class TagService:
         page_size: int = 20
     ) -> PaginatedResponse[TagResponse]:
         items, total = self.repo.list_all(page, page_size)
-        return PaginatedResponse(
-            items=[TagResponse.model_validate(item) for item in items],
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=ceil(total / page_size) if total > 0 else 0
-        )
+        return paginate(TagResponse, items, total, page, page_size)
     
     def create_tag(self, data: TagCreate, user_id: int) -> TagResponse:
         existing = self.repo.get_by_name(data.name)
@@ -5,10 +5,10 @@ from app.schemas.user import (
     UserCreate, UserUpdate, UserProfileUpdate, UserResponse,
     SecurityQuestionSetup, SecurityQuestionUpdate, ChangePasswordRequest
 )
-from app.schemas.common import PaginatedResponse
+from app.db.usernames import with_usernames
+from app.schemas.common import PaginatedResponse, paginate
 from app.core.security import hash_password, verify_password
 from app.core.exceptions import NotFoundException, BadRequestException, ForbiddenException
-from math import ceil
 from loguru import logger
 
 
@@ -17,10 +17,10 @@ class UserService:
         self.db = db
         self.repo = UserRepository(db)
     
-    def _build_response(self, user) -> UserResponse:
-        response = UserResponse.model_validate(user)
-        if user.created_by_user:
-            response.created_by_username = user.created_by_user.username
+    def _build_response(self, user, context: Optional[dict] = None) -> UserResponse:
+        if context is None:
+            context = with_usernames(self.db, [user])
+        response = UserResponse.model_validate(user, context=context)
         response.has_security_questions = bool(
             user.security_question_1 and user.security_question_2
         )
@@ -42,14 +42,9 @@ class UserService:
         search: Optional[str] = None
     ) -> PaginatedResponse[UserResponse]:
         items, total = self.repo.list_all(page, page_size, search)
-        responses = [self._build_response(item) for item in items]
-        return PaginatedResponse(
-            items=responses,
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=ceil(total / page_size) if total > 0 else 0
-        )
+        context = with_usernames(self.db, items)
+        responses = [self._build_response(item, context) for item in items]
+        return paginate(UserResponse, responses, total, page, page_size)
     
     def create_user(self, data: UserCreate, created_by_user_id: int) -> UserResponse:
         # Check if username already exists
@@ -0,0 +1,36 @@
+"""
+INACORTS — Customer Metrics Rebuild
+
+Recomputes the customer_metrics rollup (order count, revenue, paid, last
+order date per customer) from orders and payments.  The table is kept in step
+by every order and payment write; run this after bulk-loading data outside
+the API, or if the numbers are ever suspected to have drifted.
+
+Usage
+─────
+  cd backend
+  python -m app.utils.rebuild_customer_metrics
+"""
+
+import time
+from app.db.session import SessionLocal
+from app.db.base import import_models
+from app.repositories.customer_metrics_repository import CustomerMetricsRepository
+from loguru import logger
+
+import_models()
+
+
+def rebuild_customer_metrics() -> int:
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        rows = CustomerMetricsRepository(db).rebuild()
+        logger.info(f"✓ Customer metrics rebuilt for {rows:,} customers in {time.perf_counter() - started:.2f}s")
+        return rows
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_customer_metrics()
@@ -14,6 +14,7 @@ Usage
   cd backend
   python -m app.utils.sample_data_generator          # generates data
   python -m app.utils.sample_data_generator --reset   # reset DB first, then generate
+  python -m app.utils.sample_data_generator --scale --factor 0.1   # large dataset (scale_data_generator)
 """
 
 import sys
@@ -27,14 +28,17 @@ from loguru import logger
 
 from app.db.session import SessionLocal
 from app.db.base import import_models
+from app.db.table_versions import VERSIONED_TABLES, bump_table_versions
 from app.models import (
-    User, Customer, Contact, Category, Product, StockMovement,
+    User, Customer, CustomerMetrics, Contact, Category, Product, ProductSalesDay,
+    ProductStats, StockMovement,
     Order, OrderItem, OrderDelivery, Payment, Expense, ExpenseCategory,
     ExpenseHistory, Note, Tag, TagLink,
     customer_contact_association,
     OrderStatus, PaymentStatus, DeliveryStatus,
     StockMovementType, PaymentMethod, EntityType, TagEntityType,
 )
+from app.repositories.customer_metrics_repository import CustomerMetricsRepository
 
 # ── reproducible randomness ──────────────────────────────────────────
 SEED = 42
@@ -67,8 +71,11 @@ def clear_data(db: Session) -> None:
     db.query(Order).delete()
     db.execute(customer_contact_association.delete())
     db.query(Contact).delete()
+    db.query(ProductSalesDay).delete()
+    db.query(ProductStats).delete()
     db.query(Product).delete()
     db.query(Category).delete()
+    db.query(CustomerMetrics).delete()
     db.query(Customer).delete()
     db.commit()
     logger.info("✓ Data cleared")
@@ -266,6 +273,7 @@ def create_orders(db: Session, customers: List[Customer],
             items.append(oi)
             total += qty * up
         order.total_amount = round(total, 2)
+        order.total_quantity = sum(it.quantity for it in items)
         db.flush()
 
         # ── delivery & payment based on target ──
@@ -305,6 +313,7 @@ def _fully_deliver(db: Session, order: Order, items: List[OrderItem], uid: int):
         prod = db.query(Product).get(it.product_id)
         if prod:
             prod.current_stock -= it.quantity
+    order.delivered_quantity = order.total_quantity
     # delivery record
     od = OrderDelivery(
         order_id=order.id,
@@ -332,6 +341,7 @@ def _partially_deliver(db: Session, order: Order, items: List[OrderItem], uid: i
     prod = db.query(Product).get(it.product_id)
     if prod:
         prod.current_stock -= it.quantity
+    order.delivered_quantity = it.quantity
     od = OrderDelivery(
         order_id=order.id,
         delivered_by_user_id=uid,
@@ -350,6 +360,7 @@ def _fully_pay(db: Session, order: Order, uid: int):
         created_at=order.created_at + timedelta(days=random.randint(1, 5)),
     )
     db.add(p)
+    order.paid_amount = order.total_amount
     order.payment_status = PaymentStatus.PAID
 
 
@@ -362,6 +373,7 @@ def _partially_pay(db: Session, order: Order, uid: int):
         created_at=order.created_at + timedelta(days=2),
     )
     db.add(p)
+    order.paid_amount = amount
     order.payment_status = PaymentStatus.PARTIALLY_PAID
 
 
@@ -503,11 +515,37 @@ def print_summary(db: Session) -> None:
 #  MAIN
 # =====================================================================
 
+def generate_sample_data(db: Session) -> None:
+    """Clear existing business data and generate the full sample dataset."""
+    random.seed(SEED)
+    uid = _uid(db)
+    clear_data(db)
+
+    customers = create_customers(db, uid)
+    create_contacts(db, customers, uid)
+    cats      = create_categories(db, uid)
+    products  = create_products(db, cats, uid)
+    create_initial_stock(db, products, uid)
+    orders    = create_orders(db, customers, products, uid)
+    create_expenses(db, uid)
+    create_notes(db, customers, orders, products, uid)
+    create_tags(db, customers, products, uid)
+    CustomerMetricsRepository(db).rebuild()
+    bump_table_versions(db, *VERSIONED_TABLES)
+    db.commit()
+
+
 def main() -> None:
     logger.info("=" * 50)
     logger.info("  INACORTS — Sample Data Generator")
     logger.info("=" * 50)
 
+    if "--scale" in sys.argv:
+        # Production-sized dataset via bulk inserts (see scale_data_generator)
+        from app.utils.scale_data_generator import main as scale_main
+        scale_main([arg for arg in sys.argv[1:] if arg != "--scale"])
+        return
+
     do_reset = "--reset" in sys.argv
     if do_reset:
         from app.utils.reset_db import reset_database
@@ -515,18 +553,7 @@ def main() -> None:
 
     db = SessionLocal()
     try:
-        uid = _uid(db)
-        clear_data(db)
-
-        customers = create_customers(db, uid)
-        create_contacts(db, customers, uid)
-        cats      = create_categories(db, uid)
-        products  = create_products(db, cats, uid)
-        create_initial_stock(db, products, uid)
-        orders    = create_orders(db, customers, products, uid)
-        create_expenses(db, uid)
-        create_notes(db, customers, orders, products, uid)
-        create_tags(db, customers, products, uid)
+        generate_sample_data(db)
 
         print_summary(db)
         logger.info("")
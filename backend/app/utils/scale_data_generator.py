@@ -0,0 +1,474 @@
+"""
+INACORTS — Scale Data Generator
+
+Generates a production-sized dataset for benchmarks and index work.  Unlike
+the sample generator (a handful of hand-written rows built one ORM object at
+a time), rows here are produced from seeded randomness and written with bulk
+Core inserts (executemany) in batches, with primary keys assigned up front so
+no row has to be read back.
+
+Volumes at --factor 1.0 (see FULL_SCALE):
+  100k customers, 125k contacts, 50k products in 200 categories,
+  2M orders with ≈5M items, deliveries and payments,
+  5M stock movements, 50k expenses.
+
+Order statuses follow the sample dataset's mix (≈45% completed, 15% partially
+delivered / paid, 30% open, 10% canceled); customer and product choice is
+skewed so a minority of rows is "hot", as in real traffic.  The same seed
+always produces the same data.
+
+Usage
+─────
+  cd backend
+  python -m app.utils.scale_data_generator                   # full scale
+  python -m app.utils.scale_data_generator --factor 0.01     # 1% (≈20k orders)
+  python -m app.utils.scale_data_generator --reset --factor 0.1
+  python -m app.utils.sample_data_generator --scale --factor 0.1   # same thing
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import bindparam, insert, text
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.db.slow_query_log import suppress_slow_query_log
+from app.db.table_versions import VERSIONED_TABLES, bump_table_versions
+from app.models import (
+    Customer, Contact, Category, Product, StockMovement,
+    Order, OrderItem, OrderDelivery, Payment, Expense, ExpenseCategory,
+    customer_contact_association,
+    OrderStatus, PaymentStatus, DeliveryStatus,
+    StockMovementType, PaymentMethod,
+)
+from app.repositories.customer_metrics_repository import CustomerMetricsRepository
+from app.utils.sample_data_generator import SEED, clear_data, print_summary, _uid
+
+# Row counts at factor 1.0 (stock movements is a total: delivery OUTs + restock INs)
+FULL_SCALE: Dict[str, int] = {
+    "customers": 100_000,
+    "contacts": 125_000,
+    "categories": 200,
+    "products": 50_000,
+    "orders": 2_000_000,
+    "stock_movements": 5_000_000,
+    "expenses": 50_000,
+}
+
+DEFAULT_BATCH_SIZE = 10_000
+HISTORY_DAYS = 730
+
+# ── vocabulary ───────────────────────────────────────────────────────
+_FAMILY = ["Yılmaz", "Demir", "Kaya", "Çelik", "Şahin", "Öztürk", "Arslan", "Doğan",
+           "Kılıç", "Aydın", "Koç", "Kurt", "Özdemir", "Yıldız", "Aslan", "Polat",
+           "Erdoğan", "Güneş", "Akın", "Karaca"]
+_REGION = ["Akdeniz", "Karadeniz", "Ege", "Marmara", "Başkent", "Doğu", "Anadolu", "Trakya"]
+_TRADE = ["Ticaret", "Yapı Malzemeleri", "Endüstri", "Makina San.", "Parça", "Tedarik",
+          "Hırdavat", "Teknik Servis", "Elektrik", "İnşaat", "Tesisat", "Otomasyon"]
+_SUFFIX = ["A.Ş.", "Ltd. Şti.", "Ltd.", "San. Tic.", ""]
+_CITY = ["İstanbul", "Ankara", "İzmir", "Bursa", "Kocaeli", "Antalya", "Trabzon",
+         "Erzurum", "Konya", "Adana", "Kayseri", "Eskişehir"]
+_FIRST = ["Ahmet", "Fatma", "Mehmet", "Ayşe", "Hasan", "Zeynep", "Ali", "Elif",
+          "Mustafa", "Selin", "Emre", "Deniz", "Burak", "Ece", "Murat", "Gül"]
+_PRODUCT = [
+    ("Civata", "DIN 931, galvaniz", 45.0), ("Somun", "DIN 934, galvaniz", 22.0),
+    ("Pul", "DIN 125, galvaniz", 9.5), ("Anahtar Takımı", "krom vanadyum", 320.0),
+    ("Kablo NYM", "TSE belgeli", 780.0), ("Priz Kasası", "sıvaaltı", 4.5),
+    ("LED Panel", "gün ışığı", 185.0), ("Sigorta Otomatiği", "B tipi", 38.0),
+    ("PPR Boru", "PN20", 32.0), ("Küresel Vana", "pirinç", 28.0),
+    ("Silikon", "genel amaçlı", 35.0), ("Astar Boya", "su bazlı", 95.0),
+    ("Dübel", "naylon", 6.0), ("Matkap Ucu", "HSS", 54.0), ("Kelepçe", "paslanmaz", 12.0),
+]
+_SIZE = ["M6", "M8", "M10", "M12", "M16", "1/2\"", "3/4\"", "1\"", "20mm", "25mm",
+         "32mm", "2.5L", "5L", "10m", "100m", "16A", "25A", "40W", "60W"]
+_CATEGORY = ["Hırdavat", "Elektrik Malz.", "Boru & Vana", "Boya & Kimyasal", "El Aletleri",
+             "Bağlantı Elemanları", "Aydınlatma", "Tesisat", "İş Güvenliği", "Yapıştırıcı"]
+_EXPENSE_TEXT = ["yakıt", "toplu alım", "kargo gönderimi", "ofis malzemesi", "müşteri ziyareti",
+                 "hediye paketi", "stok yenileme", "sevkiyat", "temizlik", "bakım onarım"]
+
+
+class _BatchWriter:
+    """Buffers rows per table and writes them with executemany in batches.
+
+    All buffers are flushed together, in registration order, so parents
+    (orders) always reach the database before their children (items,
+    payments, ...) — PostgreSQL checks foreign keys per statement.
+    """
+
+    def __init__(self, db: Session, batch_size: int) -> None:
+        self.db = db
+        self.batch_size = batch_size
+        self.buffers: Dict[object, List[dict]] = {}
+        self.written: Dict[str, int] = {}
+
+    def register(self, *tables) -> None:
+        for table in tables:
+            self.buffers.setdefault(table, [])
+
+    def add(self, table, row: dict) -> None:
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        for table, rows in self.buffers.items():
+            if rows:
+                self.db.execute(insert(table), rows)
+                self.written[table.name] = self.written.get(table.name, 0) + len(rows)
+                rows.clear()
+        self.db.commit()
+
+
+def _scaled(factor: float) -> Dict[str, int]:
+    return {name: max(1, int(count * factor)) for name, count in FULL_SCALE.items()}
+
+
+def _skewed(rng: random.Random, n: int, power: float) -> int:
+    """0-based index in [0, n) biased towards low values (hot rows)."""
+    return min(n - 1, int(n * rng.random() ** power))
+
+
+def _prepare_connection(db: Session) -> None:
+    if db.get_bind().dialect.name == "sqlite":
+        # A throwaway dataset does not need per-commit fsync
+        db.execute(text("PRAGMA synchronous = OFF"))
+
+
+def _reset_sequences(db: Session, tables: List[str]) -> None:
+    """Explicit ids bypass PostgreSQL sequences — move them past the new rows."""
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for table in tables:
+        db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+        ))
+    db.commit()
+
+
+# =====================================================================
+#  ENTITY GENERATORS
+# =====================================================================
+
+def _customers_and_contacts(w: _BatchWriter, rng: random.Random, counts: Dict[str, int],
+                            uid: int, now: datetime) -> None:
+    customers_t, contacts_t = Customer.__table__, Contact.__table__
+    n_customers, n_contacts = counts["customers"], counts["contacts"]
+    for cid in range(1, n_customers + 1):
+        family, trade = rng.choice(_FAMILY), rng.choice(_TRADE)
+        name = f"{family} {rng.choice(_REGION)} {trade} {rng.choice(_SUFFIX)}".strip()
+        slug = f"{family.lower()}{cid}"
+        created = now - timedelta(days=HISTORY_DAYS + 30 - cid * HISTORY_DAYS // n_customers,
+                                  minutes=rng.randint(0, 1440))
+        w.add(customers_t, {
+            "id": cid, "name": name,
+            "address": f"{rng.choice(['Sanayi', 'Atatürk', 'Cumhuriyet', 'OSB'])} Mah. "
+                       f"No:{rng.randint(1, 250)}, {rng.choice(_CITY)}",
+            "phone": f"+90 {rng.randint(212, 488)} 555 {rng.randint(0, 9999):04d}",
+            "email": f"info@{slug}.com.tr" if rng.random() < 0.8 else None,
+            "website": f"www.{slug}.com.tr" if rng.random() < 0.4 else None,
+            "created_at": created, "created_by": uid, "updated_at": created, "updated_by": uid,
+        })
+    w.flush()
+
+    for ctid in range(1, n_contacts + 1):
+        first, last = rng.choice(_FIRST), rng.choice(_FAMILY)
+        w.add(contacts_t, {
+            "id": ctid, "name": f"{first} {last}",
+            "phone": f"+90 53{rng.randint(0, 9)} {rng.randint(100, 999)} {rng.randint(0, 9999):04d}",
+            "email": f"{first.lower()}.{ctid}@example.com" if rng.random() < 0.85 else None,
+            "website": None,
+            "created_at": now, "created_by": uid, "updated_at": now, "updated_by": uid,
+        })
+        # Every contact belongs to one customer; some are shared with a second one
+        first_customer = rng.randint(1, n_customers)
+        w.add(customer_contact_association, {"customer_id": first_customer, "contact_id": ctid})
+        if rng.random() < 0.1:
+            second = rng.randint(1, n_customers)
+            if second != first_customer:
+                w.add(customer_contact_association, {"customer_id": second, "contact_id": ctid})
+    w.flush()
+    logger.info(f"✓ {n_customers:,} customers, {n_contacts:,} contacts")
+
+
+def _catalog(w: _BatchWriter, rng: random.Random, counts: Dict[str, int],
+             uid: int, now: datetime) -> List[float]:
+    """Write categories and products; return list prices indexed by product id - 1."""
+    categories_t, products_t = Category.__table__, Product.__table__
+    n_categories, n_products = counts["categories"], counts["products"]
+    for cat_id in range(1, n_categories + 1):
+        base = _CATEGORY[(cat_id - 1) % len(_CATEGORY)]
+        name = base if cat_id <= len(_CATEGORY) else f"{base} {cat_id // len(_CATEGORY) + 1}"
+        w.add(categories_t, {
+            "id": cat_id, "name": name,
+            "created_at": now, "created_by": uid, "updated_at": now, "updated_by": uid,
+        })
+    w.flush()
+
+    prices: List[float] = []
+    for pid in range(1, n_products + 1):
+        base, desc, base_price = rng.choice(_PRODUCT)
+        price = round(base_price * rng.uniform(0.5, 3.0), 2)
+        prices.append(price)
+        w.add(products_t, {
+            "id": pid, "name": f"{rng.choice(_SIZE)} {base} {pid}", "description": desc,
+            "barcode": f"869{rng.randint(1000000000, 9999999999)}" if rng.random() > 0.3 else None,
+            "category_id": rng.randint(1, n_categories), "list_price": price,
+            "current_stock": 0,  # set once all movements are known
+            "created_at": now, "created_by": uid, "updated_at": now, "updated_by": uid,
+        })
+    w.flush()
+    logger.info(f"✓ {n_categories:,} categories, {n_products:,} products")
+    return prices
+
+
+def _orders(w: _BatchWriter, rng: random.Random, counts: Dict[str, int], prices: List[float],
+            uid: int, now: datetime) -> List[int]:
+    """Write orders with items, deliveries, payments and OUT movements.
+
+    Returns the delivered quantity per product (index = product id - 1).
+    """
+    orders_t, items_t = Order.__table__, OrderItem.__table__
+    deliveries_t, payments_t, movements_t = OrderDelivery.__table__, Payment.__table__, StockMovement.__table__
+
+    n_orders, n_customers, n_products = counts["orders"], counts["customers"], len(prices)
+    delivered_out = [0] * n_products
+    item_id = delivery_id = payment_id = 0
+    movement_id = 0
+    start = now - timedelta(days=HISTORY_DAYS)
+    span_minutes = HISTORY_DAYS * 24 * 60
+
+    for oid in range(1, n_orders + 1):
+        created = start + timedelta(minutes=(oid * span_minutes) // n_orders + rng.randint(0, 59))
+        roll = rng.random()
+        target = ("completed" if roll < 0.45 else "partial" if roll < 0.60
+                  else "open" if roll < 0.90 else "canceled")
+
+        items = []
+        seen = set()
+        for _ in range(rng.randint(1, 4)):
+            pidx = _skewed(rng, n_products, 2.0)
+            if pidx in seen:
+                continue
+            seen.add(pidx)
+            price = prices[pidx]
+            qty = rng.randint(1, 20) if price < 100 else rng.randint(1, 5)
+            items.append((pidx, qty, round(price * rng.uniform(0.90, 1.05), 2)))
+        total = round(sum(q * up for _, q, up in items), 2)
+
+        finished = created + timedelta(days=rng.randint(1, 5))
+        if target == "completed":
+            status, pay, dlv = OrderStatus.COMPLETED, PaymentStatus.PAID, DeliveryStatus.DELIVERED
+        elif target == "partial":
+            status, pay, dlv = OrderStatus.OPEN, PaymentStatus.PARTIALLY_PAID, DeliveryStatus.PARTIALLY_DELIVERED
+        elif target == "canceled":
+            status, pay, dlv = OrderStatus.CANCELED, PaymentStatus.UNPAID, DeliveryStatus.NOT_DELIVERED
+        else:
+            status, pay, dlv = OrderStatus.OPEN, PaymentStatus.UNPAID, DeliveryStatus.NOT_DELIVERED
+
+        updated = finished if target in ("completed", "partial") else created
+        customer_id = _skewed(rng, n_customers, 1.5) + 1
+        delivered_qty = [qty if target == "completed" or (target == "partial" and position == 0) else 0
+                         for position, (_, qty, _) in enumerate(items)]
+        amount = 0.0
+        if target in ("completed", "partial"):
+            amount = total if target == "completed" else round(total * rng.uniform(0.3, 0.6), 2)
+        w.add(orders_t, {
+            "id": oid, "customer_id": customer_id, "total_amount": total,
+            "payment_status": pay, "delivery_status": dlv, "order_status": status,
+            "paid_amount": amount, "total_quantity": sum(q for _, q, _ in items),
+            "delivered_quantity": sum(delivered_qty),
+            "created_at": created, "created_by": uid, "updated_at": updated, "updated_by": uid,
+        })
+
+        for (pidx, qty, unit_price), delivered in zip(items, delivered_qty):
+            item_id += 1
+            w.add(items_t, {
+                "id": item_id, "order_id": oid, "product_id": pidx + 1,
+                "quantity": qty, "delivered_quantity": delivered, "unit_price": unit_price,
+                "created_at": created, "created_by": uid, "updated_at": updated, "updated_by": uid,
+            })
+            if delivered:
+                delivered_out[pidx] += delivered
+                movement_id += 1
+                w.add(movements_t, {
+                    "id": movement_id, "product_id": pidx + 1, "quantity": -delivered,
+                    "type": StockMovementType.OUT, "related_order_id": oid,
+                    "reason": f"Sipariş #{oid} teslimat",
+                    "created_at": finished, "created_by": uid, "updated_at": finished, "updated_by": uid,
+                })
+
+        if target in ("completed", "partial"):
+            delivery_id += 1
+            w.add(deliveries_t, {
+                "id": delivery_id, "order_id": oid, "delivered_at": finished,
+                "delivered_by_user_id": uid, "created_at": finished,
+                "note": "Tüm kalemler teslim edildi" if target == "completed" else "Kısmi teslimat",
+            })
+            payment_id += 1
+            w.add(payments_t, {
+                "id": payment_id, "order_id": oid, "amount": amount,
+                "method": rng.choice([PaymentMethod.CASH, PaymentMethod.BANK_TRANSFER,
+                                      PaymentMethod.CREDIT_CARD]),
+                "created_at": finished, "created_by": uid, "updated_at": finished, "updated_by": uid,
+            })
+
+        if oid % 100_000 == 0:
+            logger.info(f"  … {oid:,} / {n_orders:,} orders")
+
+    w.flush()
+    logger.info(f"✓ {n_orders:,} orders, {item_id:,} items, {delivery_id:,} deliveries, "
+                f"{payment_id:,} payments, {movement_id:,} OUT movements")
+    return delivered_out
+
+
+def _restock(w: _BatchWriter, rng: random.Random, counts: Dict[str, int],
+             delivered_out: List[int], uid: int, now: datetime) -> None:
+    """Write IN movements that cover every delivery and set products.current_stock."""
+    movements_t = StockMovement.__table__
+    n_products = len(delivered_out)
+    first_id = w.written.get(movements_t.name, 0) + 1
+    remaining = max(n_products, counts["stock_movements"] - (first_id - 1))
+    start = now - timedelta(days=HISTORY_DAYS + 30)
+
+    movement_id = first_id - 1
+    stock: List[int] = []
+    for pidx in range(n_products):
+        per_product = remaining // n_products + (1 if pidx < remaining % n_products else 0)
+        final_stock = rng.randint(0, 200)
+        total_in = delivered_out[pidx] + final_stock
+        per_product = max(1, min(per_product, total_in))
+        base, extra = divmod(total_in, per_product)
+        for n in range(per_product):
+            qty = base + (1 if n < extra else 0)
+            when = start + timedelta(minutes=rng.randint(0, (HISTORY_DAYS + 30) * 24 * 60))
+            movement_id += 1
+            w.add(movements_t, {
+                "id": movement_id, "product_id": pidx + 1, "quantity": qty,
+                "type": StockMovementType.IN, "related_order_id": None,
+                "reason": "İlk stok girişi" if n == 0 else "Stok yenileme",
+                "created_at": when, "created_by": uid, "updated_at": when, "updated_by": uid,
+            })
+        stock.append(total_in - delivered_out[pidx])
+    w.flush()
+
+    # Bulk UPDATE: one executemany per batch, keyed on the product id
+    products_t = Product.__table__
+    set_stock = (
+        products_t.update()
+        .where(products_t.c.id == bindparam("pid"))
+        .values(current_stock=bindparam("stock"))
+    )
+    for offset in range(0, n_products, w.batch_size):
+        w.db.execute(
+            set_stock,
+            [{"pid": i + 1, "stock": stock[i]} for i in range(offset, min(offset + w.batch_size, n_products))],
+        )
+    w.db.commit()
+    logger.info(f"✓ {movement_id - first_id + 1:,} IN movements, product stock levels set")
+
+
+def _expenses(w: _BatchWriter, rng: random.Random, counts: Dict[str, int],
+              uid: int, now: datetime) -> None:
+    category_ids = [c.id for c in w.db.query(ExpenseCategory.id).all()]
+    if not category_ids:
+        logger.warning("No expense categories found — skipping expenses")
+        return
+    expenses_t = Expense.__table__
+    for eid in range(1, counts["expenses"] + 1):
+        when = now - timedelta(days=rng.randint(0, HISTORY_DAYS), minutes=rng.randint(0, 1440))
+        w.add(expenses_t, {
+            "id": eid, "amount": round(rng.uniform(50, 5000), 2), "date": when,
+            "description": f"{rng.choice(_CITY)} {rng.choice(_EXPENSE_TEXT)}",
+            "category_id": rng.choice(category_ids),
+            "created_at": when, "created_by": uid, "updated_at": when, "updated_by": uid,
+        })
+    w.flush()
+    logger.info(f"✓ {counts['expenses']:,} expenses")
+
+
+# =====================================================================
+#  MAIN
+# =====================================================================
+
+def generate_scale_data(db: Session, factor: float = 1.0, seed: int = SEED,
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+    """Clear existing business data and bulk-generate a dataset of the given scale.
+
+    Returns the number of rows written per table.
+    """
+    rng = random.Random(seed)
+    counts = _scaled(factor)
+    uid = _uid(db)
+    now = datetime.utcnow().replace(microsecond=0)
+
+    with suppress_slow_query_log():
+        clear_data(db)
+        _prepare_connection(db)
+
+        w = _BatchWriter(db, batch_size)
+        w.register(
+            Customer.__table__, Contact.__table__, customer_contact_association,
+            Category.__table__, Product.__table__,
+            Order.__table__, OrderItem.__table__, OrderDelivery.__table__,
+            Payment.__table__, StockMovement.__table__, Expense.__table__,
+        )
+        _customers_and_contacts(w, rng, counts, uid, now)
+        prices = _catalog(w, rng, counts, uid, now)
+        delivered_out = _orders(w, rng, counts, prices, uid, now)
+        _restock(w, rng, counts, delivered_out, uid, now)
+        _expenses(w, rng, counts, uid, now)
+
+        _reset_sequences(db, [
+            "customers", "contacts", "categories", "products", "orders", "order_items",
+            "order_deliveries", "payments", "stock_movements", "expenses",
+        ])
+        CustomerMetricsRepository(db).rebuild()
+        bump_table_versions(db, *VERSIONED_TABLES)
+        db.commit()
+    return dict(w.written)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="INACORTS scale data generator")
+    parser.add_argument("--factor", type=float, default=1.0,
+                        help="fraction of the full-scale volumes to generate (default 1.0)")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--reset", action="store_true", help="reset the database first")
+    args = parser.parse_args(argv)
+
+    logger.info("=" * 50)
+    logger.info("  INACORTS — Scale Data Generator")
+    logger.info("=" * 50)
+
+    if args.reset:
+        from app.utils.reset_db import reset_database
+        reset_database(skip_confirm=True)
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        written = generate_scale_data(db, args.factor, args.seed, args.batch_size)
+        elapsed = time.perf_counter() - started
+        print_summary(db)
+        logger.info("")
+        logger.info(f"✓ {sum(written.values()):,} rows generated in {elapsed:.1f}s "
+                    f"(factor={args.factor}, seed={args.seed})")
+    except Exception as exc:
+        logger.error(f"✗ {exc}")
+        import traceback
+        traceback.print_exc()
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
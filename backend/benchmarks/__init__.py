@@ -0,0 +1 @@
+"""Performance benchmarks and load-test tooling (not shipped with the app)."""
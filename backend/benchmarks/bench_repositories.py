@@ -0,0 +1,250 @@
+"""
+Repository hot-path benchmarks.
+
+Each benchmark opens a fresh session per round (as a request would), so the
+identity map never serves rows from a previous round.  The list queries also
+carry a query budget: a benchmark that starts issuing one query per row fails
+outright instead of just getting slower.
+"""
+
+from datetime import datetime, timedelta
+from itertools import product
+
+import pytest
+
+from app.db.query_stats import assert_max_queries
+from app.models import DeliveryStatus, Order, OrderStatus, PaymentStatus
+from app.repositories.order_repository import OrderRepository
+from app.repositories.payment_repository import PaymentRepository
+from app.repositories.product_repository import ProductRepository
+from app.repositories.search_repository import SearchRepository
+from app.repositories.stock_movement_repository import StockMovementRepository
+from app.schemas.order import OrderResponse
+
+
+# count + page + selectin(items)
+ORDER_LIST_QUERY_BUDGET = 3
+
+# Every combination of the five order filters, each either unset or set to a
+# value that matches a realistic slice of the data
+_ORDER_FILTERS = {
+    "customer": {"customer_id": 1},  # customer 1 is the "hottest" in the scale data
+    "status": {"order_status": OrderStatus.OPEN},
+    "payment": {"payment_status": PaymentStatus.UNPAID},
+    "delivery": {"delivery_status": DeliveryStatus.NOT_DELIVERED},
+    "dates": "last_90_days",
+}
+_ORDER_FILTER_COMBINATIONS = [
+    tuple(name for name, on in zip(_ORDER_FILTERS, mask) if on)
+    for mask in product((False, True), repeat=len(_ORDER_FILTERS))
+]
+
+
+def _order_filter_kwargs(names, newest: datetime) -> dict:
+    kwargs = {}
+    for name in names:
+        if name == "dates":
+            kwargs["start_date"] = newest - timedelta(days=90)
+            kwargs["end_date"] = newest
+        else:
+            kwargs.update(_ORDER_FILTERS[name])
+    return kwargs
+
+
+@pytest.fixture(scope="module")
+def newest_order_date():
+    from app.db.session import SessionLocal
+    with SessionLocal() as db:
+        return db.query(Order.created_at).order_by(Order.id.desc()).limit(1).scalar()
+
+
+@pytest.mark.parametrize(
+    "filters", _ORDER_FILTER_COMBINATIONS,
+    ids=["+".join(c) or "unfiltered" for c in _ORDER_FILTER_COMBINATIONS],
+)
+def bench_order_list_all(benchmark, session_factory, newest_order_date, filters):
+    kwargs = _order_filter_kwargs(filters, newest_order_date)
+
+    def run():
+        with session_factory() as db:
+            return OrderRepository(db).list_all(page=1, page_size=20, **kwargs)
+
+    with assert_max_queries(ORDER_LIST_QUERY_BUDGET):
+        run()
+    benchmark(run)
+
+
+@pytest.mark.parametrize("page", [1, 50])
+def bench_order_list_all_deep_page(benchmark, session_factory, page):
+    def run():
+        with session_factory() as db:
+            return OrderRepository(db).list_all(page=page, page_size=20, sort_by="created_at")
+
+    benchmark(run)
+
+
+@pytest.mark.parametrize("search", [None, "Civata", "M10", "869"])
+def bench_product_list_all_search(benchmark, session_factory, search):
+    def run():
+        with session_factory() as db:
+            return ProductRepository(db).list_all(page=1, page_size=20, search=search)
+
+    with assert_max_queries(2):
+        run()
+    benchmark(run)
+
+
+@pytest.mark.parametrize("sort_by", ["id", "revenue", "outstanding", "last_order_at"])
+def bench_customer_list_all_sorted(benchmark, session_factory, sort_by):
+    from app.repositories.customer_repository import CustomerRepository
+
+    def run():
+        with session_factory() as db:
+            return CustomerRepository(db).list_all(page=1, page_size=20, sort_by=sort_by, order="desc")
+
+    # count + page (metrics joined) + selectin(contacts)
+    with assert_max_queries(3):
+        run()
+    benchmark(run)
+
+
+@pytest.mark.parametrize("term", ["c", "civ", "yılmaz ege", "869"])
+def bench_global_search(benchmark, session_factory, term):
+    def run():
+        with session_factory() as db:
+            return SearchRepository(db).search_documents(term, limit=10)
+
+    with assert_max_queries(1):
+        run()
+    benchmark(run)
+
+
+def bench_product_get_by_barcodes(benchmark, session_factory):
+    from app.models import Product
+    with session_factory() as db:
+        barcodes = [row[0] for row in
+                    db.query(Product.barcode).filter(Product.barcode.isnot(None)).limit(100).all()]
+
+    def run():
+        with session_factory() as db:
+            return ProductRepository(db).get_by_barcodes(barcodes)
+
+    with assert_max_queries(1):
+        run()
+    benchmark(run)
+
+
+@pytest.mark.parametrize("product_id", [None, 1])
+def bench_stock_movement_list_all(benchmark, session_factory, product_id):
+    def run():
+        with session_factory() as db:
+            return StockMovementRepository(db).list_all(page=1, page_size=20, product_id=product_id)
+
+    with assert_max_queries(2):
+        run()
+    benchmark(run)
+
+
+def bench_payment_list_by_order(benchmark, session_factory):
+    from app.models import Payment
+    with session_factory() as db:
+        order_ids = [row[0] for row in db.query(Payment.order_id).limit(200).all()]
+
+    def run():
+        with session_factory() as db:
+            repo = PaymentRepository(db)
+            for order_id in order_ids:
+                repo.list_by_order(order_id)
+
+    benchmark(run)
+
+
+@pytest.mark.parametrize("sort_by", ["total_outstanding", "over_90", "customer_name"])
+def bench_order_receivables_aging(benchmark, session_factory, newest_order_date, sort_by):
+    def run():
+        with session_factory() as db:
+            return OrderRepository(db).receivables_aging(newest_order_date, page=1, page_size=20,
+                                                         sort_by=sort_by)
+
+    # One grouped query; totals come from window aggregates on the same rows
+    with assert_max_queries(1):
+        run()
+    benchmark(run)
+
+
+@pytest.mark.parametrize("deep", [False, True], ids=["first_page", "last_page"])
+def bench_customer_ledger(benchmark, session_factory, deep):
+    from app.repositories.customer_repository import CustomerRepository
+    # Customer 1 is the "hottest" in the scale data: the longest timeline
+    after = None
+    if deep:
+        with session_factory() as db:
+            rows = CustomerRepository(db).ledger(1, limit=100000)
+            last = rows[-50]
+            after = (last.created_at, last.kind, last.entry_id)
+
+    def run():
+        with session_factory() as db:
+            repo = CustomerRepository(db)
+            opening = repo.balance_before(1, after) if after else 0.0
+            return opening, repo.ledger(1, after, limit=51)
+
+    with assert_max_queries(2):
+        run()
+    benchmark(run)
+
+
+@pytest.fixture(scope="module")
+def product_stats(newest_order_date):
+    """Stats as of the newest order, so the scale data's sales fall in the windows."""
+    from app.db.session import SessionLocal
+    from app.repositories.product_stats_repository import ProductStatsRepository
+    with SessionLocal() as db:
+        ProductStatsRepository(db).refresh(newest_order_date.date(), lead_days=14)
+    return newest_order_date.date()
+
+
+def bench_product_stats_refresh_incremental(benchmark, session_factory, product_stats):
+    from app.repositories.product_stats_repository import ProductStatsRepository
+
+    # No new movements since the fixture's run: the steady-state cost of the job
+    def run():
+        with session_factory() as db:
+            return ProductStatsRepository(db).refresh(product_stats, lead_days=14)
+
+    benchmark(run)
+
+
+def bench_product_list_at_risk(benchmark, session_factory, product_stats):
+    from app.repositories.product_stats_repository import ProductStatsRepository
+
+    def run():
+        with session_factory() as db:
+            return ProductStatsRepository(db).list_at_risk(14, page=1, page_size=20)
+
+    # count + page
+    with assert_max_queries(2):
+        run()
+    benchmark(run)
+
+
+def bench_order_export(benchmark, newest_order_date):
+    from app.services.export_service import EXPORT_BATCH_SIZE, ExportFormat, stream_export
+
+    from app.db.session import SessionLocal
+
+    kwargs = _order_filter_kwargs(("dates",), newest_order_date)
+    with SessionLocal() as db:
+        batches = -(-OrderRepository(db)._filtered(None, None, None, None, **kwargs).count() // EXPORT_BATCH_SIZE)
+
+    def run():
+        body = stream_export(
+            lambda db: OrderRepository(db).stream_all(batch_size=EXPORT_BATCH_SIZE, **kwargs),
+            OrderResponse, ExportFormat.NDJSON, exclude=frozenset({"items"})
+        )
+        return sum(len(chunk) for chunk in body)
+
+    # the orders cursor + at most one username lookup per batch, never a query per order
+    with assert_max_queries(1 + batches):
+        run()
+    benchmark(run)
@@ -0,0 +1,78 @@
+"""
+List response rendering benchmarks.
+
+Compares the two ways a list endpoint can turn its service result into a
+response body, on 1,000-row pages:
+
+* ``fastapi`` — the service result is returned as-is and goes through
+  FastAPI's response_model handling (validate against the field, dump in
+  JSON mode, ``JSONResponse``/stdlib json);
+* ``model_response`` — the result is wrapped in ``ModelResponse``, which
+  renders it directly with orjson.
+
+The service call itself (one-pass page validation) is included in both.
+"""
+
+import asyncio
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.responses import ModelResponse
+from app.repositories.order_repository import OrderRepository
+from app.repositories.product_repository import ProductRepository
+from app.repositories.stock_movement_repository import StockMovementRepository
+from app.schemas.common import PaginatedResponse
+from app.schemas.order import OrderResponse
+from app.schemas.product import ProductResponse
+from app.schemas.stock_movement import StockMovementResponse
+from app.services.order_service import OrderService
+from app.services.product_service import ProductService
+from app.services.stock_movement_service import StockMovementService
+
+from benchmarks.bench_serialization import _preload
+
+
+PAGE_SIZE = 1000
+
+_RESOURCES = {
+    "orders": (OrderService, "order_repo", OrderRepository, "list_orders", OrderResponse),
+    "products": (ProductService, "product_repo", ProductRepository, "list_products", ProductResponse),
+    "stock_movements": (StockMovementService, "stock_repo", StockMovementRepository,
+                        "list_stock_movements", StockMovementResponse),
+}
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.mark.parametrize("path", ["fastapi", "model_response"])
+@pytest.mark.parametrize("resource", list(_RESOURCES))
+def bench_list_response_render(benchmark, db, event_loop, resource, path):
+    service_cls, attr, repo_cls, method, schema = _RESOURCES[resource]
+    service = service_cls(db)
+    _preload(service, attr, repo_cls, db, PAGE_SIZE)
+    list_page = getattr(service, method)
+    benchmark.group = f"render-{resource}-{PAGE_SIZE}"
+
+    if path == "fastapi":
+        field = create_response_field(name=f"Response_{resource}", type_=PaginatedResponse[schema])
+
+        def run():
+            content = event_loop.run_until_complete(
+                serialize_response(field=field, response_content=list_page(page=1, page_size=PAGE_SIZE))
+            )
+            return JSONResponse(content).body
+    else:
+        def run():
+            return ModelResponse(list_page(page=1, page_size=PAGE_SIZE)).body
+
+    body = run()
+    assert body.startswith(b'{"items":[')
+    benchmark(run)
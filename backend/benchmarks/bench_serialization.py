@@ -0,0 +1,78 @@
+"""
+Service serialization benchmarks.
+
+Measures each service's list loop — ``XResponse.model_validate`` per row plus
+the username fix-up and the PaginatedResponse wrapper — in isolation from the
+database: the repository is replaced by one that returns a page loaded once
+up front.
+"""
+
+import pytest
+
+from app.repositories.customer_repository import CustomerRepository
+from app.repositories.order_repository import OrderRepository
+from app.repositories.payment_repository import PaymentRepository
+from app.repositories.product_repository import ProductRepository
+from app.repositories.stock_movement_repository import StockMovementRepository
+from app.services.customer_service import CustomerService
+from app.services.order_service import OrderService
+from app.services.payment_service import PaymentService
+from app.services.product_service import ProductService
+from app.services.stock_movement_service import StockMovementService
+
+
+PAGE_SIZES = [20, 100, 1000]
+
+
+class _PreloadedRepository:
+    """Stands in for a repository: list_all returns a fixed, fully loaded page."""
+
+    def __init__(self, items, total):
+        self.items = items
+        self.total = total
+
+    def list_all(self, *args, **kwargs):
+        return self.items, self.total
+
+
+def _preload(service, attr, repo_cls, db, page_size):
+    """Replace ``service.<attr>`` with a repository serving one preloaded page."""
+    assert isinstance(getattr(service, attr), repo_cls)
+    items, total = repo_cls(db).list_all(page=1, page_size=page_size)
+    setattr(service, attr, _PreloadedRepository(items, total))
+
+
+@pytest.mark.parametrize("page_size", PAGE_SIZES)
+def bench_order_service_serialize_page(benchmark, db, page_size):
+    service = OrderService(db)
+    _preload(service, "order_repo", OrderRepository, db, page_size)
+    result = benchmark(service.list_orders, page=1, page_size=page_size)
+    assert len(result.items) == page_size
+
+
+@pytest.mark.parametrize("page_size", PAGE_SIZES)
+def bench_product_service_serialize_page(benchmark, db, page_size):
+    service = ProductService(db)
+    _preload(service, "product_repo", ProductRepository, db, page_size)
+    benchmark(service.list_products, page=1, page_size=page_size)
+
+
+@pytest.mark.parametrize("page_size", PAGE_SIZES)
+def bench_customer_service_serialize_page(benchmark, db, page_size):
+    service = CustomerService(db)
+    _preload(service, "repo", CustomerRepository, db, page_size)
+    benchmark(service.list_customers, page=1, page_size=page_size)
+
+
+@pytest.mark.parametrize("page_size", PAGE_SIZES)
+def bench_payment_service_serialize_page(benchmark, db, page_size):
+    service = PaymentService(db)
+    _preload(service, "payment_repo", PaymentRepository, db, page_size)
+    benchmark(service.list_payments, page=1, page_size=page_size)
+
+
+@pytest.mark.parametrize("page_size", PAGE_SIZES)
+def bench_stock_movement_service_serialize_page(benchmark, db, page_size):
+    service = StockMovementService(db)
+    _preload(service, "stock_repo", StockMovementRepository, db, page_size)
+    benchmark(service.list_stock_movements, page=1, page_size=page_size)
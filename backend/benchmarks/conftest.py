@@ -0,0 +1,101 @@
+"""
+Fixtures for the repository / serialization micro-benchmarks.
+
+The benchmarks run against a dataset built by the scale data generator.  The
+database file is cached in benchmarks/.data/, keyed on the scale factor, the
+seed and a fingerprint of the models and generator sources, so it is only
+rebuilt when one of those changes.
+
+Options (in addition to pytest-benchmark's own):
+  --scale-factor F   fraction of full-scale volumes (default 0.02 ≈ 40k orders)
+  --scale-seed N     generator seed (default 42)
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = BENCHMARKS_DIR.parent
+DATA_DIR = BENCHMARKS_DIR / ".data"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("inacorts", "INACORTS benchmark dataset")
+    group.addoption("--scale-factor", type=float, default=0.02,
+                    help="scale data generator factor for the benchmark database")
+    group.addoption("--scale-seed", type=int, default=42,
+                    help="scale data generator seed for the benchmark database")
+
+
+def _fingerprint() -> str:
+    digest = hashlib.sha1()
+    for source in ("app/models/__init__.py", "app/utils/scale_data_generator.py"):
+        digest.update((BACKEND_DIR / source).read_bytes())
+    return digest.hexdigest()[:10]
+
+
+def pytest_configure(config):
+    # Settings and the engine are created on first import of app.*, so the
+    # database location must be in the environment before any bench module
+    # is collected.
+    factor = config.getoption("--scale-factor")
+    seed = config.getoption("--scale-seed")
+    db_path = DATA_DIR / f"scale-{factor:g}-{seed}-{_fingerprint()}.db"
+    config.scale_db_path = db_path
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("SECRET_KEY", "benchmark-only-secret-key-not-for-production-use")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    # Timing every statement would skew the numbers being measured
+    os.environ.setdefault("SLOW_QUERY_THRESHOLD_MS", "0")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def scale_database(pytestconfig):
+    """Build (or reuse) the scale dataset; yields the database path."""
+    from app.db.session import engine, SessionLocal
+    from app.db.init_db import init_db
+    from app.utils.scale_data_generator import generate_scale_data
+
+    db_path: Path = pytestconfig.scale_db_path
+    DATA_DIR.mkdir(exist_ok=True)
+    generate = not db_path.exists()
+
+    db = SessionLocal()
+    try:
+        # Always run init_db: it creates anything added since the file was cached
+        # (tables, search indexes) and is a no-op otherwise
+        init_db(db)
+        if generate:
+            generate_scale_data(db, factor=pytestconfig.getoption("--scale-factor"),
+                                seed=pytestconfig.getoption("--scale-seed"))
+    except BaseException:
+        db.close()
+        engine.dispose()
+        if generate:
+            db_path.unlink(missing_ok=True)
+        raise
+    db.close()
+
+    yield db_path
+
+
+@pytest.fixture
+def session_factory():
+    """Open a fresh Session per call, as a request would."""
+    from app.db.session import SessionLocal
+    return SessionLocal
+
+
+@pytest.fixture
+def db():
+    from app.db.session import SessionLocal
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,430 @@
+"""
+INACORTS — Load-Test Harness
+
+Drives a weighted, reproducible mix of realistic API traffic and reports
+throughput and latency percentiles per endpoint to a JSON file that can be
+diffed between commits.
+
+Two modes:
+  in-process  (default) boots the FastAPI app against a fresh SQLite database
+              seeded with the sample dataset and talks to it through
+              httpx.ASGITransport — no server or network involved.
+  --base-url  drives an already running server (e.g. a local uvicorn).  The
+              target database must contain data and an admin login.
+
+Scenarios and default weights (see DEFAULT_MIX):
+  login, list_orders, filter_orders, create_order, deliver_item,
+  record_payment, dashboard (the dashboard page's 5 requests) and
+  financials (the financials page's 4 requests).
+
+Usage
+─────
+  cd backend
+  pip install -r requirements-dev.txt
+  python -m benchmarks.load_test                                   # in-process
+  python -m benchmarks.load_test --iterations 2000 --concurrency 16
+  python -m benchmarks.load_test --mix list_orders=10,create_order=2
+  python -m benchmarks.load_test --scale 0.05                      # ≈100k orders
+  python -m benchmarks.load_test --base-url http://127.0.0.1:8000
+  python -m benchmarks.load_test --output benchmarks/results/$(git rev-parse --short HEAD).json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent  # backend/
+DEFAULT_OUTPUT = BACKEND_DIR / "benchmarks" / "results" / "load_test.json"
+
+DEFAULT_MIX: Dict[str, int] = {
+    "login": 1,
+    "list_orders": 20,
+    "filter_orders": 10,
+    "create_order": 5,
+    "deliver_item": 5,
+    "record_payment": 5,
+    "dashboard": 3,
+    "financials": 1,
+}
+
+
+# =====================================================================
+#  DATABASE BOOTSTRAP (in-process mode)
+# =====================================================================
+
+def bootstrap_app(database_path: Optional[str], scale: Optional[float] = None):
+    """Point the app at a fresh SQLite file, seed it and return the ASGI app.
+
+    Seeds the compact sample dataset, or — with ``scale`` — a bulk-generated
+    dataset of that fraction of production volume (see scale_data_generator).
+
+    Environment variables must be set before the first ``app.*`` import,
+    because settings and the engine are created at import time.
+    """
+    if database_path is None:
+        database_path = os.path.join(tempfile.mkdtemp(prefix="inacorts-bench-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{database_path}"
+    os.environ.setdefault("SECRET_KEY", "benchmark-only-secret-key-not-for-production-use")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("ENVIRONMENT", "development")
+
+    from app.db.base import Base, import_models
+    from app.db.session import engine, SessionLocal
+    from app.db.init_db import init_db
+    from app.utils import sample_data_generator as generator
+    from app.utils import scale_data_generator
+
+    import_models()
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        init_db(db)
+        if scale:
+            scale_data_generator.generate_scale_data(db, factor=scale)
+        else:
+            generator.generate_sample_data(db)
+    finally:
+        db.close()
+
+    from app.main import app
+    return app, database_path
+
+
+# =====================================================================
+#  RECORDING
+# =====================================================================
+
+class Recorder:
+    """Collects latency samples and failures per endpoint label."""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def request(self, client: httpx.AsyncClient, label: str, method: str,
+                      url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.latencies[label].append((time.perf_counter() - started) * 1000)
+            self.errors[label] += 1
+            return None
+        self.latencies[label].append((time.perf_counter() - started) * 1000)
+        if response.status_code >= 400:
+            self.errors[label] += 1
+            return None
+        return response
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _summarise(latencies: List[float], errors: int, duration_s: float) -> dict:
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "errors": errors,
+        "throughput_rps": round(len(values) / duration_s, 2) if duration_s else 0.0,
+        "mean_ms": round(sum(values) / len(values), 3) if values else 0.0,
+        "p50_ms": round(_percentile(values, 50), 3),
+        "p95_ms": round(_percentile(values, 95), 3),
+        "p99_ms": round(_percentile(values, 99), 3),
+        "max_ms": round(values[-1], 3) if values else 0.0,
+    }
+
+
+# =====================================================================
+#  SCENARIOS
+# =====================================================================
+
+class TrafficState:
+    """Shared, seeded state the scenarios draw their inputs from."""
+
+    def __init__(self, rng: random.Random, username: str, password: str) -> None:
+        self.rng = rng
+        self.username = username
+        self.password = password
+        self.customer_ids: List[int] = []
+        self.products: List[dict] = []
+        self.open_orders: Dict[int, dict] = {}
+
+    async def warm_up(self, client: httpx.AsyncClient) -> None:
+        customers = (await client.get("/api/v1/customers", params={"page_size": 200})).json()
+        products = (await client.get("/api/v1/products", params={"page_size": 200})).json()
+        orders = (await client.get("/api/v1/orders", params={"page_size": 200, "order_status": "OPEN"})).json()
+        self.customer_ids = [c["id"] for c in customers["items"]]
+        self.products = products["items"]
+        self.open_orders = {o["id"]: o for o in orders["items"]}
+        if not self.customer_ids or not self.products:
+            raise RuntimeError("Target database has no customers or products — seed it first.")
+
+    def remember(self, order: dict) -> None:
+        if order["order_status"] == "OPEN":
+            self.open_orders[order["id"]] = order
+        else:
+            self.open_orders.pop(order["id"], None)
+
+
+async def scenario_login(client, rec: Recorder, state: TrafficState) -> None:
+    await rec.request(client, "POST /api/v1/auth/login", "POST", "/api/v1/auth/login",
+                      json={"username": state.username, "password": state.password})
+
+
+async def scenario_list_orders(client, rec: Recorder, state: TrafficState) -> None:
+    page = state.rng.randint(1, 3)
+    await rec.request(client, "GET /api/v1/orders", "GET", "/api/v1/orders",
+                      params={"page": page, "page_size": 20, "sort": "id", "order": "desc"})
+
+
+async def scenario_filter_orders(client, rec: Recorder, state: TrafficState) -> None:
+    params: Dict[str, object] = {"page_size": 20}
+    choice = state.rng.randrange(4)
+    if choice == 0:
+        params["customer_id"] = state.rng.choice(state.customer_ids)
+    elif choice == 1:
+        params["order_status"] = state.rng.choice(["OPEN", "COMPLETED", "CANCELED"])
+    elif choice == 2:
+        params["payment_status"] = state.rng.choice(["UNPAID", "PARTIALLY_PAID", "PAID"])
+    else:
+        params["delivery_status"] = state.rng.choice(["NOT_DELIVERED", "PARTIALLY_DELIVERED", "DELIVERED"])
+    await rec.request(client, "GET /api/v1/orders (filtered)", "GET", "/api/v1/orders", params=params)
+
+
+async def scenario_create_order(client, rec: Recorder, state: TrafficState) -> None:
+    chosen = state.rng.sample(state.products, min(len(state.products), state.rng.randint(1, 4)))
+    payload = {
+        "customer_id": state.rng.choice(state.customer_ids),
+        "items": [
+            {"product_id": p["id"], "quantity": state.rng.randint(1, 5), "unit_price": p["list_price"]}
+            for p in chosen
+        ],
+    }
+    response = await rec.request(client, "POST /api/v1/orders", "POST", "/api/v1/orders", json=payload)
+    if response is not None:
+        state.remember(response.json())
+
+
+async def scenario_deliver_item(client, rec: Recorder, state: TrafficState) -> None:
+    candidates = [
+        (order_id, item)
+        for order_id, order in state.open_orders.items()
+        for item in order["items"]
+        if item["delivered_quantity"] < item["quantity"]
+    ]
+    if not candidates:
+        await scenario_create_order(client, rec, state)
+        return
+    order_id, item = state.rng.choice(candidates)
+    response = await rec.request(client, "POST /api/v1/order-items/{id}/deliver", "POST",
+                                 f"/api/v1/order-items/{item['id']}/deliver", json={"quantity": 1})
+    if response is not None:
+        state.remember(response.json())
+    else:
+        state.open_orders.pop(order_id, None)
+
+
+async def scenario_record_payment(client, rec: Recorder, state: TrafficState) -> None:
+    unpaid = [o for o in state.open_orders.values() if o["payment_status"] != "PAID"]
+    if not unpaid:
+        await scenario_create_order(client, rec, state)
+        return
+    order = state.rng.choice(unpaid)
+    amount = round(max(order["total_amount"] * state.rng.uniform(0.1, 0.4), 0.01), 2)
+    await rec.request(client, "POST /api/v1/payments", "POST", "/api/v1/payments",
+                      json={"order_id": order["id"], "amount": amount, "method": "CASH"})
+    # Payment status changes are not returned; stop paying the order after a few rounds
+    if state.rng.random() < 0.3:
+        state.open_orders.pop(order["id"], None)
+
+
+async def scenario_dashboard(client, rec: Recorder, state: TrafficState) -> None:
+    """The requests DashboardPage issues on load."""
+    await asyncio.gather(
+        rec.request(client, "GET /api/v1/orders (dashboard)", "GET", "/api/v1/orders",
+                    params={"page": 1, "page_size": 10, "sort": "id", "order": "desc"}),
+        rec.request(client, "GET /api/v1/products (dashboard)", "GET", "/api/v1/products",
+                    params={"page": 1, "page_size": 1}),
+        rec.request(client, "GET /api/v1/customers (dashboard)", "GET", "/api/v1/customers",
+                    params={"page": 1, "page_size": 1}),
+        rec.request(client, "GET /api/v1/payments (dashboard)", "GET", "/api/v1/payments",
+                    params={"page": 1, "page_size": 1000}),
+        rec.request(client, "GET /api/v1/expenses (dashboard)", "GET", "/api/v1/expenses",
+                    params={"page_size": 10000}),
+    )
+
+
+async def scenario_financials(client, rec: Recorder, state: TrafficState) -> None:
+    """The requests FinancialsPage issues on load."""
+    await asyncio.gather(
+        rec.request(client, "GET /api/v1/payments (financials)", "GET", "/api/v1/payments",
+                    params={"page_size": 10000}),
+        rec.request(client, "GET /api/v1/expenses (financials)", "GET", "/api/v1/expenses",
+                    params={"page_size": 10000}),
+        rec.request(client, "GET /api/v1/orders (financials)", "GET", "/api/v1/orders",
+                    params={"page_size": 10000}),
+        rec.request(client, "GET /api/v1/expenses/categories/list (financials)", "GET",
+                    "/api/v1/expenses/categories/list", params={"page_size": 1000}),
+    )
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "login": scenario_login,
+    "list_orders": scenario_list_orders,
+    "filter_orders": scenario_filter_orders,
+    "create_order": scenario_create_order,
+    "deliver_item": scenario_deliver_item,
+    "record_payment": scenario_record_payment,
+    "dashboard": scenario_dashboard,
+    "financials": scenario_financials,
+}
+
+
+# =====================================================================
+#  DRIVER
+# =====================================================================
+
+def parse_mix(spec: Optional[str]) -> Dict[str, int]:
+    """Parse "name=weight,name=weight" into a mix (unlisted scenarios are dropped)."""
+    if not spec:
+        return dict(DEFAULT_MIX)
+    mix: Dict[str, int] = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario '{name}'. Available: {', '.join(SCENARIOS)}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+async def run_load(client: httpx.AsyncClient, mix: Dict[str, int], iterations: int,
+                   concurrency: int, seed: int, username: str, password: str) -> dict:
+    rng = random.Random(seed)
+    state = TrafficState(rng, username, password)
+
+    login = await client.post("/api/v1/auth/login", json={"username": username, "password": password})
+    login.raise_for_status()
+    client.headers["Authorization"] = f"Bearer {login.json()['access_token']}"
+    await state.warm_up(client)
+
+    # The whole scenario sequence is drawn up front so runs are reproducible
+    names = list(mix)
+    plan = rng.choices(names, weights=[mix[n] for n in names], k=iterations)
+    queue: asyncio.Queue = asyncio.Queue()
+    for name in plan:
+        queue.put_nowait(name)
+
+    recorder = Recorder()
+
+    async def worker() -> None:
+        while not queue.empty():
+            name = queue.get_nowait()
+            await SCENARIOS[name](client, recorder, state)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - started
+
+    all_latencies = [v for values in recorder.latencies.values() for v in values]
+    return {
+        "duration_s": round(duration, 3),
+        "scenario_counts": {n: plan.count(n) for n in names},
+        "overall": _summarise(all_latencies, sum(recorder.errors.values()), duration),
+        "endpoints": {
+            label: _summarise(values, recorder.errors[label], duration)
+            for label, values in sorted(recorder.latencies.items())
+        },
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="INACORTS load-test harness")
+    parser.add_argument("--base-url", help="drive a running server instead of the in-process app")
+    parser.add_argument("--database", help="SQLite file for in-process mode (default: temp file)")
+    parser.add_argument("--scale", type=float,
+                        help="seed a bulk-generated dataset of this fraction of production volume")
+    parser.add_argument("--iterations", type=int, default=500, help="number of scenarios to run")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent virtual users")
+    parser.add_argument("--mix", help="scenario weights, e.g. list_orders=10,create_order=2")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT))
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+
+    async def _run() -> dict:
+        if args.base_url:
+            async with httpx.AsyncClient(base_url=args.base_url, timeout=120) as client:
+                return await run_load(client, mix, args.iterations, args.concurrency,
+                                      args.seed, args.username, args.password)
+        app, _ = bootstrap_app(args.database, args.scale)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost", timeout=120) as client:
+            return await run_load(client, mix, args.iterations, args.concurrency,
+                                  args.seed, args.username, args.password)
+
+    results = asyncio.run(_run())
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "mode": "http" if args.base_url else "in-process",
+            "base_url": args.base_url,
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "scale": args.scale,
+            "mix": mix,
+            "python": sys.version.split()[0],
+        },
+        **results,
+    }
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+    print(f"{'endpoint':<55} {'count':>6} {'err':>4} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for label, s in report["endpoints"].items():
+        print(f"{label:<55} {s['count']:>6} {s['errors']:>4} {s['throughput_rps']:>8.1f} "
+              f"{s['p50_ms']:>8.1f} {s['p95_ms']:>8.1f} {s['p99_ms']:>8.1f}")
+    overall = report["overall"]
+    print(f"\n{overall['count']} requests in {report['duration_s']}s "
+          f"({overall['throughput_rps']} req/s, {overall['errors']} errors) → {output}")
+
+
+if __name__ == "__main__":
+    main()